@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Replay recorded Polymarket prices through the detector to tune
+PRICE_CHANGE_THRESHOLD, ALERT_COOLDOWN_SECONDS and DETECTION_WINDOWS.
+
+Usage:
+    python backtest.py recordings/
+    python backtest.py recordings/ --threshold 0.03,0.05,0.1 --cooldown 300,900 \\
+        --windows "60,300,3600;300,3600;"
+    python backtest.py snapshots.jsonl.gz --start 2026-03-01 --end 2026-04-01 --output sweep.json
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+from src.backtest import Tape, big_move_config, run_replays, score, sweep
+from src.config import Config
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler()],
+)
+logger = logging.getLogger("war-o-meter")
+
+
+def parse_time(value: str) -> float:
+    """Epoch seconds or an ISO date/time (UTC)."""
+    try:
+        return float(value)
+    except ValueError:
+        parsed = datetime.fromisoformat(value)
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+
+
+def parse_list(value: str, cast=float) -> list:
+    return [cast(item) for item in value.split(",") if item.strip()]
+
+
+def parse_windows(value: str) -> list[tuple[float, ...]]:
+    """Semicolon-separated window sets, e.g. '60,300,3600;300'. Empty = tick-to-tick only."""
+    return [tuple(parse_list(option)) for option in value.split(";")]
+
+
+def print_report(tape: Tape, rows: list[dict]):
+    print(
+        f"\nReplayed {tape.ticks:,} polls, {len(tape.rows):,} observations of "
+        f"{len(tape.market_ids):,} markets over {tape.span_seconds / 86400:.1f} days"
+    )
+    if rows:
+        print(f"Big moves to catch: {rows[0]['big_moves']}\n")
+    header = (
+        f"{'threshold / cooldown / windows':<34}{'alerts':>8}{'/day':>10}{'markets':>9}"
+        f"{'caught':>8}{'recall':>8}{'lead p50':>10}{'late':>6}{'unmatched':>11}{'secs':>8}"
+    )
+    print(header)
+    for row in rows:
+        lead = f"{row['lead_p50_seconds']:.0f}s" if row["lead_p50_seconds"] is not None else "-"
+        print(
+            f"{row['config']:<34}{row['alerts']:>8}{row['alerts_per_day']:>10.1f}{row['markets_alerted']:>9}"
+            f"{row['big_moves_caught']:>8}{row['recall']:>8.0%}{lead:>10}{row['late']:>6}"
+            f"{row['unmatched_alerts']:>11}{row['replay_seconds']:>8.1f}"
+        )
+
+
+def write_alerts_csv(path: str, tape: Tape, results):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["config", "time", "market_id", "question", "old_price", "new_price", "change", "window"])
+        for result in results:
+            for alert in result.alerts:
+                writer.writerow([
+                    result.config.label(),
+                    datetime.fromtimestamp(alert.timestamp, timezone.utc).isoformat(),
+                    tape.market_ids[alert.row],
+                    tape.questions[alert.row],
+                    alert.old_price,
+                    alert.new_price,
+                    alert.change,
+                    alert.window_seconds or "",
+                ])
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="recorder directory or JSONL(.gz) file")
+    parser.add_argument("--start", type=parse_time, default=0.0, help="epoch seconds or ISO time")
+    parser.add_argument("--end", type=parse_time, default=float("inf"), help="epoch seconds or ISO time")
+    parser.add_argument("--threshold", type=parse_list, default=[Config.PRICE_CHANGE_THRESHOLD])
+    parser.add_argument(
+        "--cooldown", type=lambda v: parse_list(v, int), default=[Config.ALERT_COOLDOWN_SECONDS]
+    )
+    parser.add_argument(
+        "--windows", type=parse_windows, default=[tuple(Config.DETECTION_WINDOWS)],
+        help="window sets in seconds, ';' between alternatives",
+    )
+    parser.add_argument("--big-move", type=float, default=0.15, help="YES price change that counts as a big move")
+    parser.add_argument("--big-move-window", type=float, default=3600, help="seconds a big move may take")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--output", help="write the report as JSON")
+    parser.add_argument("--alerts-csv", help="write every replayed alert to this CSV file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    started = time.perf_counter()
+    tape = Tape.build(args.source, args.start, args.end)
+    logger.info(f"Loaded {tape.ticks:,} polls in {time.perf_counter() - started:.1f}s")
+    if not tape.ticks:
+        logger.error(f"No recorded polls found in {args.source}")
+        return 1
+
+    configs = sweep(args.threshold, args.cooldown, args.windows)
+    reference = big_move_config(args.big_move, args.big_move_window)
+    logger.info(f"Replaying {len(configs)} configuration(s) on {args.workers} worker(s)")
+    started = time.perf_counter()
+    big_moves, *results = run_replays(tape, [reference, *configs], args.workers)
+    logger.info(f"Replay finished in {time.perf_counter() - started:.1f}s")
+
+    rows = [score(result, big_moves, tape.span_seconds, args.big_move_window) for result in results]
+    print_report(tape, rows)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"source": args.source, "big_move": vars(reference), "results": rows}, f, indent=2)
+        print(f"\nReport written to {args.output}")
+    if args.alerts_csv:
+        write_alerts_csv(args.alerts_csv, tape, results)
+        print(f"Alerts written to {args.alerts_csv}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
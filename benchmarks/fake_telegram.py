@@ -0,0 +1,96 @@
+"""Local stand-in for the Telegram Bot API, for benchmarks and tests."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+class FakeTelegram:
+    """Serves sendMessage, getMe and getUpdates on 127.0.0.1.
+
+    Sent messages are recorded in `messages`; updates queued with
+    add_update() are returned by getUpdates. Point the client at it with
+    TELEGRAM_API_BASE_URL=<base_url>.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.messages: list[dict] = []
+        self.updates: list[dict] = []
+        self._update_id = 0
+        self._lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                self.do_POST()
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                content_type = self.headers.get("Content-Type", "")
+                if "json" in content_type and body:
+                    params = json.loads(body)
+                else:
+                    params = {k: v[0] for k, v in parse_qs(body.decode()).items()}
+                method = self.path.rsplit("/", 1)[-1].split("?", 1)[0]
+                result = fake.handle(method, params)
+                payload = json.dumps({"ok": True, "result": result}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/bot"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self) -> "FakeTelegram":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def add_update(self, chat_id: int, text: str):
+        """Queue an incoming message for getUpdates."""
+        with self._lock:
+            self._update_id += 1
+            self.updates.append({
+                "update_id": self._update_id,
+                "message": {
+                    "message_id": self._update_id,
+                    "date": int(time.time()),
+                    "chat": {"id": chat_id, "type": "private"},
+                    "text": text,
+                },
+            })
+
+    def handle(self, method: str, params: dict):
+        if self.latency:
+            time.sleep(self.latency)
+        if method == "getMe":
+            return {"id": 1, "is_bot": True, "first_name": "fake", "username": "fake_bot"}
+        if method == "sendMessage":
+            with self._lock:
+                self.messages.append(params)
+                message_id = len(self.messages)
+            chat_id = str(params.get("chat_id", "0"))
+            return {
+                "message_id": message_id,
+                "date": int(time.time()),
+                "chat": {"id": int(chat_id) if chat_id.lstrip("-").isdigit() else 0, "type": "private"},
+                "text": params.get("text", ""),
+            }
+        if method == "getUpdates":
+            offset = int(params.get("offset") or 0)
+            with self._lock:
+                return [u for u in self.updates if u["update_id"] >= offset]
+        return True
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""War-O-Meter pipeline benchmarks.
+
+Feeds synthetic Gamma payloads through each stage of the monitor and reports
+throughput and p50/p99 latency per stage:
+
+    decode    JSON decode of the /events body
+    parse     PolymarketClient._parse_event
+    delta     DeltaEngine.update
+    detect    IrregularityDetector.check_changes on the changed markets
+    format    Alert.format_message
+    record    FeedRecorder.record (the writer thread's cost is reported separately)
+    dispatch  TelegramAlertClient.send_message to a local fake Bot API
+    import    `import monitor` in a fresh interpreter (cold start)
+
+Usage:
+    python -m benchmarks.run --events 10 --markets 100 --cycles 50
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --compare bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.fake_telegram import FakeTelegram
+from benchmarks.synthetic import Dynamics, SyntheticGamma
+from src.config import Config
+from src.delta import DeltaEngine
+from src.detector import IrregularityDetector
+from src.polymarket_client import PolymarketClient, _json_loads
+from src.recorder import FeedRecorder
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Dependencies monitor.py should only import on first use
+LAZY_MODULES = ("telegram", "websockets", "multiprocessing")
+
+
+class Stage:
+    """Latency samples and processed item counts for one pipeline stage."""
+
+    def __init__(self, name: str, unit: str):
+        self.name = name
+        self.unit = unit
+        self.samples: list[float] = []
+        self.items = 0
+
+    def record(self, seconds: float, items: int):
+        self.samples.append(seconds)
+        self.items += items
+
+    def summary(self) -> dict:
+        samples = sorted(self.samples)
+        total = sum(samples)
+        return {
+            "unit": self.unit,
+            "calls": len(samples),
+            "items": self.items,
+            "throughput_per_s": self.items / total if total else 0.0,
+            "p50_ms": percentile(samples, 50) * 1000,
+            "p99_ms": percentile(samples, 99) * 1000,
+            "total_ms": total * 1000,
+        }
+
+
+def percentile(sorted_samples: list[float], pct: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, round(pct / 100 * (len(sorted_samples) - 1)))
+    return sorted_samples[index]
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def dispatch(messages: list[str], stage: Stage, fake: FakeTelegram):
+    from src.telegram_client import TelegramAlertClient
+
+    client = TelegramAlertClient(token="123:bench", chat_id="42")
+    for message in messages:
+        start = time.perf_counter()
+        await client.send_message(message)
+        stage.record(time.perf_counter() - start, 1)
+    await client.bot.shutdown()
+
+
+def measure_imports(stage: Stage, runs: int) -> list[str]:
+    """Time `import monitor` in fresh interpreters. Returns LAZY_MODULES it loaded."""
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "import monitor\n"
+        "print(time.perf_counter() - start)\n"
+        f"print(' '.join(m for m in {LAZY_MODULES!r} if m in sys.modules))\n"
+    )
+    loaded: list[str] = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.splitlines()
+        stage.record(float(out[0]), 1)
+        loaded = out[1].split() if len(out) > 1 else []
+    return loaded
+
+
+def run(args) -> dict:
+    dynamics = Dynamics(
+        volatility=args.volatility,
+        jump_probability=args.jump_probability,
+        jump_size=args.jump_size,
+        static_fraction=args.static_fraction,
+    )
+    gamma = SyntheticGamma(args.events, args.markets, dynamics, seed=args.seed)
+    client = PolymarketClient()
+    delta = DeltaEngine()
+    detector = IrregularityDetector(threshold=args.threshold, cooldown_seconds=args.cooldown)
+
+    stages = {
+        "decode": Stage("decode", "markets"),
+        "parse": Stage("parse", "markets"),
+        "delta": Stage("delta", "markets"),
+        "detect": Stage("detect", "markets"),
+        "format": Stage("format", "alerts"),
+        "record": Stage("record", "responses"),
+        "dispatch": Stage("dispatch", "messages"),
+        "import": Stage("import", "imports"),
+    }
+    messages: list[str] = []
+    now = datetime(2026, 1, 1)
+    record_dir = tempfile.TemporaryDirectory()
+    recorder = FeedRecorder(record_dir.name)
+    n_markets = args.events * args.markets
+
+    for _ in range(args.cycles):
+        gamma.step()
+        body = gamma.payload()
+        now += timedelta(seconds=args.interval)
+
+        start = time.perf_counter()
+        recorder.record(("synthetic",), body, now.timestamp())
+        stages["record"].record(time.perf_counter() - start, 1)
+
+        start = time.perf_counter()
+        data = _json_loads(body)
+        stages["decode"].record(time.perf_counter() - start, n_markets)
+
+        start = time.perf_counter()
+        events = [client._parse_event(event) for event in data]
+        stages["parse"].record(time.perf_counter() - start, n_markets)
+
+        markets = [market for event in events for market in event.markets]
+        start = time.perf_counter()
+        changes = delta.update(markets, now)
+        stages["delta"].record(time.perf_counter() - start, len(markets))
+
+        start = time.perf_counter()
+        alerts = detector.check_changes([change.market for change in changes], now)
+        stages["detect"].record(time.perf_counter() - start, len(changes))
+
+        if alerts:
+            start = time.perf_counter()
+            formatted = [alert.format_message() for alert in alerts]
+            stages["format"].record(time.perf_counter() - start, len(alerts))
+            messages.extend(formatted)
+    client.close()
+    recorder.close()
+    recording = recorder.stats()
+    record_dir.cleanup()
+
+    if args.dispatch and messages:
+        fake = FakeTelegram(latency=args.telegram_latency).start()
+        Config.TELEGRAM_API_BASE_URL = fake.base_url
+        try:
+            asyncio.run(dispatch(messages[: args.dispatch], stages["dispatch"], fake))
+        finally:
+            fake.stop()
+
+    eager = measure_imports(stages["import"], args.import_runs) if args.import_runs else []
+
+    return {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "params": vars(args) | {"output": None, "compare": None},
+        "stages": {name: stage.summary() for name, stage in stages.items()},
+        "recorder": recording,
+        "eager_imports": eager,
+    }
+
+
+def print_report(report: dict, baseline: dict | None = None):
+    params = report["params"]
+    print(
+        f"War-O-Meter benchmark @ {report['revision'] or 'unknown'}: "
+        f"{params['events']} events x {params['markets']} markets, {params['cycles']} cycles"
+    )
+    header = f"{'stage':<10}{'items/s':>14}{'p50 ms':>10}{'p99 ms':>10}"
+    if baseline:
+        header += f"{'p50 vs base':>14}"
+    print(header)
+    for name, stats in report["stages"].items():
+        if not stats["calls"]:
+            print(f"{name:<10}{'-':>14}{'-':>10}{'-':>10}")
+            continue
+        line = (
+            f"{name:<10}{stats['throughput_per_s']:>14,.0f}"
+            f"{stats['p50_ms']:>10.3f}{stats['p99_ms']:>10.3f}"
+        )
+        base = (baseline or {}).get("stages", {}).get(name)
+        if base and base["p50_ms"]:
+            line += f"{(stats['p50_ms'] / base['p50_ms'] - 1):>+14.1%}"
+        print(line)
+
+    if report.get("eager_imports"):
+        print(f"WARNING: importing monitor loaded {', '.join(report['eager_imports'])} (should be lazy)")
+
+    recording = report.get("recorder")
+    if recording and recording["records"]:
+        print(
+            f"recorder: {recording['disk_bytes'] / 1e6:.1f} MB on disk for "
+            f"{recording['bytes_in'] / 1e6:.1f} MB of responses ({recording['compression_ratio']:.1f}x), "
+            f"{recording['write_seconds'] / recording['records'] * 1000:.2f} ms per response on the writer thread"
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=10)
+    parser.add_argument("--markets", type=int, default=100, help="markets per event")
+    parser.add_argument("--cycles", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=60, help="simulated seconds between polls")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--volatility", type=float, default=0.005)
+    parser.add_argument("--jump-probability", type=float, default=0.002)
+    parser.add_argument("--jump-size", type=float, default=0.08)
+    parser.add_argument("--static-fraction", type=float, default=0.8)
+    parser.add_argument("--threshold", type=float, default=0.05)
+    parser.add_argument("--cooldown", type=int, default=300)
+    parser.add_argument("--dispatch", type=int, default=100, help="alerts to send to the fake Bot API (0 = skip)")
+    parser.add_argument("--telegram-latency", type=float, default=0.0, help="fake Bot API delay (s)")
+    parser.add_argument("--import-runs", type=int, default=5, help="cold `import monitor` timings (0 = skip)")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    report = run(args)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
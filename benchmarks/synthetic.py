@@ -0,0 +1,84 @@
+"""Synthetic Gamma /events payloads with configurable price dynamics."""
+
+import json
+import random
+from dataclasses import dataclass
+
+
+@dataclass
+class Dynamics:
+    volatility: float = 0.005  # stdev of the per-poll YES price step
+    jump_probability: float = 0.002  # chance per market per poll of a jump
+    jump_size: float = 0.08
+    static_fraction: float = 0.8  # markets whose price does not move in a poll
+
+
+class SyntheticGamma:
+    """Generates successive /events responses for N events x M markets."""
+
+    def __init__(self, events: int, markets: int, dynamics: Dynamics | None = None, seed: int = 0):
+        self.random = random.Random(seed)
+        self.dynamics = dynamics or Dynamics()
+        self.events = []
+        for e in range(events):
+            markets_data = []
+            for m in range(markets):
+                markets_data.append({
+                    "id": str(500000 + e * 1000 + m),
+                    "question": f"Will event {e} happen by deadline {m}?",
+                    "price": self.random.uniform(0.02, 0.98),
+                    "volume": self.random.uniform(1e3, 1e7),
+                    "liquidity": self.random.uniform(1e2, 1e5),
+                    "clobTokenIds": json.dumps([str(self.random.getrandbits(160)) for _ in range(2)]),
+                })
+            self.events.append({
+                "id": str(9000 + e),
+                "slug": f"synthetic-event-{e}",
+                "title": f"Synthetic event {e}",
+                "description": "Synthetic benchmark event. " * 20,
+                "markets": markets_data,
+            })
+
+    def step(self):
+        """Advance every market's price by one poll."""
+        d = self.dynamics
+        rnd = self.random
+        for event in self.events:
+            for market in event["markets"]:
+                if rnd.random() < d.static_fraction:
+                    continue
+                move = rnd.gauss(0, d.volatility)
+                if rnd.random() < d.jump_probability:
+                    move += d.jump_size if rnd.random() < 0.5 else -d.jump_size
+                market["price"] = min(0.999, max(0.001, market["price"] + move))
+                market["volume"] += rnd.uniform(0, 1e3)
+
+    def payload(self) -> bytes:
+        """Render the current state as a Gamma /events JSON body."""
+        return json.dumps([
+            {
+                "id": event["id"],
+                "slug": event["slug"],
+                "title": event["title"],
+                "description": event["description"],
+                "volume": str(sum(m["volume"] for m in event["markets"])),
+                "liquidity": "0",
+                "startDate": "2026-01-01T00:00:00Z",
+                "endDate": "2026-12-31T00:00:00Z",
+                "markets": [
+                    {
+                        "id": m["id"],
+                        "question": m["question"],
+                        "outcomePrices": json.dumps([f"{m['price']:.4f}", f"{1 - m['price']:.4f}"]),
+                        "clobTokenIds": m["clobTokenIds"],
+                        "volume": f"{m['volume']:.2f}",
+                        "liquidity": f"{m['liquidity']:.2f}",
+                        "endDate": "2026-12-31T00:00:00Z",
+                        "active": True,
+                        "closed": False,
+                    }
+                    for m in event["markets"]
+                ],
+            }
+            for event in self.events
+        ]).encode()
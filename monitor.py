@@ -4,17 +4,38 @@ War-O-Meter: Monitor Polymarket odds for dramatic probability swings
 and send alerts to Telegram.
 """
 
+import argparse
 import asyncio
 import logging
+import os
 import signal
 import sys
 import time
 from datetime import datetime
 
+from src.commands import CommandBot
 from src.config import Config
-from src.detector import IrregularityDetector
-from src.polymarket_client import PolymarketClient
+from src.delta import DeltaEngine, MarketChange
+from src.detector import Alert, create_detector
+from src.discovery import MarketDiscovery
+from src.dispatcher import AlertDispatcher
+from src.metrics import (
+    CYCLE_SECONDS,
+    DETECT_SECONDS,
+    MARKET_CHANGES,
+    PRICE_MOVES,
+    REGISTRY,
+    start_metrics_server,
+)
+from src.order_book import BookEnricher
+from src.polymarket_client import AsyncPolymarketClient, Market
+from src.price_stream import PriceStream
+from src.recorder import FeedRecorder
+from src.scheduler import PollScheduler
+from src.state_manager import StateManager, resident_bytes
+from src.state_store import create_state_store
 from src.telegram_client import TelegramAlertClient
+from src.term_structure import LadderTracker
 
 logging.basicConfig(
     level=logging.INFO,
@@ -26,80 +47,696 @@ logger = logging.getLogger("war-o-meter")
 
 class Monitor:
     def __init__(self):
-        self.polymarket = PolymarketClient()
+        self.recorder = FeedRecorder() if Config.RECORDER_ENABLED else None
+        raw_recorder = self.recorder if Config.RECORDER_MODE == "raw" else None
+        self.polymarket = AsyncPolymarketClient(recorder=raw_recorder)
         self.telegram = TelegramAlertClient()
-        self.detector = IrregularityDetector()
+        self.dispatcher = AlertDispatcher(self.telegram)
+        self.detector = create_detector()
+        self.ladders = LadderTracker() if Config.LADDER_DETECTION else None
+        self.books = BookEnricher(self.polymarket) if Config.BOOK_ENRICHMENT else None
+        self.delta = DeltaEngine()
+        self.delta.subscribe(self.observe_changes)
+        if self.recorder and not raw_recorder:
+            self.delta.subscribe(self.recorder.record_changes)
+        self.state_store = create_state_store()
+        if self.state_store:
+            self.detector.enable_change_log()
+        self.stream = PriceStream(self.handle_stream_update) if Config.STREAM_ENABLED else None
+        self.scheduler = PollScheduler(Config.EVENT_SLUGS)
+        self.state = StateManager(
+            self.detector, self.delta, self.polymarket, self.stream, store=self.state_store
+        )
+        self.delta.subscribe(self.state.observe_changes)
+        self.discovery = None
+        if Config.DISCOVERY_ENABLED:
+            self.discovery = MarketDiscovery(self.polymarket, pinned=Config.EVENT_SLUGS)
+        self.commands = None
+        if Config.COMMANDS_ENABLED and Config.TELEGRAM_BOT_TOKEN:
+            self.commands = CommandBot(self.telegram, self.dispatcher)
+            self.delta.subscribe(self.commands.observe_changes)
+        self.event_markets: dict[str, list[str]] = {}  # slug -> market ids, for retiring events
+        self.started = datetime.utcnow()
+        self.dry_run = False  # log alerts instead of sending them
+        self.last_poll: datetime | None = None
+        self.last_error: Exception | None = None  # from the most recent check_and_alert()
         self.running = False
+        self._wakeup: asyncio.Event | None = None
+        self.register_metrics()
+
+    def register_metrics(self):
+        """Expose state owned by other components as scrape-time metrics."""
+        REGISTRY.gauge(
+            "warometer_dispatch_queue_depth", "Messages waiting to be delivered, across all alert sinks",
+            lambda: self.dispatcher.pending(),
+        )
+        REGISTRY.callback_counter(
+            "warometer_dispatch_dropped_total", "Messages dropped because the dispatch queue was full",
+            lambda: self.dispatcher.dropped,
+        )
+        REGISTRY.gauge(
+            "warometer_markets_tracked", "Markets with price history in the detector",
+            lambda: len(self.detector.price_history),
+        )
+        REGISTRY.callback_counter(
+            "warometer_alerts_fired_total", "Alerts raised by the detector",
+            lambda: self.detector.alerts_fired,
+        )
+        REGISTRY.callback_counter(
+            "warometer_alerts_suppressed_total", "Threshold crossings suppressed by the alert cooldown",
+            lambda: self.detector.alerts_suppressed,
+        )
+        REGISTRY.callback_counter(
+            "warometer_gamma_cache_hits_total", "Gamma responses in which no event changed since it was last fetched",
+            lambda: self.polymarket.cache_hits,
+        )
+        REGISTRY.callback_counter(
+            "warometer_gamma_cache_misses_total", "Gamma responses with at least one changed event to parse",
+            lambda: self.polymarket.cache_misses,
+        )
+        REGISTRY.gauge(
+            "warometer_gamma_circuit_open", "1 while the Gamma circuit breaker is open or half-open",
+            lambda: 1 if self.polymarket.breaker.is_open else 0,
+        )
+        REGISTRY.callback_counter(
+            "warometer_gamma_circuit_opens_total", "Times the Gamma circuit breaker opened",
+            lambda: self.polymarket.breaker.opens,
+        )
+        REGISTRY.callback_counter(
+            "warometer_gamma_retry_budget_denied_total", "Retries and hedges skipped because the retry budget ran out",
+            lambda: self.polymarket.retry_budget.denied,
+        )
+        REGISTRY.gauge(
+            "warometer_gamma_stale_events", "Events served from the last good response because Gamma failed",
+            lambda: len(self.polymarket.stale),
+        )
+        REGISTRY.gauge(
+            "warometer_state_markets", "Markets with in-memory state (bounded by STATE_MAX_MARKETS)",
+            lambda: len(self.state),
+        )
+        REGISTRY.callback_counter(
+            "warometer_state_evicted_total", "Markets evicted from memory as closed, unseen or over capacity",
+            lambda: self.state.evicted,
+        )
+        REGISTRY.gauge(
+            "warometer_state_memory_bytes", "Estimated memory held by per-market state",
+            lambda: self.state.memory_estimate()["total"],
+        )
+        REGISTRY.gauge(
+            "warometer_process_resident_bytes", "Resident set size of the monitor process",
+            lambda: resident_bytes() or 0,
+        )
+        if self.ladders:
+            REGISTRY.callback_counter(
+                "warometer_ladder_alerts_folded_total", "Per-market alerts folded into date-ladder alerts",
+                lambda: self.ladders.alerts_folded,
+            )
+            REGISTRY.callback_counter(
+                "warometer_ladder_violations_total", "Date ladders found priced out of order",
+                lambda: self.ladders.violations_found,
+            )
+        if self.books:
+            REGISTRY.callback_counter(
+                "warometer_book_enriched_total", "Alerts sent with order-book spread and depth",
+                lambda: self.books.enriched,
+            )
+            REGISTRY.callback_counter(
+                "warometer_book_missed_total", "Alerts sent without book data (no token, error or over budget)",
+                lambda: self.books.missed,
+            )
+        if self.commands:
+            REGISTRY.callback_counter(
+                "warometer_commands_answered_total", "Telegram commands answered from the status snapshot",
+                lambda: self.commands.answered,
+            )
+            REGISTRY.callback_counter(
+                "warometer_commands_throttled_total", "Telegram commands ignored because the chat asked too often",
+                lambda: self.commands.throttled,
+            )
+        if self.discovery:
+            REGISTRY.gauge(
+                "warometer_discovered_events", "Events found by market discovery and being polled",
+                lambda: len(self.discovery.discovered),
+            )
+        if self.recorder:
+            REGISTRY.callback_counter(
+                "warometer_recorder_records_total", "Gamma responses written to the feed recorder",
+                lambda: self.recorder.records,
+            )
+            REGISTRY.callback_counter(
+                "warometer_recorder_dropped_total", "Gamma responses dropped because the recorder fell behind",
+                lambda: self.recorder.dropped,
+            )
+            REGISTRY.callback_counter(
+                "warometer_recorder_bytes_written_total", "Compressed bytes written by the feed recorder",
+                lambda: self.recorder.bytes_written,
+            )
+            REGISTRY.callback_counter(
+                "warometer_recorder_write_seconds_total", "Time the recorder thread spent compressing and writing",
+                lambda: self.recorder.write_seconds,
+            )
+
+    async def announce(self):
+        """Tell the alert sinks the monitor is up, or warn that there are none."""
+        if self.dispatcher.sinks:
+            await self.send_startup_message()
+        else:
+            logger.warning(
+                "No alert sinks configured - alerts will only be logged"
+            )
 
     async def send_startup_message(self):
         """Send a startup notification."""
         message = (
             f"🔔 War-O-Meter Started\n\n"
-            f"Monitoring: {Config.EVENT_SLUG}\n"
+            f"Monitoring: {', '.join(Config.EVENT_SLUGS)}\n"
             f"Threshold: {Config.PRICE_CHANGE_THRESHOLD:.0%}\n"
-            f"Poll interval: {Config.POLL_INTERVAL_SECONDS}s"
+            f"Poll interval: {self.describe_interval()}"
         )
-        await self.telegram.send_plain_alert(message)
+        self.dispatcher.submit([message])
+
+    def status_lines(self) -> list[str]:
+        """Summary lines for the /status command."""
+        if Config.DETECTOR_STRATEGY == "zscore":
+            detection = f"z-score >= {Config.ZSCORE_THRESHOLD:g}"
+        else:
+            detection = f"{Config.PRICE_CHANGE_THRESHOLD:.0%} move"
+        last_poll = f"{self.last_poll:%H:%M:%S} UTC" if self.last_poll else "not yet"
+        lines = [
+            f"Events: {len(self.scheduler.events)}",
+            f"Markets: {len(self.detector.price_history)}",
+            f"Alerting on: {detection}",
+            f"Poll interval: {self.describe_interval()}",
+            f"Last poll: {last_poll}",
+            f"Alerts sent: {self.detector.alerts_fired}",
+            f"Up since: {self.started:%Y-%m-%d %H:%M} UTC",
+        ]
+        if self.stream:
+            lines.append(f"Price stream: {'connected' if self.stream.connected else 'disconnected'}")
+        if self.polymarket.stale:
+            lines.append(
+                f"⚠️ Gamma unavailable - {len(self.polymarket.stale)} events showing last known prices"
+            )
+        return lines
+
+    def refresh_status(self):
+        """Render the snapshot Telegram commands are answered from."""
+        if self.commands:
+            now = datetime.utcnow()
+            self.commands.refresh(self.status_lines(), self.detector.price_history, now)
+
+    def describe_interval(self) -> str:
+        if self.scheduler.adaptive:
+            return f"{self.scheduler.min_interval:.0f}-{self.scheduler.max_interval:.0f}s (adaptive)"
+        return f"{Config.POLL_INTERVAL_SECONDS}s"
 
-    async def check_and_alert(self):
-        """Fetch current odds and send alerts for any irregularities."""
+    async def check_and_alert(self, slugs: list[str] | None = None):
+        """Fetch current odds and send alerts for any irregularities.
+
+        `slugs` defaults to every configured event; an empty list (nothing
+        due, or the request budget is spent) polls nothing.
+        """
+        if slugs is None:
+            slugs = Config.EVENT_SLUGS
+        if not slugs:
+            return
+        events = {}
+        alerts = []
+        cycle_start = time.perf_counter()
+        self.last_poll = datetime.utcnow()
+        self.last_error = None
         try:
-            markets = self.polymarket.get_markets_for_event(Config.EVENT_SLUG)
+            events = await self.polymarket.get_events_by_slugs(
+                slugs, changed_only=True, budget=self.scheduler.budget
+            )
+            logger.debug(f"Gamma response cache: {self.polymarket.cache_stats()}")
+
+            # Unchanged payloads skip parsing and detection entirely
+            if not events:
+                stale = len(self.polymarket.stale)
+                if stale:
+                    logger.info(
+                        f"No fresh data - {stale} events stale (Gamma circuit {self.polymarket.breaker.state})"
+                    )
+                else:
+                    logger.info("No changes since last poll")
+                return
 
+            markets = [market for event in events.values() for market in event.markets]
             if not markets:
-                logger.warning(f"No markets found for event: {Config.EVENT_SLUG}")
+                logger.warning("No markets found for changed events")
                 return
 
-            logger.info(f"Fetched {len(markets)} markets")
+            logger.info(f"Fetched {len(markets)} markets across {len(events)} changed events")
+            if self.ladders:
+                self.ladders.update_events(events.values())
             for market in markets:
                 logger.debug(
                     f"  - {market.question}: YES={market.yes_percent:.1f}%"
                 )
 
-            # Check for irregularities
-            alerts = self.detector.check_markets(markets)
+            # While the stream is live it is the source of prices; REST only
+            # refreshes the set of tracked markets.
+            if self.stream:
+                self.stream.track(markets)
+                if self.stream.connected:
+                    return
 
-            # Send alerts
-            for alert in alerts:
-                message = alert.format_message()
-                logger.warning(f"Alert triggered: {message}")
-                await self.telegram.send_plain_alert(message)
+            alerts = await self.process_markets(markets)
 
         except Exception as e:
             logger.error(f"Error during check: {e}")
+            self.last_error = e
+        finally:
+            CYCLE_SECONDS.observe(time.perf_counter() - cycle_start)
+            self.reschedule(slugs, events, alerts)
+
+    def reschedule(self, slugs: list[str], events: dict, alerts: list):
+        """Feed poll results back into the scheduler."""
+        slug_of = {market.id: slug for slug, event in events.items() for market in event.markets}
+        alert_counts = {}
+        # A ladder move and violation on one rung count as one alerting market
+        for market_id in {alert.market_id for alert in alerts}:
+            slug = slug_of.get(market_id)
+            alert_counts[slug] = alert_counts.get(slug, 0) + 1
+
+        streaming = self.stream is not None and self.stream.connected
+        self.scheduler.floor = Config.STREAM_REST_REFRESH_SECONDS if streaming else 0.0
+        for slug in slugs:
+            self.scheduler.record(slug, events.get(slug), alert_counts.get(slug, 0))
+            if slug not in events:
+                # Polled but unchanged: its markets are still live
+                self.state.touch(self.event_markets.get(slug, ()))
+
+        for slug, event in events.items():
+            self.event_markets[slug] = [market.id for market in event.markets]
+            self.state.observe(event.markets)
+            closed = event.closed or (event.markets and all(m.closed for m in event.markets))
+            if closed and self.discovery and self.discovery.retire(slug):
+                logger.info(f"Discovered event closed: {slug}")
+                self.retire_event(slug)
+
+    async def discovery_loop(self):
+        """Refresh discovered events on their own, slower cadence."""
+        while self.running:
+            try:
+                added, retired = await self.discovery.refresh()
+                for slug in added:
+                    logger.info(f"Discovered event: {slug} ({self.discovery.discovered[slug]})")
+                    self.scheduler.add(slug)
+                if added:
+                    self.wake()
+                for slug in retired:
+                    logger.info(f"Discovered event no longer listed: {slug}")
+                    self.retire_event(slug)
+            except Exception as e:
+                logger.error(f"Market discovery failed: {e}")
+            await asyncio.sleep(Config.DISCOVERY_INTERVAL_SECONDS)
+
+    def retire_event(self, slug: str):
+        """Stop polling an event; its markets are evicted at the next sweep."""
+        self.scheduler.remove(slug)
+        self.polymarket.forget_events([slug])
+        self.state.retire(self.event_markets.pop(slug, []))
+        if self.ladders:
+            self.ladders.forget_event(slug)
+
+    async def sweep_state(self):
+        """Evict closed, long-unseen and excess markets, spilling them if configured."""
+        if not self.state.sweep_due():
+            return
+        evicted = self.state.sweep()
+        if evicted and self.state.spill_path:
+            try:
+                await asyncio.to_thread(self.state.spill, evicted)
+            except Exception as e:
+                logger.error(f"Failed to spill evicted market state: {e}")
+
+    async def handle_stream_update(self, markets: list[Market]):
+        """Run detection on markets updated by the price stream."""
+        try:
+            await self.process_markets(markets)
+        except Exception as e:
+            logger.error(f"Error handling stream update: {e}")
+
+    def observe_changes(self, changes: list[MarketChange], now: datetime):
+        """Delta subscriber: count changes and the size of price moves."""
+        MARKET_CHANGES.inc(len(changes))
+        for change in changes:
+            if change.old_yes_price is not None:
+                PRICE_MOVES.observe(abs(change.new_yes_price - change.old_yes_price))
+
+    async def process_markets(self, markets: list[Market]) -> list[Alert]:
+        """Check markets for irregularities and queue any alerts."""
+        now = datetime.utcnow()
+        # Closed markets the detector no longer tracks stay out for good
+        tracked = self.detector.price_history
+        markets = [m for m in markets if not m.closed or m.id in tracked]
+        changes = self.delta.update(markets, now)
+        await self.state.revive_queued()
+        with DETECT_SECONDS.time():
+            alerts = self.detector.check_changes([change.market for change in changes], now)
+            if self.ladders:
+                alerts = self.ladders.process(changes, alerts, now)
+        if alerts and self.books:
+            # Bounded by BOOK_BUDGET_SECONDS. At-risk markets re-checked without a
+            # change this cycle are enriched too, from their last-seen Market
+            await self.books.enrich(alerts, self.delta.markets(alert.market_id for alert in alerts))
+        await self.save_state()
+        if alerts:
+            self.publish(alerts)
+        return alerts
+
+    def publish(self, alerts: list[Alert]):
+        """Queue alerts for Telegram."""
+        messages = []
+        for alert in alerts:
+            message = alert.format_message()
+            logger.warning(f"Alert triggered: {message}")
+            messages.append(message)
+        if self.dry_run:
+            return
+
+        # Delivery happens on the sinks' tasks; never wait on Telegram here
+        self.dispatcher.submit(messages, alerts=alerts)
+
+    async def save_state(self):
+        """Persist this cycle's snapshots and alerts in one batched write."""
+        if not self.state_store:
+            return
+        snapshots, alerts = self.detector.drain_changes()
+        try:
+            await asyncio.to_thread(self.state_store.save, snapshots, alerts)
+        except Exception as e:
+            logger.error(f"Failed to save detector state: {e}")
 
     async def run(self):
         """Main monitoring loop."""
         self.running = True
+        self._wakeup = asyncio.Event()
         logger.info("Starting War-O-Meter monitor...")
-        logger.info(f"Event slug: {Config.EVENT_SLUG}")
-        logger.info(f"Poll interval: {Config.POLL_INTERVAL_SECONDS}s")
+        logger.info(f"Event slugs ({len(Config.EVENT_SLUGS)}): {', '.join(Config.EVENT_SLUGS)}")
+        logger.info(f"Poll interval: {self.describe_interval()}")
         logger.info(f"Price change threshold: {Config.PRICE_CHANGE_THRESHOLD:.0%}")
+        if self.stream:
+            logger.info(f"Streaming prices from {self.stream.url}")
+        if self.discovery:
+            logger.info(
+                f"Discovering events every {Config.DISCOVERY_INTERVAL_SECONDS}s "
+                f"(tags: {', '.join(self.discovery.tags) or 'any'}; "
+                f"keywords: {', '.join(self.discovery.keywords) or 'any'})"
+            )
+        if self.recorder:
+            what = "raw Gamma responses" if Config.RECORDER_MODE == "raw" else "market changes"
+            logger.info(f"Recording {what} to {self.recorder.directory}/")
+
+        self.dispatcher.start()
+        metrics_server = await start_metrics_server() if Config.METRICS_ENABLED else None
 
         # Send startup message
-        if Config.TELEGRAM_BOT_TOKEN and Config.TELEGRAM_CHAT_ID:
-            await self.send_startup_message()
+        await self.announce()
+
+        await self.load_state()
+
+        stream_task = discovery_task = commands_task = None
+        try:
+            # Initial check
+            await self.check_and_alert(self.scheduler.due())
+            self.refresh_status()
+
+            if self.stream:
+                stream_task = asyncio.create_task(self.stream.run())
+            if self.discovery:
+                discovery_task = asyncio.create_task(self.discovery_loop())
+            if self.commands:
+                commands_task = asyncio.create_task(self.commands.run())
+            streaming = False
+
+            # Main loop: wait for the next deadline rather than sleeping after work
+            while self.running:
+                delay = self.scheduler.next_wakeup() - time.monotonic()
+                if self.stream:
+                    # Wake up regularly to notice a dropped stream
+                    delay = min(delay, Config.POLL_INTERVAL_SECONDS)
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                self._wakeup.clear()
+
+                if self.stream:
+                    if streaming and not self.stream.connected:
+                        logger.warning("Price stream lost - falling back to REST polling")
+                        self.scheduler.poll_all_now()
+                    streaming = self.stream.connected
+
+                slugs = self.scheduler.due()
+                if slugs:
+                    await self.check_and_alert(slugs)
+                self.refresh_status()
+                await self.sweep_state()
+        finally:
+            if stream_task:
+                self.stream.stop()
+                stream_task.cancel()
+            if discovery_task:
+                discovery_task.cancel()
+            if commands_task:
+                self.commands.stop()
+                commands_task.cancel()
+            if metrics_server:
+                metrics_server.close()
+            await self.close()
+
+    async def run_once(self, dry_run: bool = False) -> int:
+        """Run one fetch and detect cycle and exit, e.g. from cron.
+
+        Detection compares against the state store, if one is configured.
+        With dry_run, alerts are only logged and the state is not saved.
+        Returns the process exit code: 1 if no event could be fetched or the
+        cycle failed, so cron and probes notice an outage.
+        """
+        logger.info(f"Checking {len(Config.EVENT_SLUGS)} events once{' (dry run)' if dry_run else ''}")
+        await self.load_state()
+        if dry_run:
+            self.dry_run = True
+            if self.state_store:
+                self.state_store.close()
+                self.state_store = None
         else:
-            logger.warning(
-                "Telegram not configured - alerts will only be logged"
-            )
+            self.dispatcher.start()
+        try:
+            await self.check_and_alert(self.scheduler.due())
+        finally:
+            await self.close()
+        if self.last_error is not None:
+            return 1  # already logged by check_and_alert
+        if not self.event_markets:
+            logger.error(f"None of the {len(Config.EVENT_SLUGS)} events could be fetched")
+            return 1
+        logger.info(
+            f"Checked {len(self.detector.price_history)} markets in {len(self.event_markets)} events, "
+            f"{self.detector.alerts_fired} alerts"
+        )
+        return 0
 
-        # Initial check
-        await self.check_and_alert()
+    async def load_state(self):
+        """Restore detector state from the state store, if one is configured."""
+        if self.state_store:
+            try:
+                await asyncio.to_thread(self.state_store.load, self.detector)
+            except Exception as e:
+                logger.error(f"Failed to restore detector state: {e}")
 
-        # Main loop
-        while self.running:
-            await asyncio.sleep(Config.POLL_INTERVAL_SECONDS)
-            await self.check_and_alert()
+    async def close(self):
+        """Flush queued alerts and release clients, files and the database."""
+        await self.polymarket.aclose()
+        await self.dispatcher.close()
+        if self.state_store:
+            self.state_store.close()
+        self.state.close()
+        if self.recorder:
+            await asyncio.to_thread(self.recorder.close)
+            stats = self.recorder.stats()
+            logger.info(
+                f"Recorded {stats['records']} responses, {stats['disk_bytes'] / 1e6:.1f} MB on disk "
+                f"({stats['compression_ratio']:.1f}x), {stats['write_seconds']:.2f}s writing, "
+                f"{stats['dropped']} dropped"
+            )
+
+    def wake(self):
+        """Re-check the schedule now, e.g. after events were added."""
+        if self._wakeup:
+            self._wakeup.set()
 
     def stop(self):
         """Stop the monitor."""
         logger.info("Stopping monitor...")
         self.running = False
-        self.polymarket.close()
 
 
-async def main():
+class ShardMonitor(Monitor):
+    """Monitor running as one worker in sharded mode.
+
+    Polls only the events the coordinator assigns it over `conn`, sends
+    alerts back instead of to Telegram, and reports a heartbeat every
+    SHARD_HEARTBEAT_SECONDS.
+    """
+
+    def __init__(self, name: str, conn):
+        super().__init__()
+        self.name = name
+        self.conn = conn
+        self._main: asyncio.Task | None = None
+
+    async def announce(self):
+        pass  # the coordinator owns Telegram
+
+    def publish(self, alerts: list[Alert]):
+        for alert in alerts:
+            logger.info(f"Alert triggered: {alert.market_id} {alert.old_price:.3f} -> {alert.new_price:.3f}")
+        self.send("alerts", alerts)
+
+    def send(self, kind: str, payload):
+        try:
+            self.conn.send((kind, payload))
+        except (BrokenPipeError, OSError) as e:
+            logger.error(f"Lost coordinator ({e}) - stopping")
+            self.shutdown()
+
+    def on_command(self):
+        """Apply add/remove/stop commands from the coordinator."""
+        try:
+            while self.conn.poll():
+                kind, slugs = self.conn.recv()
+                if kind == "add":
+                    for slug in slugs:
+                        self.scheduler.add(slug)
+                    logger.info(f"Assigned {len(slugs)} events, polling {len(self.scheduler.events)}")
+                    self.wake()
+                elif kind == "remove":
+                    for slug in slugs:
+                        self.retire_event(slug)
+                    logger.info(f"Released {len(slugs)} events, polling {len(self.scheduler.events)}")
+                elif kind == "stop":
+                    self.shutdown()
+                    return
+        except (EOFError, OSError):
+            logger.error("Lost coordinator - stopping")
+            self.shutdown()
+
+    async def heartbeat_loop(self):
+        while True:
+            self.send("heartbeat", {
+                "events": len(self.scheduler.events),
+                "markets": len(self.detector.price_history),
+                "alerts": self.detector.alerts_fired,
+            })
+            await asyncio.sleep(Config.SHARD_HEARTBEAT_SECONDS)
+
+    def shutdown(self):
+        self.stop()
+        if self._main:
+            self._main.cancel()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        loop.add_reader(self.conn.fileno(), self.on_command)
+        heartbeat = asyncio.create_task(self.heartbeat_loop())
+        self._main = asyncio.create_task(super().run())
+        try:
+            await self._main
+        except asyncio.CancelledError:
+            pass
+        finally:
+            heartbeat.cancel()
+            loop.remove_reader(self.conn.fileno())
+            self.conn.close()
+
+
+def _shard_path(path: str, name: str) -> str:
+    root, ext = os.path.splitext(path)
+    return f"{root}.{name}{ext}"
+
+
+def run_shard(name: str, conn):
+    """Entry point of a shard worker process."""
+    for handler in logging.getLogger().handlers:
+        handler.setFormatter(logging.Formatter(
+            f"%(asctime)s - {name} - %(name)s - %(levelname)s - %(message)s"
+        ))
+    # The coordinator handles Ctrl-C and stops workers over the pipe
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    Config.EVENT_SLUGS = []
+    Config.TELEGRAM_BOT_TOKEN = ""
+    Config.ALERT_WEBHOOK_URLS = []
+    Config.ALERT_FILE_PATH = ""
+    Config.METRICS_ENABLED = False
+    Config.DISCOVERY_ENABLED = False
+    Config.POLL_BUDGET_PER_MINUTE = max(1, Config.POLL_BUDGET_PER_MINUTE // Config.SHARD_WORKERS)
+    Config.STATE_DB_PATH = _shard_path(Config.STATE_DB_PATH, name)
+    Config.RECORDER_DIR = os.path.join(Config.RECORDER_DIR, name)
+    if Config.STATE_SPILL_PATH:
+        Config.STATE_SPILL_PATH = _shard_path(Config.STATE_SPILL_PATH, name)
+
+    asyncio.run(ShardMonitor(name, conn).run())
+
+
+async def run_sharded():
+    """Run SHARD_WORKERS worker processes under a coordinator."""
+    from src.sharding import ShardCoordinator  # pulls in multiprocessing
+
+    logger.info(f"Starting War-O-Meter coordinator with {Config.SHARD_WORKERS} shard workers...")
+    polymarket = AsyncPolymarketClient() if Config.DISCOVERY_ENABLED else None
+    discovery = MarketDiscovery(polymarket, pinned=Config.EVENT_SLUGS) if polymarket else None
+    dispatcher = AlertDispatcher(TelegramAlertClient())
+    coordinator = ShardCoordinator(run_shard, Config.EVENT_SLUGS, dispatcher, discovery=discovery)
+
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, coordinator.stop)
+
+    dispatcher.start()
+    metrics_server = await start_metrics_server() if Config.METRICS_ENABLED else None
+    if dispatcher.sinks:
+        dispatcher.submit([
+            f"🔔 War-O-Meter Started\n\n"
+            f"Monitoring: {', '.join(Config.EVENT_SLUGS)}\n"
+            f"Threshold: {Config.PRICE_CHANGE_THRESHOLD:.0%}\n"
+            f"Shards: {Config.SHARD_WORKERS}"
+        ])
+    else:
+        logger.warning("No alert sinks configured - alerts will only be logged")
+    try:
+        await coordinator.run()
+    finally:
+        await dispatcher.close()
+        if polymarket:
+            await polymarket.aclose()
+        if metrics_server:
+            metrics_server.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Monitor Polymarket odds and alert on dramatic swings.")
+    parser.add_argument("--once", action="store_true", help="run one fetch and detect cycle, then exit")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="like --once, but only log alerts and leave saved state alone"
+    )
+    return parser.parse_args(argv)
+
+
+async def main() -> int | None:
+    args = parse_args()
+    if args.once or args.dry_run:
+        return await Monitor().run_once(dry_run=args.dry_run)
+
+    if Config.SHARD_WORKERS > 1:
+        await run_sharded()
+        return
+
     monitor = Monitor()
 
     # Handle shutdown signals
@@ -114,4 +751,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,328 @@
+"""Replay recorded prices through IrregularityDetector to tune its parameters."""
+
+import gzip
+import itertools
+import json
+import logging
+import os
+import tempfile
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Iterator
+
+import numpy as np
+
+from src.detector import EPOCH, IrregularityDetector, format_window
+from src.polymarket_client import Market, _json_loads, _parse_outcome_prices
+from src.recorder import FeedReader
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ReplayConfig:
+    threshold: float
+    cooldown_seconds: int
+    windows: tuple[float, ...]
+
+    def label(self) -> str:
+        windows = ",".join(format_window(w) for w in self.windows) or "tick"
+        return f"{self.threshold:.1%} / {self.cooldown_seconds}s / {windows}"
+
+
+@dataclass(slots=True)
+class ReplayAlert:
+    row: int  # market row in the tape
+    timestamp: float
+    old_price: float
+    new_price: float
+    change: float
+    window_seconds: float | None
+
+
+@dataclass
+class ReplayResult:
+    config: ReplayConfig
+    alerts: list[ReplayAlert] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+class Tape:
+    """Recorded observations in columnar form, one tick per recorded poll.
+
+    Tick i happened at times[i] and covers entries offsets[i]:offsets[i + 1]
+    of rows (index into market_ids) and prices (YES price). Saved tapes are
+    plain .npy files that worker processes memory-map instead of re-parsing
+    the recording.
+    """
+
+    ARRAYS = ("times", "offsets", "rows", "prices")
+
+    def __init__(self, market_ids, questions, times, offsets, rows, prices):
+        self.market_ids: list[str] = market_ids
+        self.questions: list[str] = questions
+        self.times = times
+        self.offsets = offsets
+        self.rows = rows
+        self.prices = prices
+
+    @property
+    def ticks(self) -> int:
+        return len(self.times)
+
+    @property
+    def span_seconds(self) -> float:
+        return float(self.times[-1] - self.times[0]) if len(self.times) else 0.0
+
+    @classmethod
+    def build(cls, source: str, start: float = 0.0, end: float = float("inf")) -> "Tape":
+        """Read a recorder directory or a JSONL(.gz) file into a tape."""
+        index: dict[str, int] = {}
+        market_ids: list[str] = []
+        questions: list[str] = []
+        times = array("d")
+        offsets = array("q", [0])
+        rows = array("i")
+        prices = array("d")
+
+        for timestamp, observations in _read_ticks(source, start, end):
+            for market_id, (question, price) in observations.items():
+                row = index.get(market_id)
+                if row is None:
+                    row = index[market_id] = len(market_ids)
+                    market_ids.append(market_id)
+                    questions.append(question)
+                elif question and not questions[row]:
+                    questions[row] = question
+                rows.append(row)
+                prices.append(price)
+            times.append(timestamp)
+            offsets.append(len(rows))
+
+        return cls(
+            market_ids,
+            questions,
+            np.frombuffer(times, dtype=np.float64),
+            np.frombuffer(offsets, dtype=np.int64),
+            np.frombuffer(rows, dtype=np.int32),
+            np.frombuffer(prices, dtype=np.float64),
+        )
+
+    def save(self, directory: str):
+        for name in self.ARRAYS:
+            np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(directory, "markets.json"), "w") as f:
+            json.dump({"ids": self.market_ids, "questions": self.questions}, f)
+
+    @classmethod
+    def load(cls, directory: str) -> "Tape":
+        with open(os.path.join(directory, "markets.json")) as f:
+            markets = json.load(f)
+        arrays = [np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in cls.ARRAYS]
+        return cls(markets["ids"], markets["questions"], *arrays)
+
+
+def _read_ticks(source: str, start: float, end: float) -> Iterator[tuple[float, dict]]:
+    """Yield (timestamp, {market_id: (question, yes_price)}) per recorded poll.
+
+    A directory is read as a feed recorder archive. Any other path is read
+    as JSONL, gzip-compressed if it ends in .gz, where each line is either a
+    recorder record ({"ts", "payload"} or {"ts", "changes"}) or a single
+    price snapshot ({"ts", "market_id", "question", "yes_price"}).
+    Consecutive snapshots with the same ts form one poll. Input must be in
+    time order.
+    """
+    questions: dict[str, str] = {}
+    if os.path.isdir(source):
+        for record in FeedReader(source).read(start, end):
+            yield record["ts"], _record_observations(record, questions)
+        return
+
+    opener = gzip.open if source.endswith(".gz") else open
+    tick_time = None
+    observations: dict[str, tuple[str, float]] = {}
+    with opener(source, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = _json_loads(line)
+            timestamp = float(record["ts"])
+            if timestamp < start or timestamp > end:
+                continue
+            if "payload" in record or "changes" in record:
+                yield timestamp, _record_observations(record, questions)
+                continue
+            if timestamp != tick_time and observations:
+                yield tick_time, observations
+                observations = {}
+            tick_time = timestamp
+            observations[str(record["market_id"])] = (
+                record.get("question", ""),
+                float(record["yes_price"]),
+            )
+    if observations:
+        yield tick_time, observations
+
+
+def _record_observations(record: dict, questions: dict[str, str]) -> dict[str, tuple[str, float]]:
+    """Extract YES prices from a feed recorder record.
+
+    Raw records carry the Gamma /events response; change records carry
+    [id, old_yes, new_yes, old_no, new_no, volume_delta] rows, with each
+    question given the first time a market appears in a segment.
+    """
+    if "payload" not in record:
+        questions.update(record.get("questions") or {})
+        return {
+            market_id: (questions.get(market_id, ""), new_yes)
+            for market_id, _, new_yes, *_ in record["changes"]
+        }
+
+    observations = {}
+    for event in record["payload"] or []:
+        for market in event.get("markets") or []:
+            yes_price, _ = _parse_outcome_prices(market.get("outcomePrices"))
+            observations[str(market.get("id", ""))] = (market.get("question") or "", yes_price)
+    return observations
+
+
+def replay(tape: Tape, config: ReplayConfig) -> ReplayResult:
+    """Run one detector configuration over the whole tape in simulated time."""
+    started = time.perf_counter()
+    detector = IrregularityDetector(config.threshold, config.cooldown_seconds, list(config.windows))
+    # One reusable Market per row; the detector copies prices, never keeps these
+    markets = [
+        Market(
+            id=market_id,
+            question=question,
+            outcome_yes_price=0.0,
+            outcome_no_price=0.0,
+            volume=0.0,
+            liquidity=0.0,
+            end_date=None,
+            active=True,
+            closed=False,
+        )
+        for market_id, question in zip(tape.market_ids, tape.questions)
+    ]
+    row_of = {market_id: row for row, market_id in enumerate(tape.market_ids)}
+    offsets = tape.offsets.tolist()
+
+    result = ReplayResult(config)
+    for tick, timestamp in enumerate(tape.times.tolist()):
+        lo, hi = offsets[tick], offsets[tick + 1]
+        batch = []
+        for row, price in zip(tape.rows[lo:hi].tolist(), tape.prices[lo:hi].tolist()):
+            market = markets[row]
+            market.outcome_yes_price = price
+            batch.append(market)
+        for alert in detector.check_changes(batch, EPOCH + timedelta(seconds=timestamp)):
+            result.alerts.append(ReplayAlert(
+                row=row_of[alert.market_id],
+                timestamp=timestamp,
+                old_price=alert.old_price,
+                new_price=alert.new_price,
+                change=alert.change_percent,
+                window_seconds=alert.window_seconds,
+            ))
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+_worker_tape: Tape | None = None
+
+
+def _init_worker(directory: str):
+    global _worker_tape
+    _worker_tape = Tape.load(directory)
+
+
+def _replay_in_worker(config: ReplayConfig) -> ReplayResult:
+    return replay(_worker_tape, config)
+
+
+def run_replays(tape: Tape, configs: list[ReplayConfig], workers: int = 1) -> list[ReplayResult]:
+    """Replay each configuration, fanning out across a process pool."""
+    if workers <= 1 or len(configs) <= 1:
+        return [replay(tape, config) for config in configs]
+
+    with tempfile.TemporaryDirectory(prefix="war-o-meter-tape-") as directory:
+        tape.save(directory)
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(configs)), initializer=_init_worker, initargs=(directory,)
+        ) as pool:
+            return list(pool.map(_replay_in_worker, configs))
+
+
+def sweep(
+    thresholds: list[float], cooldowns: list[int], windows: list[tuple[float, ...]]
+) -> list[ReplayConfig]:
+    """Every combination of the given parameter values."""
+    return [
+        ReplayConfig(threshold, cooldown, window)
+        for threshold, cooldown, window in itertools.product(thresholds, cooldowns, windows)
+    ]
+
+
+def big_move_config(size: float, window_seconds: float) -> ReplayConfig:
+    """Reference configuration whose alerts mark the big moves to score against.
+
+    A big move is a YES price change of at least `size` within
+    `window_seconds`; each one is counted once.
+    """
+    return ReplayConfig(size, int(window_seconds), (float(window_seconds),))
+
+
+def score(result: ReplayResult, big_moves: ReplayResult, span_seconds: float, horizon: float) -> dict:
+    """Alert volume and timing of a configuration relative to the big moves.
+
+    A big move counts as caught if the market alerted within `horizon`
+    seconds either side of the moment the move completed. Lead time is how
+    long before completion the first such alert fired (negative if late).
+    Alerts not near any big move are counted as unmatched.
+    """
+    alert_times: dict[int, list[float]] = {}
+    for alert in result.alerts:
+        alert_times.setdefault(alert.row, []).append(alert.timestamp)
+
+    leads = []
+    for move in big_moves.alerts:
+        times = alert_times.get(move.row, [])
+        first = bisect_left(times, move.timestamp - horizon)
+        last = bisect_right(times, move.timestamp + horizon)
+        if first < last:
+            leads.append(move.timestamp - times[first])
+
+    move_times: dict[int, list[float]] = {}
+    for move in big_moves.alerts:
+        move_times.setdefault(move.row, []).append(move.timestamp)
+    matched = 0
+    for row, times in alert_times.items():
+        moves = move_times.get(row, [])
+        for timestamp in times:
+            i = bisect_left(moves, timestamp - horizon)
+            if i < len(moves) and moves[i] <= timestamp + horizon:
+                matched += 1
+
+    days = span_seconds / 86400 or 1.0
+    leads.sort()
+    return {
+        "config": result.config.label(),
+        "threshold": result.config.threshold,
+        "cooldown_seconds": result.config.cooldown_seconds,
+        "windows": list(result.config.windows),
+        "alerts": len(result.alerts),
+        "alerts_per_day": len(result.alerts) / days,
+        "markets_alerted": len(alert_times),
+        "big_moves": len(big_moves.alerts),
+        "big_moves_caught": len(leads),
+        "recall": len(leads) / len(big_moves.alerts) if big_moves.alerts else 0.0,
+        "lead_p50_seconds": leads[len(leads) // 2] if leads else None,
+        "late": sum(1 for lead in leads if lead < 0),
+        "unmatched_alerts": len(result.alerts) - matched,
+        "replay_seconds": result.seconds,
+    }
@@ -0,0 +1,183 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from src.config import Config
+from src.delta import MarketChange
+from src.detector import PriceSnapshot
+from src.dispatcher import AlertDispatcher
+from src.rate_limit import TokenBucket
+from src.telegram_client import TelegramAlertClient
+
+logger = logging.getLogger(__name__)
+
+HELP = (
+    "Commands:\n"
+    "/status - what is being monitored\n"
+    "/top - biggest moves recently\n"
+    "/market <id> - one market's price"
+)
+
+
+@dataclass
+class _Move:
+    question: str
+    start_price: float
+    price: float
+    started: datetime
+
+
+class CommandBot:
+    """Answers /status, /top and /market <id> from Telegram chats.
+
+    Commands arrive through getUpdates long polling on a task of their own,
+    so a slow or unreachable Telegram never holds up a poll cycle. Replies
+    come from a snapshot that refresh() renders once per cycle: asking more
+    often costs no detector work and no Gamma requests, only the reply,
+    which goes through the dispatcher. Each chat gets COMMANDS_CHAT_BURST
+    replies and then one every 1 / COMMANDS_CHAT_RATE seconds; further
+    commands are ignored.
+    """
+
+    def __init__(self, telegram: TelegramAlertClient, dispatcher: AlertDispatcher):
+        self.telegram = telegram
+        self.dispatcher = dispatcher
+        self.top_window = timedelta(seconds=Config.COMMANDS_TOP_WINDOW_SECONDS)
+        self.chat_buckets: dict[str, TokenBucket] = {}
+        self.running = False
+        self.answered = 0
+        self.throttled = 0
+        self._moves: dict[str, _Move] = {}
+        self._dirty = True
+        # The snapshot, replaced as a whole by refresh()
+        self._status = "Starting up - no data yet."
+        self._top = "No price moves yet."
+        self._markets: dict[str, PriceSnapshot] = {}
+        self._market_replies: dict[str, str] = {}
+
+    def observe_changes(self, changes: list[MarketChange], now: datetime):
+        """Delta subscriber: follow each market's move over the /top window."""
+        for change in changes:
+            if change.old_yes_price is None:
+                continue
+            move = self._moves.get(change.market_id)
+            if move is None or now - move.started > self.top_window:
+                self._moves[change.market_id] = _Move(
+                    change.market.question, change.old_yes_price, change.new_yes_price, now
+                )
+            else:
+                move.price = change.new_yes_price
+        self._dirty = True
+
+    def refresh(self, status_lines: list[str], price_history: dict[str, PriceSnapshot], now: datetime):
+        """Render the snapshot that replies are served from."""
+        self._status = "📊 War-O-Meter Status\n\n" + "\n".join(status_lines)
+        # A full bucket is the same as none; don't keep one for every chat that ever asked
+        self.chat_buckets = {
+            chat_id: bucket for chat_id, bucket in self.chat_buckets.items() if bucket.available() < bucket.capacity
+        }
+        if not self._dirty:
+            return
+        self._dirty = False
+        self._markets = dict(price_history)
+        self._market_replies = {}
+
+        cutoff = now - self.top_window
+        self._moves = {mid: move for mid, move in self._moves.items() if move.started >= cutoff}
+        moves = sorted(self._moves.values(), key=lambda move: abs(move.price - move.start_price), reverse=True)
+        lines = [
+            f"{move.question}\n  {move.start_price:.1%} -> {move.price:.1%} ({move.price - move.start_price:+.1%})"
+            for move in moves[:Config.COMMANDS_TOP_COUNT]
+            if move.price != move.start_price
+        ]
+        window = Config.COMMANDS_TOP_WINDOW_SECONDS // 60
+        self._top = (
+            f"📈 Biggest moves (last {window} min)\n\n" + "\n".join(lines)
+            if lines else f"No price moves in the last {window} min."
+        )
+
+    def reply(self, text: str) -> str | None:
+        """The reply to a message, or None if it is not a command."""
+        parts = text.split()
+        if not parts or not parts[0].startswith("/"):
+            return None
+        command = parts[0][1:].split("@")[0].lower()
+        if command == "status":
+            return self._status
+        if command == "top":
+            return self._top
+        if command == "market":
+            if len(parts) < 2:
+                return "Usage: /market <id>"
+            return self._market_reply(parts[1])
+        return HELP
+
+    def _market_reply(self, market_id: str) -> str:
+        cached = self._market_replies.get(market_id)
+        if cached is not None:
+            return cached
+        snapshot = self._markets.get(market_id)
+        if snapshot is None:
+            return f"Market {market_id} is not being monitored."
+        move = self._moves.get(market_id)
+        change = f"\nMoved {move.price - move.start_price:+.1%} since {move.started:%H:%M} UTC" if move else ""
+        reply = self._market_replies[market_id] = (
+            f"{snapshot.question}\n\n"
+            f"YES: {snapshot.yes_price:.1%}  NO: {snapshot.no_price:.1%}{change}\n"
+            f"Updated: {snapshot.timestamp:%Y-%m-%d %H:%M:%S} UTC"
+        )
+        return reply
+
+    def handle(self, chat_id: str, text: str):
+        """Queue the reply to one message, if it is a command and the chat is not throttled."""
+        reply = self.reply(text)
+        if reply is None:
+            return
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self.chat_buckets[chat_id] = TokenBucket(
+                Config.COMMANDS_CHAT_RATE, Config.COMMANDS_CHAT_BURST
+            )
+        if bucket.available() < 1:
+            self.throttled += 1
+            return
+        bucket.take()
+        self.answered += 1
+        self.dispatcher.submit([reply], chat_id=chat_id)
+
+    async def run(self):
+        """Long-poll getUpdates and answer commands until stopped."""
+        self.running = True
+        bot = self.telegram.bot
+        from telegram.error import Forbidden, InvalidToken
+        offset = None
+        backoff = 1.0
+        while self.running:
+            try:
+                if offset is None:
+                    # Skip commands sent while the monitor was down
+                    pending = await bot.get_updates(offset=-1, timeout=0)
+                    offset = pending[-1].update_id + 1 if pending else 0
+                    logger.info("Answering Telegram commands")
+                updates = await bot.get_updates(
+                    offset=offset, timeout=Config.COMMANDS_POLL_TIMEOUT, allowed_updates=["message"]
+                )
+                backoff = 1.0
+            except (InvalidToken, Forbidden) as e:
+                logger.error(f"Telegram commands disabled: {e}")
+                return
+            except Exception as e:
+                logger.warning(f"Telegram getUpdates failed ({e}), retrying in {backoff:.0f}s")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 60.0)
+                continue
+
+            for update in updates:
+                offset = update.update_id + 1
+                message = update.message
+                if message and message.text:
+                    self.handle(str(message.chat_id), message.text)
+
+    def stop(self):
+        self.running = False
@@ -1,19 +1,187 @@
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+
+def _load_dotenv():
+    """Apply the nearest .env file, importing python-dotenv only if there is one.
+
+    Searches from this package's directory upwards, like load_dotenv().
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        path = os.path.join(directory, ".env")
+        if os.path.isfile(path):
+            from dotenv import load_dotenv
+
+            load_dotenv(path)
+            return
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return
+        directory = parent
+
+
+_load_dotenv()
+
+
+def _load_event_slugs() -> list[str]:
+    """Collect event slugs from EVENT_SLUGS, EVENT_SLUGS_FILE and EVENT_SLUG."""
+    slugs = [s.strip() for s in os.getenv("EVENT_SLUGS", "").split(",")]
+
+    slugs_file = os.getenv("EVENT_SLUGS_FILE")
+    if slugs_file:
+        with open(slugs_file) as f:
+            slugs.extend(line.split("#", 1)[0].strip() for line in f)
+
+    slugs = [s for s in slugs if s]
+    if not slugs:
+        slugs = [os.getenv("EVENT_SLUG", "us-strikes-iran-by")]
+
+    # Preserve order, drop duplicates
+    return list(dict.fromkeys(slugs))
 
 
 class Config:
     # Telegram settings
     TELEGRAM_BOT_TOKEN: str = os.getenv("TELEGRAM_BOT_TOKEN", "")
     TELEGRAM_CHAT_ID: str = os.getenv("TELEGRAM_CHAT_ID", "")
+    TELEGRAM_API_BASE_URL: str = os.getenv("TELEGRAM_API_BASE_URL", "https://api.telegram.org/bot")
+
+    # Telegram dispatch (Telegram allows ~1 msg/s per chat and ~30 msg/s overall)
+    DISPATCH_QUEUE_SIZE: int = int(os.getenv("DISPATCH_QUEUE_SIZE", "500"))
+    DISPATCH_COALESCE: bool = os.getenv("DISPATCH_COALESCE", "false").lower() == "true"
+    DISPATCH_MAX_RETRIES: int = int(os.getenv("DISPATCH_MAX_RETRIES", "5"))
+    TELEGRAM_CHAT_RATE: float = float(os.getenv("TELEGRAM_CHAT_RATE", "1"))  # msgs/s per chat
+    TELEGRAM_CHAT_BURST: float = float(os.getenv("TELEGRAM_CHAT_BURST", "3"))
+    TELEGRAM_GLOBAL_RATE: float = float(os.getenv("TELEGRAM_GLOBAL_RATE", "30"))  # msgs/s
+
+    # Further alert destinations, each delivered from its own queue
+    TELEGRAM_EXTRA_CHAT_IDS: list[str] = [
+        c.strip() for c in os.getenv("TELEGRAM_EXTRA_CHAT_IDS", "").split(",") if c.strip()
+    ]
+    ALERT_WEBHOOK_URLS: list[str] = [u.strip() for u in os.getenv("ALERT_WEBHOOK_URLS", "").split(",") if u.strip()]
+    ALERT_FILE_PATH: str = os.getenv("ALERT_FILE_PATH", "")  # JSON lines
+
+    # Telegram commands (/status, /top, /market) answered via getUpdates long polling
+    COMMANDS_ENABLED: bool = os.getenv("COMMANDS_ENABLED", "false").lower() == "true"
+    COMMANDS_POLL_TIMEOUT: int = int(os.getenv("COMMANDS_POLL_TIMEOUT", "30"))  # seconds
+    COMMANDS_CHAT_RATE: float = float(os.getenv("COMMANDS_CHAT_RATE", "0.2"))  # replies/s per chat
+    COMMANDS_CHAT_BURST: float = float(os.getenv("COMMANDS_CHAT_BURST", "3"))
+    COMMANDS_TOP_COUNT: int = int(os.getenv("COMMANDS_TOP_COUNT", "10"))
+    COMMANDS_TOP_WINDOW_SECONDS: int = int(os.getenv("COMMANDS_TOP_WINDOW_SECONDS", "3600"))
 
     # Polymarket settings
-    GAMMA_API_URL: str = "https://gamma-api.polymarket.com"
+    GAMMA_API_URL: str = os.getenv("GAMMA_API_URL", "https://gamma-api.polymarket.com")
     EVENT_SLUG: str = os.getenv("EVENT_SLUG", "us-strikes-iran-by")
+    EVENT_SLUGS: list[str] = _load_event_slugs()
+    MAX_CONCURRENT_REQUESTS: int = int(os.getenv("MAX_CONCURRENT_REQUESTS", "8"))
+    SLUGS_PER_REQUEST: int = int(os.getenv("SLUGS_PER_REQUEST", "20"))
+
+    # Market discovery (tags and keywords on the Gamma /events listing)
+    DISCOVERY_ENABLED: bool = os.getenv("DISCOVERY_ENABLED", "false").lower() == "true"
+    DISCOVERY_TAGS: list[str] = [t.strip() for t in os.getenv("DISCOVERY_TAGS", "").split(",") if t.strip()]
+    DISCOVERY_KEYWORDS: list[str] = [
+        k.strip().lower() for k in os.getenv("DISCOVERY_KEYWORDS", "").split(",") if k.strip()
+    ]
+    DISCOVERY_INTERVAL_SECONDS: int = int(os.getenv("DISCOVERY_INTERVAL_SECONDS", "900"))
+    DISCOVERY_FULL_REFRESH_SECONDS: int = int(os.getenv("DISCOVERY_FULL_REFRESH_SECONDS", "21600"))
+    DISCOVERY_PAGE_SIZE: int = int(os.getenv("DISCOVERY_PAGE_SIZE", "100"))
+    DISCOVERY_CONCURRENCY: int = int(os.getenv("DISCOVERY_CONCURRENCY", "4"))
+    DISCOVERY_MAX_EVENTS: int = int(os.getenv("DISCOVERY_MAX_EVENTS", "200"))
+
+    # Order-book enrichment (CLOB books fetched for markets that alerted)
+    BOOK_ENRICHMENT: bool = os.getenv("BOOK_ENRICHMENT", "false").lower() == "true"
+    CLOB_API_URL: str = os.getenv("CLOB_API_URL", "https://clob.polymarket.com")
+    BOOK_BUDGET_SECONDS: float = float(os.getenv("BOOK_BUDGET_SECONDS", "1.0"))  # max delay added to alerts
+    BOOK_BATCH_SIZE: int = int(os.getenv("BOOK_BATCH_SIZE", "20"))  # tokens per /books request
+    BOOK_DEPTH_MOVE: float = float(os.getenv("BOOK_DEPTH_MOVE", "0.05"))
+    BOOK_THIN_DEPTH_USD: float = float(os.getenv("BOOK_THIN_DEPTH_USD", "1000"))
+
+    # Streaming settings (CLOB market websocket, REST polling stays as fallback)
+    STREAM_ENABLED: bool = os.getenv("STREAM_ENABLED", "false").lower() == "true"
+    CLOB_WS_URL: str = os.getenv(
+        "CLOB_WS_URL", "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+    )
+    STREAM_REST_REFRESH_SECONDS: int = int(os.getenv("STREAM_REST_REFRESH_SECONDS", "300"))
+    STREAM_PING_SECONDS: float = float(os.getenv("STREAM_PING_SECONDS", "10"))
+    STREAM_RECONNECT_MIN_SECONDS: float = float(os.getenv("STREAM_RECONNECT_MIN_SECONDS", "1"))
+    STREAM_RECONNECT_MAX_SECONDS: float = float(os.getenv("STREAM_RECONNECT_MAX_SECONDS", "60"))
+
+    # Sharded mode (0 or 1 = single process)
+    SHARD_WORKERS: int = int(os.getenv("SHARD_WORKERS", "0"))
+    SHARD_VNODES: int = int(os.getenv("SHARD_VNODES", "64"))  # ring points per worker
+    SHARD_HEARTBEAT_SECONDS: float = float(os.getenv("SHARD_HEARTBEAT_SECONDS", "5"))
+    SHARD_HEARTBEAT_TIMEOUT_SECONDS: float = float(os.getenv("SHARD_HEARTBEAT_TIMEOUT_SECONDS", "30"))
+    SHARD_RESTART_SECONDS: float = float(os.getenv("SHARD_RESTART_SECONDS", "10"))
+
+    # Metrics endpoint (Prometheus text format)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+    METRICS_HOST: str = os.getenv("METRICS_HOST", "127.0.0.1")
+    METRICS_PORT: int = int(os.getenv("METRICS_PORT", "9108"))
+
+    # State persistence
+    STATE_BACKEND: str = os.getenv("STATE_BACKEND", "none").lower()  # "none" or "sqlite"
+    STATE_DB_PATH: str = os.getenv("STATE_DB_PATH", "war_o_meter.db")
+    STATE_RETENTION_SECONDS: int = int(os.getenv("STATE_RETENTION_SECONDS", "604800"))  # 7 days
+
+    # In-memory market state bounds
+    STATE_MARKET_TTL_SECONDS: int = int(os.getenv("STATE_MARKET_TTL_SECONDS", "604800"))  # unseen for 7 days
+    STATE_CLOSED_TTL_SECONDS: int = int(os.getenv("STATE_CLOSED_TTL_SECONDS", "3600"))
+    STATE_MAX_MARKETS: int = int(os.getenv("STATE_MAX_MARKETS", "20000"))
+    STATE_SWEEP_SECONDS: int = int(os.getenv("STATE_SWEEP_SECONDS", "60"))
+    STATE_SPILL_PATH: str = os.getenv("STATE_SPILL_PATH", "")  # empty = evicted state is discarded
+
+    # Raw feed recorder
+    RECORDER_ENABLED: bool = os.getenv("RECORDER_ENABLED", "false").lower() == "true"
+    RECORDER_MODE: str = os.getenv("RECORDER_MODE", "raw").lower()  # "raw" or "changes"
+    RECORDER_DIR: str = os.getenv("RECORDER_DIR", "recordings")
+    RECORDER_SEGMENT_SECONDS: int = int(os.getenv("RECORDER_SEGMENT_SECONDS", "3600"))
+    RECORDER_SEGMENT_BYTES: int = int(os.getenv("RECORDER_SEGMENT_BYTES", "67108864"))  # 64 MiB
+    RECORDER_COMPRESS_LEVEL: int = int(os.getenv("RECORDER_COMPRESS_LEVEL", "6"))
+    RECORDER_QUEUE_SIZE: int = int(os.getenv("RECORDER_QUEUE_SIZE", "1000"))
+
+    # HTTP settings
+    HTTP_CONNECT_TIMEOUT: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    HTTP_READ_TIMEOUT: float = float(os.getenv("HTTP_READ_TIMEOUT", "15"))
+    HTTP_POOL_TIMEOUT: float = float(os.getenv("HTTP_POOL_TIMEOUT", "5"))
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+    HTTP_MAX_KEEPALIVE: int = int(os.getenv("HTTP_MAX_KEEPALIVE", "10"))
+    HTTP2_ENABLED: bool = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+
+    # Gamma request resilience
+    RETRY_MAX_ATTEMPTS: int = int(os.getenv("RETRY_MAX_ATTEMPTS", "3"))  # including the first
+    RETRY_BASE_SECONDS: float = float(os.getenv("RETRY_BASE_SECONDS", "0.25"))
+    RETRY_MAX_BACKOFF_SECONDS: float = float(os.getenv("RETRY_MAX_BACKOFF_SECONDS", "4"))
+    RETRY_BUDGET_RATIO: float = float(os.getenv("RETRY_BUDGET_RATIO", "0.2"))  # retries per request
+    RETRY_BUDGET_MIN_RATE: float = float(os.getenv("RETRY_BUDGET_MIN_RATE", "0.5"))  # retries/s floor
+    HEDGE_ENABLED: bool = os.getenv("HEDGE_ENABLED", "true").lower() == "true"
+    HEDGE_QUANTILE: float = float(os.getenv("HEDGE_QUANTILE", "0.95"))
+    HEDGE_MIN_DELAY_SECONDS: float = float(os.getenv("HEDGE_MIN_DELAY_SECONDS", "0.05"))
+    HEDGE_MIN_SAMPLES: int = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+    CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+    CIRCUIT_RESET_SECONDS: float = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
 
     # Monitoring settings
     POLL_INTERVAL_SECONDS: int = int(os.getenv("POLL_INTERVAL_SECONDS", "60"))
+    ADAPTIVE_POLLING: bool = os.getenv("ADAPTIVE_POLLING", "false").lower() == "true"
+    POLL_MIN_INTERVAL_SECONDS: float = float(os.getenv("POLL_MIN_INTERVAL_SECONDS", "10"))
+    POLL_MAX_INTERVAL_SECONDS: float = float(os.getenv("POLL_MAX_INTERVAL_SECONDS", "300"))
+    POLL_BUDGET_PER_MINUTE: int = int(os.getenv("POLL_BUDGET_PER_MINUTE", "120"))  # Gamma requests
+    POLL_PRICE_SENSITIVITY: float = float(os.getenv("POLL_PRICE_SENSITIVITY", "2"))
+    POLL_VOLUME_SENSITIVITY: float = float(os.getenv("POLL_VOLUME_SENSITIVITY", "100"))
+    DETECTOR_STRATEGY: str = os.getenv("DETECTOR_STRATEGY", "threshold").lower()  # "threshold" or "zscore"
+    ZSCORE_THRESHOLD: float = float(os.getenv("ZSCORE_THRESHOLD", "4"))
+    ZSCORE_HALFLIFE: float = float(os.getenv("ZSCORE_HALFLIFE", "50"))  # price changes
+    ZSCORE_WARMUP: int = int(os.getenv("ZSCORE_WARMUP", "20"))  # changes before alerting
+    ZSCORE_MIN_MOVE: float = float(os.getenv("ZSCORE_MIN_MOVE", "0.02"))
+    ZSCORE_MIN_STDEV: float = float(os.getenv("ZSCORE_MIN_STDEV", "0.02"))  # log-odds per minute
+    ZSCORE_LIQUIDITY_HALF: float = float(os.getenv("ZSCORE_LIQUIDITY_HALF", "5000"))  # USD
     PRICE_CHANGE_THRESHOLD: float = float(os.getenv("PRICE_CHANGE_THRESHOLD", "0.05"))  # 5% change
     ALERT_COOLDOWN_SECONDS: int = int(os.getenv("ALERT_COOLDOWN_SECONDS", "300"))  # 5 minutes
+    DETECTION_WINDOWS: list[float] = [
+        float(w) for w in os.getenv("DETECTION_WINDOWS", "60,300,3600").split(",") if w.strip()
+    ]  # seconds
+    LADDER_DETECTION: bool = os.getenv("LADDER_DETECTION", "false").lower() == "true"
+    LADDER_VIOLATION_TOLERANCE: float = float(os.getenv("LADDER_VIOLATION_TOLERANCE", "0.02"))
+    LADDER_SHIFT_FRACTION: float = float(os.getenv("LADDER_SHIFT_FRACTION", "0.5"))  # of rungs
+    HISTORY_CAPACITY: int = int(os.getenv("HISTORY_CAPACITY", "1024"))  # samples per market
+    BATCH_DETECTION_MIN_MARKETS: int = int(os.getenv("BATCH_DETECTION_MIN_MARKETS", "64"))
@@ -0,0 +1,102 @@
+import logging
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable
+
+from src.polymarket_client import Market
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class MarketChange:
+    market: Market
+    old_yes_price: float | None  # None the first time a market is seen
+    old_no_price: float | None
+    volume_delta: float
+
+    @property
+    def market_id(self) -> str:
+        return self.market.id
+
+    @property
+    def new_yes_price(self) -> float:
+        return self.market.outcome_yes_price
+
+    @property
+    def new_no_price(self) -> float:
+        return self.market.outcome_no_price
+
+
+ChangeSubscriber = Callable[[list[MarketChange], datetime], None]
+
+
+class DeltaEngine:
+    """Turns successive market snapshots into a stream of changes.
+
+    Keeps the last-seen Market per id and reports only markets whose
+    prices or volume moved. A market the client reused from its parse
+    cache is the same object as last time and is skipped on an identity
+    check. Subscribers are called with each non-empty batch of changes.
+    """
+
+    def __init__(self):
+        self._last: dict[str, Market] = {}
+        self._subscribers: list[ChangeSubscriber] = []
+        self.markets_seen = 0
+        self.markets_changed = 0
+
+    def subscribe(self, callback: ChangeSubscriber):
+        self._subscribers.append(callback)
+
+    def update(self, markets: list[Market], now: datetime | None = None) -> list[MarketChange]:
+        """Diff markets against the last-seen values and publish the changes."""
+        now = now or datetime.utcnow()
+        last = self._last
+        changes = []
+        for market in markets:
+            previous = last.get(market.id)
+            if previous is market:
+                continue
+            last[market.id] = market
+            if previous is None:
+                changes.append(MarketChange(market, None, None, 0.0))
+            elif (
+                previous.outcome_yes_price != market.outcome_yes_price
+                or previous.outcome_no_price != market.outcome_no_price
+                or previous.volume != market.volume
+            ):
+                changes.append(MarketChange(
+                    market,
+                    previous.outcome_yes_price,
+                    previous.outcome_no_price,
+                    market.volume - previous.volume,
+                ))
+
+        self.markets_seen += len(markets)
+        self.markets_changed += len(changes)
+        if changes:
+            for callback in self._subscribers:
+                try:
+                    callback(changes, now)
+                except Exception as e:
+                    logger.error(f"Change subscriber {callback!r} failed: {e}")
+        return changes
+
+    def markets(self, market_ids) -> dict[str, Market]:
+        """Last-seen Market for each id that has one, changed this cycle or not."""
+        last = self._last
+        return {market_id: last[market_id] for market_id in market_ids if market_id in last}
+
+    def forget(self, market_ids) -> None:
+        """Drop last-seen values, e.g. for markets no longer tracked."""
+        for market_id in market_ids:
+            self._last.pop(market_id, None)
+
+    def __len__(self) -> int:
+        return len(self._last)
+
+    def memory_bytes(self) -> int:
+        """Memory of the last-seen index (Markets are shared with the client cache)."""
+        return sys.getsizeof(self._last)
@@ -1,9 +1,26 @@
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Dict
 
+import numpy as np
+
 from src.config import Config
 from src.polymarket_client import Market
+from src.price_history import PriceHistory
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+NEVER = np.iinfo(np.int64).min // 2  # "no alert yet", far enough from overflow
+
+
+def format_window(seconds: float) -> str:
+    """Format a window length as a short label, e.g. 300 -> '5m'."""
+    if seconds % 3600 == 0:
+        return f"{seconds / 3600:.0f}h"
+    if seconds % 60 == 0:
+        return f"{seconds / 60:.0f}m"
+    return f"{seconds:.0f}s"
 
 
 @dataclass
@@ -24,92 +41,383 @@ class Alert:
     new_price: float
     change_percent: float
     timestamp: datetime
+    window_seconds: float | None = None  # None for a tick-to-tick move
+    zscore: float | None = None  # set by the z-score detector
+    # Set from the CLOB order book when BOOK_ENRICHMENT is on
+    spread: float | None = None
+    depth_up: float | None = None  # USD of asks within BOOK_DEPTH_MOVE above the book's midpoint
+    depth_down: float | None = None  # USD of bids within BOOK_DEPTH_MOVE below it
+
+    @property
+    def dedup_key(self) -> str:
+        """Alerts with the same key within the cooldown are repeats of one another."""
+        return self.market_id
+
+    def book_line(self) -> str:
+        """The order-book summary line, or an empty string if the book was not fetched."""
+        if self.depth_up is None:
+            return ""
+        spread = f"spread {self.spread:.1%}" if self.spread is not None else "one-sided"
+        thin = " ⚠️ thin" if min(self.depth_up, self.depth_down) < Config.BOOK_THIN_DEPTH_USD else ""
+        return (
+            f"Book: {spread}, within {Config.BOOK_DEPTH_MOVE:.0%}: "
+            f"${self.depth_up:,.0f} asks / ${self.depth_down:,.0f} bids{thin}\n"
+        )
 
     def format_message(self) -> str:
         """Format the alert as a human-readable message."""
         direction = "UP" if self.alert_type == "spike" else "DOWN"
         emoji = "🚨" if abs(self.change_percent) > 0.10 else "⚠️"
+        window = f" within {format_window(self.window_seconds)}" if self.window_seconds else ""
+        if self.zscore is not None:
+            window += f" (z = {self.zscore:+.1f})"
 
         return (
             f"{emoji} ALERT: Price {direction}\n\n"
             f"Market: {self.question}\n"
             f"Old: {self.old_price:.1%} -> New: {self.new_price:.1%}\n"
-            f"Change: {self.change_percent:+.1%}\n"
+            f"Change: {self.change_percent:+.1%}{window}\n"
+            f"{self.book_line()}"
             f"Time: {self.timestamp.strftime('%Y-%m-%d %H:%M:%S UTC')}"
         )
 
 
 class IrregularityDetector:
-    def __init__(self, threshold: float | None = None, cooldown_seconds: int | None = None):
-        self.threshold = threshold or Config.PRICE_CHANGE_THRESHOLD
-        self.cooldown = timedelta(seconds=cooldown_seconds or Config.ALERT_COOLDOWN_SECONDS)
+    def __init__(
+        self,
+        threshold: float | None = None,
+        cooldown_seconds: int | None = None,
+        windows: list[float] | None = None,
+    ):
+        # 0 is a valid setting (e.g. in a backtest sweep), so only None means default
+        self.threshold = Config.PRICE_CHANGE_THRESHOLD if threshold is None else threshold
+        if cooldown_seconds is None:
+            cooldown_seconds = Config.ALERT_COOLDOWN_SECONDS
+        self.cooldown = timedelta(seconds=cooldown_seconds)
+        windows = Config.DETECTION_WINDOWS if windows is None else windows
+        self.windows = tuple(float(w) for w in windows)
+        self.history_capacity = Config.HISTORY_CAPACITY
+        self.batch_min_markets = Config.BATCH_DETECTION_MIN_MARKETS
         self.price_history: Dict[str, PriceSnapshot] = {}
+        self.history: Dict[str, PriceHistory] = {}
         self.last_alert_time: Dict[str, datetime] = {}
 
-    def check_market(self, market: Market) -> Alert | None:
-        """Check a market for price irregularities. Returns an Alert if detected."""
-        now = datetime.utcnow()
-        market_id = market.id
+        # Snapshots and alerts since the last drain_changes(), kept only when
+        # a state store is attached (see enable_change_log)
+        self.pending_snapshots: list[PriceSnapshot] | None = None
+        self.pending_alerts: list[Alert] | None = None
 
-        # Get previous snapshot
-        previous = self.price_history.get(market_id)
+        # Plain counters, read by the metrics endpoint at scrape time
+        self.alerts_fired = 0
+        self.alerts_suppressed = 0  # threshold crossings on a price change during cooldown
 
-        # Create current snapshot
-        current = PriceSnapshot(
-            market_id=market_id,
-            question=market.question,
-            yes_price=market.outcome_yes_price,
-            no_price=market.outcome_no_price,
-            timestamp=now,
-        )
+        # Columnar state for the vectorized path: each market id gets a stable
+        # row. Alert times are integer microseconds so cooldown comparisons
+        # match the timedelta arithmetic of check_market exactly.
+        self._rows: Dict[str, int] = {}
+        self._row_ids: list[str | None] = []
+        self._free_rows: list[int] = []  # rows of forgotten markets, reused first
+        self._prices = np.full(0, np.nan)
+        self._window_range = np.zeros(0)
+        self._last_alert_us = np.full(0, NEVER, dtype=np.int64)
+        self._cooldown_us = self.cooldown // MICROSECOND
 
-        # Store current snapshot for next comparison
-        self.price_history[market_id] = current
+    def check_market(self, market: Market, now: datetime | None = None) -> Alert | None:
+        """Check a market for price irregularities. Returns an Alert if detected."""
+        now = now or datetime.utcnow()
+        previous_price, old_price, price_change, window = self._record(market, now)
 
         # If no previous data, nothing to compare
-        if previous is None:
+        if previous_price is None:
             return None
 
         # Check cooldown
-        last_alert = self.last_alert_time.get(market_id)
+        last_alert = self.last_alert_time.get(market.id)
         if last_alert and (now - last_alert) < self.cooldown:
+            if abs(price_change) >= self.threshold and previous_price != market.outcome_yes_price:
+                self.alerts_suppressed += 1
             return None
 
-        # Calculate price change (using YES price as primary indicator)
-        price_change = current.yes_price - previous.yes_price
-
         # Check if change exceeds threshold
         if abs(price_change) >= self.threshold:
-            alert_type = "spike" if price_change > 0 else "drop"
-            alert = Alert(
-                market_id=market_id,
-                question=market.question,
-                alert_type=alert_type,
-                old_price=previous.yes_price,
-                new_price=current.yes_price,
-                change_percent=price_change,
-                timestamp=now,
-            )
-            self.last_alert_time[market_id] = now
-            return alert
+            return self._fire(market, old_price, price_change, window, now)
 
         return None
 
-    def check_markets(self, markets: list[Market]) -> list[Alert]:
+    def check_markets(self, markets: list[Market], now: datetime | None = None) -> list[Alert]:
         """Check multiple markets and return all alerts."""
+        now = now or datetime.utcnow()
+        if len(markets) >= self.batch_min_markets:
+            alerts = self._check_markets_batch(markets, now)
+            if alerts is not None:
+                return alerts
+
         alerts = []
         for market in markets:
-            alert = self.check_market(market)
+            alert = self.check_market(market, now)
             if alert:
                 alerts.append(alert)
         return alerts
 
+    def check_changes(self, markets: list[Market], now: datetime | None = None) -> list[Alert]:
+        """Check markets whose price changed, skipping everything else.
+
+        Gives the same alerts as check_markets over every tracked market:
+        besides the changed markets, any unchanged market whose recent
+        window move could still cross the threshold now that its cooldown
+        has ended is revisited from its last snapshot.
+        """
+        now = now or datetime.utcnow()
+        tracked = len(self._row_ids)
+        if tracked:
+            now_us = (now - EPOCH) // MICROSECOND
+            at_risk = np.flatnonzero(
+                (now_us - self._last_alert_us[:tracked] >= self._cooldown_us)
+                & (self._window_range[:tracked] >= self.threshold)
+            )
+            if at_risk.size:
+                changed = {market.id for market in markets}
+                markets = markets + [
+                    self._snapshot_market(self._row_ids[row])
+                    for row in at_risk.tolist()
+                    if self._row_ids[row] not in changed
+                ]
+        return self.check_markets(markets, now)
+
+    def _snapshot_market(self, market_id: str) -> Market:
+        """Rebuild a Market from its last snapshot for re-checking."""
+        snapshot = self.price_history[market_id]
+        return Market(
+            id=market_id,
+            question=snapshot.question,
+            outcome_yes_price=snapshot.yes_price,
+            outcome_no_price=snapshot.no_price,
+            volume=0.0,
+            liquidity=0.0,
+            end_date=None,
+            active=True,
+            closed=False,
+        )
+
+    def _check_markets_batch(self, markets: list[Market], now: datetime) -> list[Alert] | None:
+        """Vectorized equivalent of calling check_market for each market.
+
+        Prices, cooldowns and threshold crossings are evaluated in one NumPy
+        pass. Only markets whose price moved, or whose cached window range
+        could still cross the threshold once out of cooldown, get per-market
+        work; everything else is skipped. Returns None if the batch repeats
+        a market id, which must be processed sequentially.
+        """
+        rows = np.fromiter((self._row(market.id) for market in markets), np.intp, len(markets))
+        if np.unique(rows).size != rows.size:
+            return None
+
+        now_us = (now - EPOCH) // MICROSECOND
+        current = np.fromiter((m.outcome_yes_price for m in markets), np.float64, len(markets))
+        changed = current != self._prices[rows]  # NaN for new markets compares unequal
+        cooled = now_us - self._last_alert_us[rows] >= self._cooldown_us
+        at_risk = ~changed & cooled & (self._window_range[rows] >= self.threshold)
+        candidates = np.flatnonzero(changed | at_risk)
+        if not candidates.size:
+            return []
+
+        has_previous = np.zeros(candidates.size, dtype=bool)
+        old_prices = np.zeros(candidates.size)
+        changes = np.zeros(candidates.size)
+        windows: list[float | None] = [None] * candidates.size
+        for j, k in enumerate(candidates.tolist()):
+            previous_price, old_prices[j], changes[j], windows[j] = self._record(markets[k], now)
+            has_previous[j] = previous_price is not None
+
+        crossed = has_previous & (np.abs(changes) >= self.threshold)
+        fire = crossed & cooled[candidates]
+        self.alerts_suppressed += int(np.count_nonzero(crossed & ~fire & changed[candidates]))
+        return [
+            self._fire(markets[candidates[j]], float(old_prices[j]), float(changes[j]), windows[j], now)
+            for j in np.flatnonzero(fire).tolist()
+        ]
+
+    def _record(self, market: Market, now: datetime) -> tuple[float | None, float, float, float | None]:
+        """Store a new price for a market and measure its largest move.
+
+        Returns (previous price, reference price, change, window). The change
+        is the tick-to-tick move (using YES price as primary indicator), or
+        the move from a window low/high if that is larger.
+        """
+        market_id = market.id
+
+        # Get previous snapshot
+        previous = self.price_history.get(market_id)
+
+        # Create current snapshot and store it for next comparison
+        current = PriceSnapshot(
+            market_id=market_id,
+            question=market.question,
+            yes_price=market.outcome_yes_price,
+            no_price=market.outcome_no_price,
+            timestamp=now,
+        )
+        self.price_history[market_id] = current
+        if self.pending_snapshots is not None:
+            self.pending_snapshots.append(current)
+
+        history = self.history.get(market_id)
+        if history is None:
+            history = self.history[market_id] = PriceHistory(self.history_capacity, self.windows)
+        history.append((now - EPOCH).total_seconds(), current.yes_price)
+
+        old_price = previous.yes_price if previous else current.yes_price
+        price_change = current.yes_price - old_price
+        window = None
+        widest = 0.0
+        for window_seconds, (low, high) in zip(self.windows, history.extremes()):
+            for reference in (low, high):
+                change = current.yes_price - reference
+                widest = max(widest, abs(change))
+                if abs(change) > abs(price_change):
+                    old_price, price_change, window = reference, change, window_seconds
+
+        row = self._row(market_id)
+        self._prices[row] = current.yes_price
+        self._window_range[row] = widest
+
+        return (previous.yes_price if previous else None), old_price, price_change, window
+
+    def _fire(
+        self, market: Market, old_price: float, price_change: float, window: float | None, now: datetime
+    ) -> Alert:
+        """Build an alert and start the market's cooldown."""
+        alert_type = "spike" if price_change > 0 else "drop"
+        alert = Alert(
+            market_id=market.id,
+            question=market.question,
+            alert_type=alert_type,
+            old_price=old_price,
+            new_price=market.outcome_yes_price,
+            change_percent=price_change,
+            timestamp=now,
+            window_seconds=window,
+        )
+        self.set_last_alert(market.id, now)
+        self.alerts_fired += 1
+        if self.pending_alerts is not None:
+            self.pending_alerts.append(alert)
+        # Don't report the same move again once the cooldown expires
+        self.history[market.id].reset_windows()
+        self._window_range[self._rows[market.id]] = 0.0
+        return alert
+
+    def enable_change_log(self) -> None:
+        """Start collecting snapshots and alerts for persistence."""
+        self.pending_snapshots = []
+        self.pending_alerts = []
+
+    def drain_changes(self) -> tuple[list[PriceSnapshot], list[Alert]]:
+        """Return and clear the snapshots and alerts collected since the last call."""
+        snapshots, alerts = self.pending_snapshots or [], self.pending_alerts or []
+        if self.pending_snapshots is not None:
+            self.pending_snapshots, self.pending_alerts = [], []
+        return snapshots, alerts
+
+    def restore(
+        self,
+        snapshots: Dict[str, PriceSnapshot],
+        samples: Dict[str, list[tuple[float, float]]],
+        last_alerts: Dict[str, datetime],
+    ) -> None:
+        """Load persisted state: latest snapshots, recent samples and cooldowns."""
+        for market_id, snapshot in snapshots.items():
+            self.price_history[market_id] = snapshot
+            history = self.history[market_id] = PriceHistory(self.history_capacity, self.windows)
+            last_alert = last_alerts.get(market_id)
+            reset_at = (last_alert - EPOCH).total_seconds() if last_alert else None
+            for timestamp, price in samples.get(market_id) or [
+                ((snapshot.timestamp - EPOCH).total_seconds(), snapshot.yes_price)
+            ]:
+                if reset_at is not None and timestamp > reset_at:
+                    # Windows restarted when the market last alerted
+                    history.reset_windows()
+                    reset_at = None
+                history.append(timestamp, price)
+            if reset_at is not None:
+                history.reset_windows()
+
+            row = self._row(market_id)
+            self._prices[row] = snapshot.yes_price
+            self._window_range[row] = max(
+                (
+                    max(snapshot.yes_price - low, high - snapshot.yes_price)
+                    for low, high in history.extremes()
+                ),
+                default=0.0,
+            )
+
+        for market_id, when in last_alerts.items():
+            self.set_last_alert(market_id, when)
+
+    def forget(
+        self, market_id: str
+    ) -> tuple[PriceSnapshot, list[tuple[float, float]], datetime | None] | None:
+        """Drop all state for a market and free its row for reuse.
+
+        Returns the snapshot, history samples and last alert time that
+        restore() needs to bring the market back, or None if not tracked.
+        """
+        snapshot = self.price_history.pop(market_id, None)
+        history = self.history.pop(market_id, None)
+        last_alert = self.last_alert_time.pop(market_id, None)
+        row = self._rows.pop(market_id, None)
+        if row is not None:
+            self._row_ids[row] = None
+            self._prices[row] = np.nan
+            self._window_range[row] = 0.0
+            self._last_alert_us[row] = NEVER
+            self._free_rows.append(row)
+        if snapshot is None:
+            return None
+        return snapshot, history.samples() if history else [], last_alert
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held for tracked markets."""
+        snapshots = sys.getsizeof(self.price_history)
+        if self.price_history:
+            sample = next(iter(self.price_history.values()))
+            snapshots += len(self.price_history) * (sys.getsizeof(sample) + sys.getsizeof(sample.__dict__))
+        columns = self._prices.nbytes + self._window_range.nbytes + self._last_alert_us.nbytes
+        index = sys.getsizeof(self._rows) + sys.getsizeof(self._row_ids) + sys.getsizeof(self.last_alert_time)
+        return snapshots + columns + index + sum(h.memory_bytes() for h in self.history.values())
+
+    def set_last_alert(self, market_id: str, when: datetime) -> None:
+        """Record when a market last alerted."""
+        self.last_alert_time[market_id] = when
+        self._last_alert_us[self._row(market_id)] = (when - EPOCH) // MICROSECOND
+
+    def _row(self, market_id: str) -> int:
+        """Get the stable row index for a market, allocating one if needed."""
+        row = self._rows.get(market_id)
+        if row is None and self._free_rows:
+            row = self._rows[market_id] = self._free_rows.pop()
+            self._row_ids[row] = market_id
+        elif row is None:
+            row = self._rows[market_id] = len(self._row_ids)
+            self._row_ids.append(market_id)
+            if row >= self._prices.size:
+                grow = max(64, self._prices.size)
+                self._prices = np.append(self._prices, np.full(grow, np.nan))
+                self._window_range = np.append(self._window_range, np.zeros(grow))
+                self._last_alert_us = np.append(
+                    self._last_alert_us, np.full(grow, NEVER, dtype=np.int64)
+                )
+        return row
+
     def get_status(self) -> dict:
         """Get current monitoring status."""
         return {
             "tracked_markets": len(self.price_history),
             "threshold": self.threshold,
             "cooldown_seconds": self.cooldown.total_seconds(),
+            "windows": [format_window(w) for w in self.windows],
+            "history_bytes": sum(h.memory_bytes() for h in self.history.values()),
             "markets": {
                 mid: {
                     "question": snap.question,
@@ -119,3 +427,15 @@ class IrregularityDetector:
                 for mid, snap in self.price_history.items()
             },
         }
+
+
+def create_detector() -> IrregularityDetector:
+    """Create the detector selected by DETECTOR_STRATEGY."""
+    if Config.DETECTOR_STRATEGY == "zscore":
+        # Imported here because the z-score detector builds on this module
+        from src.zscore_detector import ZScoreDetector
+
+        return ZScoreDetector()
+    if Config.DETECTOR_STRATEGY != "threshold":
+        raise ValueError(f"Unknown DETECTOR_STRATEGY: {Config.DETECTOR_STRATEGY}")
+    return IrregularityDetector()
@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import time
+
+from src.config import Config
+from src.polymarket_client import AsyncPolymarketClient
+
+logger = logging.getLogger(__name__)
+
+
+def _event_id(event: dict) -> int:
+    try:
+        return int(event.get("id") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class MarketDiscovery:
+    """Finds events to monitor by tag and keyword on the Gamma /events listing.
+
+    A full refresh enumerates every active event for each configured tag
+    (or all active events when only keywords are set) and retires
+    discovered events that are no longer listed. In between, an incremental
+    refresh reads each listing newest-first and stops at the first page with
+    nothing newer than the newest event already seen. Events that were
+    configured explicitly are never added or retired here.
+    """
+
+    def __init__(
+        self,
+        client: AsyncPolymarketClient,
+        tags: list[str] | None = None,
+        keywords: list[str] | None = None,
+        pinned: list[str] = (),
+    ):
+        self.client = client
+        self.tags = Config.DISCOVERY_TAGS if tags is None else tags
+        self.keywords = [k.lower() for k in (Config.DISCOVERY_KEYWORDS if keywords is None else keywords)]
+        self.pinned = set(pinned)
+        self.discovered: dict[str, str] = {}  # slug -> title
+        self._closed: set[str] = set()  # retired while still listed; not re-added
+        self._newest_id = 0
+        self._last_full: float | None = None
+
+    async def refresh(self, full: bool | None = None) -> tuple[list[str], list[str]]:
+        """Update the discovered events. Returns (added, retired) slugs."""
+        now = time.monotonic()
+        if full is None:
+            full = (
+                self._last_full is None
+                or now - self._last_full >= Config.DISCOVERY_FULL_REFRESH_SECONDS
+            )
+        newest = self._newest_id
+
+        listings = await asyncio.gather(*(self._list(tag, full, newest) for tag in self.tags or [None]))
+        listed: dict[str, dict] = {}
+        for events in listings:
+            for event in events:
+                slug = event.get("slug")
+                if slug and not event.get("closed") and self._matches(event):
+                    listed[slug] = event
+                self._newest_id = max(self._newest_id, _event_id(event))
+
+        added = [
+            slug for slug in listed
+            if slug not in self.discovered and slug not in self.pinned and slug not in self._closed
+        ]
+        room = Config.DISCOVERY_MAX_EVENTS - len(self.discovered)
+        if len(added) > room:
+            # Keep the busiest events when over the cap
+            added.sort(key=lambda slug: float(listed[slug].get("volume") or 0), reverse=True)
+            logger.warning(
+                f"Discovery found {len(added)} new events but only {max(room, 0)} fit "
+                f"DISCOVERY_MAX_EVENTS={Config.DISCOVERY_MAX_EVENTS}"
+            )
+            added = added[:max(room, 0)]
+        for slug in added:
+            self.discovered[slug] = listed[slug].get("title", "")
+
+        retired = []
+        if full:
+            retired = [slug for slug in self.discovered if slug not in listed]
+            for slug in retired:
+                del self.discovered[slug]
+            self._closed.intersection_update(listed)
+            self._last_full = now
+
+        kind = "Full" if full else "Incremental"
+        logger.info(
+            f"{kind} discovery: {len(listed)} matching events listed, "
+            f"{len(added)} added, {len(retired)} retired, {len(self.discovered)} tracked"
+        )
+        return added, retired
+
+    def retire(self, slug: str) -> bool:
+        """Forget a discovered event, e.g. once polling shows it closed.
+
+        Returns False for events that were not discovered here.
+        """
+        if self.discovered.pop(slug, None) is None:
+            return False
+        self._closed.add(slug)
+        return True
+
+    async def _list(self, tag: str | None, full: bool, newest: int) -> list[dict]:
+        params = {"active": "true", "closed": "false", "order": "id", "ascending": "false"}
+        if tag:
+            params["tag_slug"] = tag
+        if full:
+            return await self.client.list_events(
+                params, Config.DISCOVERY_PAGE_SIZE, Config.DISCOVERY_CONCURRENCY
+            )
+        return await self.client.list_events(
+            params,
+            Config.DISCOVERY_PAGE_SIZE,
+            concurrency=1,
+            stop=lambda page: any(_event_id(event) <= newest for event in page),
+        )
+
+    def _matches(self, event: dict) -> bool:
+        if not self.keywords:
+            return True
+        text = " ".join(
+            [event.get("title") or "", event.get("slug") or ""]
+            + [market.get("question") or "" for market in event.get("markets") or []]
+        ).lower()
+        return any(keyword in text for keyword in self.keywords)
@@ -0,0 +1,132 @@
+import asyncio
+import logging
+from typing import Dict
+
+from src.config import Config
+from src.detector import Alert
+from src.rate_limit import TokenBucket
+from src.sinks import AlertSink, Outgoing, TelegramSink, create_sinks
+from src.telegram_client import TelegramAlertClient
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+
+def coalesce_messages(messages: list[str], limit: int = TELEGRAM_MESSAGE_LIMIT) -> list[str]:
+    """Join messages into as few texts as possible, each at most `limit` characters."""
+    separator = "\n\n"
+    combined: list[str] = []
+    current = ""
+    for message in messages:
+        while len(message) > limit:
+            if current:
+                combined.append(current)
+                current = ""
+            combined.append(message[:limit])
+            message = message[limit:]
+        if not current:
+            current = message
+        elif len(current) + len(separator) + len(message) <= limit:
+            current += separator + message
+        else:
+            combined.append(current)
+            current = message
+    if current:
+        combined.append(current)
+    return combined
+
+
+class AlertDispatcher:
+    """Fans alerts out to every configured sink.
+
+    submit() never waits on delivery: each message is wrapped once and the
+    same object is queued on every sink. Each sink delivers from its own
+    queue on its own task, with its own rate limit and retries, so a slow or
+    failing chat or webhook only delays itself. Replies to a single chat
+    (e.g. bot commands) go through that chat's sink if it is a configured
+    destination, otherwise through one shared reply sink, so chats that
+    message the bot don't each leave a sink and a task behind.
+    """
+
+    def __init__(
+        self,
+        telegram: TelegramAlertClient,
+        coalesce: bool | None = None,
+        sinks: list[AlertSink] | None = None,
+    ):
+        self.telegram = telegram
+        self.coalesce = Config.DISPATCH_COALESCE if coalesce is None else coalesce
+        self.global_bucket = TokenBucket(Config.TELEGRAM_GLOBAL_RATE, Config.TELEGRAM_GLOBAL_RATE)
+        self.sinks = create_sinks(telegram, self.global_bucket) if sinks is None else sinks
+        self.chat_sinks: Dict[str, TelegramSink] = {
+            sink.chat_id: sink for sink in self.sinks if isinstance(sink, TelegramSink)
+        }
+        self.reply_sink: TelegramSink | None = None  # created on the first reply
+        self._started = False
+
+    @property
+    def sent(self) -> int:
+        return sum(sink.sent for sink in self._all_sinks())
+
+    @property
+    def dropped(self) -> int:
+        return sum(sink.dropped for sink in self._all_sinks())
+
+    @property
+    def failed(self) -> int:
+        return sum(sink.failed for sink in self._all_sinks())
+
+    def pending(self) -> int:
+        """Messages queued across all sinks."""
+        return sum(sink.queue.qsize() for sink in self._all_sinks())
+
+    def start(self):
+        """Start a delivery task per sink."""
+        self._started = True
+        for sink in self._all_sinks():
+            sink.start()
+
+    def submit(self, messages: list[str], chat_id: str | None = None, alerts: list[Alert] | None = None):
+        """Queue messages for every sink, or only for `chat_id`, without waiting.
+
+        `alerts` are the alerts the messages were formatted from, if any;
+        webhook and file sinks receive their fields with each message.
+        Coalescing only applies to Telegram: the other sinks always get one
+        message per alert.
+        """
+        if alerts is None:
+            outgoing = [Outgoing(message, chat_id=chat_id) for message in messages]
+        else:
+            outgoing = [
+                Outgoing(message, alert=alert, timestamp=alert.timestamp)
+                for message, alert in zip(messages, alerts)
+            ]
+        combined = outgoing
+        if self.coalesce and len(messages) > 1:
+            combined = [Outgoing(text, chat_id=chat_id) for text in coalesce_messages(messages)]
+        sinks = [self._chat_sink(chat_id)] if chat_id else self.sinks
+        for sink in sinks:
+            for item in combined if isinstance(sink, TelegramSink) else outgoing:
+                sink.put(item)
+
+    async def close(self, timeout: float = 5.0):
+        """Give queued messages up to `timeout` seconds to go out, then stop."""
+        await asyncio.gather(*(sink.close(timeout) for sink in self._all_sinks()))
+        for sink in self._all_sinks():
+            if sink.sent or sink.failed or sink.dropped:
+                logger.info(f"{sink.name}: {sink.sent} sent, {sink.failed} failed, {sink.dropped} dropped")
+        self._started = False
+
+    def _chat_sink(self, chat_id: str) -> TelegramSink:
+        sink = self.chat_sinks.get(chat_id)
+        if sink is not None:
+            return sink
+        if self.reply_sink is None:
+            self.reply_sink = TelegramSink(self.telegram, None, self.global_bucket)
+            if self._started:
+                self.reply_sink.start()
+        return self.reply_sink
+
+    def _all_sinks(self) -> list[AlertSink]:
+        return [*self.sinks, self.reply_sink] if self.reply_sink else list(self.sinks)
@@ -0,0 +1,245 @@
+import asyncio
+import logging
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Seconds; covers sub-millisecond detection up to slow HTTP requests
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.value = 0.0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def render(self) -> list[str]:
+        return [f"{self.name} {self.value}"]
+
+
+class Gauge:
+    """A gauge set directly or read from a callback at scrape time."""
+
+    def __init__(self, name: str, help: str, fn: Callable[[], float] | None = None):
+        self.name = name
+        self.help = help
+        self.fn = fn
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+    def render(self) -> list[str]:
+        value = self.fn() if self.fn else self.value
+        return [f"{self.name} {value}"]
+
+
+class CallbackCounter(Gauge):
+    """A counter whose value is owned elsewhere (e.g. a plain int attribute)."""
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS, labels: str = ""):
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        self.labels = labels  # rendered label pairs, e.g. 'sink="file",'
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    @contextmanager
+    def time(self):
+        """Observe the duration of a with-block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def render(self) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{{self.labels}le="{bound}"}} {cumulative}')
+        lines.append(f'{self.name}_bucket{{{self.labels}le="+Inf"}} {self.count}')
+        suffix = f"{{{self.labels.rstrip(',')}}}" if self.labels else ""
+        lines.append(f"{self.name}_sum{suffix} {self.sum}")
+        lines.append(f"{self.name}_count{suffix} {self.count}")
+        return lines
+
+
+class HistogramFamily:
+    """Histograms sharing a name, one per value of a single label."""
+
+    def __init__(self, name: str, help: str, label: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label = label
+        self.buckets = buckets
+        self.children: dict[str, Histogram] = {}
+
+    def labels(self, value: str) -> Histogram:
+        child = self.children.get(value)
+        if child is None:
+            escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+            child = self.children[value] = Histogram(
+                self.name, self.help, self.buckets, labels=f'{self.label}="{escaped}",'
+            )
+        return child
+
+    def render(self) -> list[str]:
+        return [line for child in self.children.values() for line in child.render()]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics: dict[str, Counter | Gauge | Histogram | HistogramFamily] = {}
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self._register(Counter(name, help))
+
+    def gauge(self, name: str, help: str, fn: Callable[[], float] | None = None) -> Gauge:
+        return self._register(Gauge(name, help, fn))
+
+    def callback_counter(self, name: str, help: str, fn: Callable[[], float]) -> CallbackCounter:
+        return self._register(CallbackCounter(name, help, fn))
+
+    def histogram(self, name: str, help: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, buckets))
+
+    def histogram_family(
+        self, name: str, help: str, label: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> HistogramFamily:
+        return self._register(HistogramFamily(name, help, label, buckets))
+
+    def _register(self, metric):
+        # Re-registering replaces the old metric, e.g. when a Monitor is recreated
+        self.metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self.metrics.values():
+            if isinstance(metric, (Counter, CallbackCounter)):
+                kind = "counter"
+            elif isinstance(metric, (Histogram, HistogramFamily)):
+                kind = "histogram"
+            else:
+                kind = "gauge"
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {kind}")
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                logger.error(f"Failed to render metric {metric.name}: {e}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+GAMMA_FETCH_SECONDS = REGISTRY.histogram(
+    "warometer_gamma_fetch_seconds", "Latency of Gamma /events requests"
+)
+GAMMA_FETCH_ERRORS = REGISTRY.counter(
+    "warometer_gamma_fetch_errors_total", "Failed Gamma /events requests"
+)
+GAMMA_RETRIES = REGISTRY.counter(
+    "warometer_gamma_retries_total", "Gamma requests retried after an error"
+)
+GAMMA_HEDGES = REGISTRY.counter(
+    "warometer_gamma_hedges_total", "Duplicate Gamma requests sent because the first was slow"
+)
+GAMMA_HEDGE_WINS = REGISTRY.counter(
+    "warometer_gamma_hedge_wins_total", "Hedged Gamma requests that answered before the original"
+)
+BOOK_FETCH_SECONDS = REGISTRY.histogram(
+    "warometer_book_fetch_seconds", "Latency of CLOB /books requests for alert enrichment"
+)
+DISCOVERY_PAGE_SECONDS = REGISTRY.histogram(
+    "warometer_discovery_page_seconds", "Latency of Gamma /events listing pages fetched by discovery"
+)
+PARSE_SECONDS = REGISTRY.histogram(
+    "warometer_parse_seconds", "Time to decode and parse one Gamma response"
+)
+MARKET_CHANGES = REGISTRY.counter(
+    "warometer_market_changes_total", "Markets whose price or volume changed between observations"
+)
+PRICE_MOVES = REGISTRY.histogram(
+    "warometer_price_move_abs", "Absolute YES price change per changed market",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5),
+)
+DETECT_SECONDS = REGISTRY.histogram(
+    "warometer_detect_seconds", "Time spent in IrregularityDetector.check_markets per batch"
+)
+CYCLE_SECONDS = REGISTRY.histogram(
+    "warometer_cycle_seconds", "Duration of a full poll, parse and detect cycle"
+)
+CYCLE_OVERRUNS = REGISTRY.counter(
+    "warometer_cycle_overruns_total", "Polls that started more than one interval late"
+)
+TELEGRAM_SEND_SECONDS = REGISTRY.histogram(
+    "warometer_telegram_send_seconds", "Latency of Telegram sendMessage calls"
+)
+TELEGRAM_SEND_ERRORS = REGISTRY.counter(
+    "warometer_telegram_send_errors_total", "Failed Telegram sendMessage calls"
+)
+TELEGRAM_FLOOD_WAITS = REGISTRY.counter(
+    "warometer_telegram_flood_waits_total", "Telegram flood-control (HTTP 429) responses"
+)
+SINK_DELIVERY_SECONDS = REGISTRY.histogram_family(
+    "warometer_sink_delivery_seconds", "Time from submitting an alert to its delivery, per alert sink", "sink"
+)
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, registry: MetricsRegistry):
+    try:
+        request_line = await reader.readline()
+        # Drain headers
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        parts = request_line.decode("latin-1").split()
+        if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+            body = registry.render().encode()
+            status = "200 OK"
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            body = b"Not Found\n"
+            status = "404 Not Found"
+            content_type = "text/plain"
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+    except Exception as e:
+        logger.debug(f"Metrics request failed: {e}")
+    finally:
+        writer.close()
+
+
+async def start_metrics_server(
+    host: str | None = None, port: int | None = None, registry: MetricsRegistry = REGISTRY
+) -> asyncio.AbstractServer:
+    """Serve /metrics on the running event loop."""
+    host = host or Config.METRICS_HOST
+    port = Config.METRICS_PORT if port is None else port
+    server = await asyncio.start_server(lambda r, w: _handle(r, w, registry), host, port)
+    logger.info(f"Serving metrics on http://{host}:{server.sockets[0].getsockname()[1]}/metrics")
+    return server
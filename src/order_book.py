@@ -0,0 +1,115 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from src.config import Config
+from src.detector import Alert
+from src.polymarket_client import AsyncPolymarketClient, Market
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class BookStats:
+    best_bid: float | None
+    best_ask: float | None
+    depth_up: float  # USD of asks within `move` above the midpoint
+    depth_down: float  # USD of bids within `move` below it
+
+    @property
+    def spread(self) -> float | None:
+        if self.best_bid is None or self.best_ask is None:
+            return None
+        return self.best_ask - self.best_bid
+
+
+def _levels(side) -> list[tuple[float, float]]:
+    levels = []
+    for level in side or ():
+        try:
+            levels.append((float(level["price"]), float(level["size"])))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return levels
+
+
+def book_stats(book: dict, move: float) -> BookStats | None:
+    """Spread and depth within `move` of the midpoint, or None for an empty book."""
+    bids = _levels(book.get("bids"))
+    asks = _levels(book.get("asks"))
+    if not bids and not asks:
+        return None
+    # Level order differs between endpoints, so don't rely on it
+    best_bid = max(price for price, _ in bids) if bids else None
+    best_ask = min(price for price, _ in asks) if asks else None
+    if best_bid is not None and best_ask is not None:
+        mid = (best_bid + best_ask) / 2
+    else:
+        mid = best_bid if best_bid is not None else best_ask
+    return BookStats(
+        best_bid=best_bid,
+        best_ask=best_ask,
+        depth_up=sum(price * size for price, size in asks if price <= mid + move),
+        depth_down=sum(price * size for price, size in bids if price >= mid - move),
+    )
+
+
+class BookEnricher:
+    """Qualifies alerts with the CLOB order book of the market that moved.
+
+    Gamma prices are midpoints, so a jump caused by one small order on an
+    empty book looks like a real repricing. For the markets that alerted in
+    a cycle, the YES token books are requested in batches of BOOK_BATCH_SIZE,
+    all at once, and the alerts wait at most BOOK_BUDGET_SECONDS for them.
+    Alerts whose book has not arrived by then go out without book data.
+    """
+
+    def __init__(self, client: AsyncPolymarketClient):
+        self.client = client
+        self.enriched = 0
+        self.missed = 0
+
+    async def enrich(self, alerts: list[Alert], markets: dict[str, Market]):
+        """Set spread and depth on the alerts whose book arrives within the budget."""
+        by_token: dict[str, list[Alert]] = {}
+        for alert in alerts:
+            market = markets.get(alert.market_id)
+            if market and market.clob_token_ids:
+                by_token.setdefault(market.clob_token_ids[0], []).append(alert)
+        if not by_token:
+            return
+
+        tokens = list(by_token)
+        size = max(1, Config.BOOK_BATCH_SIZE)
+        tasks = [
+            asyncio.ensure_future(self.client.get_order_books(tokens[i:i + size]))
+            for i in range(0, len(tokens), size)
+        ]
+        done, pending = await asyncio.wait(tasks, timeout=Config.BOOK_BUDGET_SECONDS)
+        for task in pending:
+            task.cancel()
+
+        books = {}
+        for task in done:
+            try:
+                books.update(task.result())
+            except Exception as e:
+                logger.warning(f"Failed to fetch order books: {e}")
+
+        enriched = 0
+        for token, token_alerts in by_token.items():
+            stats = book_stats(books[token], Config.BOOK_DEPTH_MOVE) if token in books else None
+            if stats is None:
+                continue
+            for alert in token_alerts:
+                alert.spread = stats.spread
+                alert.depth_up = stats.depth_up
+                alert.depth_down = stats.depth_down
+                enriched += 1
+        self.enriched += enriched
+        self.missed += len(alerts) - enriched
+        if pending:
+            logger.warning(
+                f"Order books not back within {Config.BOOK_BUDGET_SECONDS:g}s - "
+                f"sending {len(alerts) - enriched} alerts without book data"
+            )
@@ -1,13 +1,43 @@
+import asyncio
+import hashlib
 import json
-from dataclasses import dataclass
-from datetime import datetime
+import logging
+import sys
+import time
+from dataclasses import dataclass, field, replace
+from typing import Callable
 
 import httpx
 
 from src.config import Config
+from src.metrics import (
+    BOOK_FETCH_SECONDS,
+    DISCOVERY_PAGE_SECONDS,
+    GAMMA_FETCH_ERRORS,
+    GAMMA_FETCH_SECONDS,
+    GAMMA_HEDGE_WINS,
+    GAMMA_HEDGES,
+    GAMMA_RETRIES,
+    PARSE_SECONDS,
+)
+from src.rate_limit import TokenBucket
+from src.resilience import CircuitBreaker, CircuitOpenError, LatencyTracker, RetryBudget, backoff_delay
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(data) -> bytes:
+        return json.dumps(data).encode()
+
+
+@dataclass(slots=True)
 class Market:
     id: str
     question: str
@@ -18,6 +48,7 @@ class Market:
     end_date: str | None
     active: bool
     closed: bool
+    clob_token_ids: list[str] = field(default_factory=list)  # [YES token, NO token]
 
     @property
     def yes_percent(self) -> float:
@@ -28,7 +59,7 @@ class Market:
         return self.outcome_no_price * 100
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     id: str
     title: str
@@ -39,19 +70,117 @@ class Event:
     liquidity: float
     start_date: str | None
     end_date: str | None
+    active: bool = True
+    closed: bool = False
+    stale: bool = False  # served from cache because Gamma could not be reached
 
 
-class PolymarketClient:
-    def __init__(self):
+@dataclass
+class _CachedResponse:
+    etag: str | None
+    last_modified: str | None
+    digest: bytes
+    slugs: tuple[str, ...]  # slugs the response contained
+
+
+@dataclass(slots=True)
+class _CachedEvent:
+    digest: bytes
+    event: Event
+
+
+def _parse_outcome_prices(outcome_prices) -> tuple[float, float]:
+    """Read YES/NO prices from an outcomePrices value such as '["0.02", "0.98"]'."""
+    if isinstance(outcome_prices, str):
+        # Fast path: split the usual two-element string instead of decoding JSON
+        parts = outcome_prices.strip("[] ").split(",")
+        if len(parts) == 2:
+            yes, no = parts[0].strip(' "'), parts[1].strip(' "')
+            try:
+                return (float(yes) if yes else 0, float(no) if no else 0)
+            except ValueError:
+                pass
+        try:
+            outcome_prices = json.loads(outcome_prices)
+        except json.JSONDecodeError:
+            outcome_prices = [0, 0]
+
+    if not outcome_prices or len(outcome_prices) < 2:
+        outcome_prices = [0, 0]
+
+    yes_price = float(outcome_prices[0]) if outcome_prices[0] else 0
+    no_price = float(outcome_prices[1]) if outcome_prices[1] else 0
+    return yes_price, no_price
+
+
+def _http_timeout() -> httpx.Timeout:
+    """Build per-phase timeouts from config."""
+    return httpx.Timeout(
+        connect=Config.HTTP_CONNECT_TIMEOUT,
+        read=Config.HTTP_READ_TIMEOUT,
+        write=Config.HTTP_READ_TIMEOUT,
+        pool=Config.HTTP_POOL_TIMEOUT,
+    )
+
+
+def _http_limits() -> httpx.Limits:
+    """Build keep-alive pool limits from config."""
+    return httpx.Limits(
+        max_connections=Config.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=Config.HTTP_MAX_KEEPALIVE,
+    )
+
+
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+def _retry_after(response: httpx.Response) -> float:
+    try:
+        return float(response.headers.get("Retry-After", 0))
+    except ValueError:
+        return 0.0
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package (pip install httpx[http2])."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class AsyncPolymarketClient:
+    def __init__(self, http2: bool | None = None, recorder=None):
         self.base_url = Config.GAMMA_API_URL
-        self.client = httpx.Client(timeout=30.0)
+        self.recorder = recorder
+        use_http2 = Config.HTTP2_ENABLED if http2 is None else http2
+        if use_http2 and not _http2_available():
+            logger.warning("HTTP/2 requested but h2 is not installed - using HTTP/1.1")
+            use_http2 = False
+        self.client = httpx.AsyncClient(
+            timeout=_http_timeout(),
+            limits=_http_limits(),
+            http2=use_http2,
+        )
+        self._semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_REQUESTS)
+        self._response_cache: dict[tuple[str, ...], _CachedResponse] = {}
+        self._event_cache: dict[str, _CachedEvent] = {}
+        self._parsed_markets: dict[str, tuple[tuple, Market]] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.not_modified = 0
+        self.breaker = CircuitBreaker("gamma")
+        self.retry_budget = RetryBudget()
+        self.latency = LatencyTracker()
+        self.stale: dict[str, float] = {}  # slug -> monotonic time its data went stale
 
-    def get_event_by_slug(self, slug: str) -> Event | None:
+    async def get_event_by_slug(self, slug: str) -> Event | None:
         """Fetch an event by its URL slug."""
         url = f"{self.base_url}/events"
         params = {"slug": slug}
 
-        response = self.client.get(url, params=params)
+        response = await self._request(url, params)
         response.raise_for_status()
 
         events = response.json()
@@ -61,13 +190,347 @@ class PolymarketClient:
         event_data = events[0]
         return self._parse_event(event_data)
 
-    def get_markets_for_event(self, event_slug: str) -> list[Market]:
+    async def get_markets_for_event(self, event_slug: str) -> list[Market]:
         """Get all markets associated with an event slug."""
-        event = self.get_event_by_slug(event_slug)
+        event = await self.get_event_by_slug(event_slug)
         if not event:
             return []
         return event.markets
 
+    async def get_events_by_slugs(
+        self, slugs: list[str], changed_only: bool = False, budget: TokenBucket | None = None
+    ) -> dict[str, Event]:
+        """Fetch many events concurrently, keyed by slug.
+
+        Slugs are coalesced into multi-slug /events queries of up to
+        SLUGS_PER_REQUEST each, with at most MAX_CONCURRENT_REQUESTS in flight.
+        Slugs a successful batched reply left out are retried individually,
+        one request each taken from `budget` (slugs it cannot cover wait for
+        the next poll); slugs in a failed batch are not. With changed_only,
+        events whose response is unchanged since the previous poll are left
+        out. Otherwise events that could not be fetched are returned from
+        the last good response, marked stale.
+        """
+        size = max(1, Config.SLUGS_PER_REQUEST)
+        chunks = [tuple(slugs[i:i + size]) for i in range(0, len(slugs), size)]
+        results = await asyncio.gather(*(self._fetch_chunk(chunk) for chunk in chunks))
+
+        missing = set(slugs)
+        omitted = []
+        for chunk, (chunk_events, _, ok) in zip(chunks, results):
+            missing.difference_update(chunk_events)
+            if ok and len(chunk) > 1:
+                omitted.extend(slug for slug in chunk if slug not in chunk_events)
+        if omitted and budget is not None:
+            allowed = max(0, int(budget.available()))
+            if allowed < len(omitted):
+                logger.info(f"Request budget exhausted - {len(omitted) - allowed} slugs not retried singly")
+                omitted = omitted[:allowed]
+            budget.take(len(omitted))
+        if omitted:
+            singles = [(slug,) for slug in omitted]
+            chunks.extend(singles)
+            results.extend(await asyncio.gather(*(self._fetch_chunk(c) for c in singles)))
+
+        events: dict[str, Event] = {}
+        for chunk_events, changed, _ in results:
+            for slug, event in chunk_events.items():
+                if slug in changed or not changed_only:
+                    events[slug] = event
+            missing.difference_update(chunk_events)
+        if not changed_only:
+            for slug in self.stale.keys() & events.keys():
+                events[slug] = replace(events[slug], stale=True)
+
+        for slug in missing:
+            logger.warning(f"No event found for slug: {slug}")
+        return events
+
+    async def _fetch_chunk(self, slugs: tuple[str, ...]) -> tuple[dict[str, Event], set[str], bool]:
+        """Fetch one multi-slug /events query under the concurrency limit.
+
+        Returns the parsed events, the slugs whose event changed since it
+        was last fetched and whether the request succeeded. Events are
+        cached per slug, so a slug compares against its last fetch whichever
+        slugs it was batched with. A response identical to the last one for
+        the same slugs (HTTP 304, or the same body) is not parsed at all;
+        otherwise only events whose own JSON changed are parsed again.
+        """
+        url = f"{self.base_url}/events"
+        params = [("slug", slug) for slug in slugs]
+        if len(slugs) > 1:
+            params.append(("limit", str(len(slugs))))
+
+        cached = self._response_cache.get(slugs)
+        if cached and not all(slug in self._event_cache for slug in cached.slugs):
+            cached = None
+        headers = {}
+        if cached and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+        try:
+            async with self._semaphore:
+                with GAMMA_FETCH_SECONDS.time():
+                    response = await self._request(url, params, headers)
+                if cached and response.status_code == 304:
+                    self.cache_hits += 1
+                    self.not_modified += 1
+                    self._mark_fresh(slugs)
+                    return self._cached_events(cached.slugs), set(), True
+                response.raise_for_status()
+                body = response.content
+        except CircuitOpenError:
+            # Already logged when the circuit opened; keep serving the last good data
+            self._mark_stale(slugs)
+            return self._cached_events(slugs), set(), False
+        except Exception as e:
+            GAMMA_FETCH_ERRORS.inc()
+            logger.error(f"Failed to fetch events {', '.join(slugs)}: {e}")
+            self._mark_stale(slugs)
+            return self._cached_events(slugs), set(), False
+        self._mark_fresh(slugs)
+
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        if cached and cached.digest == digest:
+            self.cache_hits += 1
+            return self._cached_events(cached.slugs), set(), True
+        if self.recorder:
+            self.recorder.record(slugs, body)
+
+        wanted = set(slugs)
+        events = {}
+        changed = set()
+        with PARSE_SECONDS.time():
+            for event_data in _json_loads(body) or []:
+                slug = event_data.get("slug", "")
+                if slug not in wanted:
+                    continue
+                event_digest = hashlib.blake2b(_json_dumps(event_data), digest_size=16).digest()
+                entry = self._event_cache.get(slug)
+                if entry is None or entry.digest != event_digest:
+                    entry = self._event_cache[slug] = _CachedEvent(event_digest, self._parse_event(event_data))
+                    changed.add(slug)
+                events[slug] = entry.event
+        if changed:
+            self.cache_misses += 1
+        else:
+            self.cache_hits += 1
+
+        # Validators for the next poll of the same slug group; groups vary
+        # with the schedule, so keep only the most recently used ones
+        self._response_cache.pop(slugs, None)
+        self._response_cache[slugs] = _CachedResponse(
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            digest=digest,
+            slugs=tuple(events),
+        )
+        while len(self._response_cache) > max(16, len(self._event_cache)):
+            del self._response_cache[next(iter(self._response_cache))]
+        return events, changed, True
+
+    def _cached_events(self, slugs) -> dict[str, Event]:
+        """The last fetched event for each of `slugs` that has one."""
+        return {slug: self._event_cache[slug].event for slug in slugs if slug in self._event_cache}
+
+    async def list_events(
+        self,
+        params: dict,
+        page_size: int = 100,
+        concurrency: int = 4,
+        stop: Callable[[list[dict]], bool] | None = None,
+    ) -> list[dict]:
+        """Page through the /events listing, several pages at a time.
+
+        Pages are requested in waves of `concurrency` under their own limit,
+        separate from the polling semaphore, so a long enumeration never
+        holds up price polls. Listing stops at the first short page, or at
+        the first page for which `stop(page)` is true. Errors propagate so
+        callers never act on a partial listing. Returns raw event dicts.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch_page(offset: int) -> list[dict]:
+            async with semaphore:
+                with DISCOVERY_PAGE_SECONDS.time():
+                    response = await self._request(
+                        f"{self.base_url}/events",
+                        {**params, "limit": page_size, "offset": offset},
+                    )
+                response.raise_for_status()
+                return _json_loads(response.content) or []
+
+        events = []
+        offset = 0
+        while True:
+            offsets = [offset + i * page_size for i in range(concurrency)]
+            for page in await asyncio.gather(*(fetch_page(o) for o in offsets)):
+                events.extend(page)
+                if len(page) < page_size or (stop and stop(page)):
+                    return events
+            offset += concurrency * page_size
+
+    async def get_order_books(self, token_ids: list[str]) -> dict[str, dict]:
+        """Fetch CLOB order books for a batch of tokens in one request.
+
+        Not retried and outside the polling semaphore: it runs on the alert
+        path, where the caller bounds it with a deadline instead.
+        Returns raw books keyed by token id.
+        """
+        with BOOK_FETCH_SECONDS.time():
+            response = await self.client.post(
+                f"{Config.CLOB_API_URL}/books", json=[{"token_id": token} for token in token_ids]
+            )
+        response.raise_for_status()
+        return {str(book.get("asset_id")): book for book in _json_loads(response.content) or []}
+
+    async def _request(self, url: str, params, headers: dict | None = None) -> httpx.Response:
+        """GET through the circuit breaker, with hedging and budgeted retries.
+
+        Transport errors, 429 and 5xx responses are retried with jittered
+        exponential backoff (or the server's Retry-After, if short enough)
+        for up to RETRY_MAX_ATTEMPTS attempts while the retry budget allows.
+        The breaker only counts a request as failed once every attempt has.
+        Raises CircuitOpenError without sending anything while it is open.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"circuit {self.breaker.name} is open")
+        self.retry_budget.deposit()
+        settled = False
+        try:
+            attempt = 1
+            while True:
+                try:
+                    response = await self._hedged_get(url, params, headers)
+                    if response.status_code not in RETRYABLE_STATUS:
+                        self.breaker.record_success()
+                        settled = True
+                        return response
+                    error = httpx.HTTPStatusError(
+                        f"HTTP {response.status_code} from {url}", request=response.request, response=response
+                    )
+                    wait = _retry_after(response)
+                except httpx.TransportError as e:
+                    error = e
+                    wait = 0.0
+
+                if (
+                    attempt >= Config.RETRY_MAX_ATTEMPTS
+                    or wait > Config.RETRY_MAX_BACKOFF_SECONDS
+                    or not self.retry_budget.withdraw()
+                ):
+                    self.breaker.record_failure()
+                    settled = True
+                    raise error
+                GAMMA_RETRIES.inc()
+                wait = max(wait, backoff_delay(attempt))
+                logger.debug(f"Retrying {url} in {wait:.2f}s after: {error!r}")
+                await asyncio.sleep(wait)
+                attempt += 1
+        finally:
+            if not settled:
+                self.breaker.release()
+
+    async def _hedged_get(self, url: str, params, headers: dict | None) -> httpx.Response:
+        """Send the request, and a duplicate if the first is slower than usual.
+
+        The duplicate goes out after the HEDGE_QUANTILE of recent latencies
+        (and only if the retry budget allows); whichever answers first wins
+        and the other is cancelled.
+        """
+        started = time.perf_counter()
+        first = asyncio.ensure_future(self.client.get(url, params=params, headers=headers))
+        delay = self._hedge_delay()
+        if delay is not None:
+            try:
+                done, _ = await asyncio.wait({first}, timeout=delay)
+            except asyncio.CancelledError:
+                first.cancel()
+                raise
+            if not done and self.retry_budget.withdraw():
+                GAMMA_HEDGES.inc()
+                second = asyncio.ensure_future(self.client.get(url, params=params, headers=headers))
+                response, winner = await self._first_response(first, second)
+                if winner is second:
+                    GAMMA_HEDGE_WINS.inc()
+                self.latency.observe(time.perf_counter() - started)
+                return response
+
+        response = await first
+        self.latency.observe(time.perf_counter() - started)
+        return response
+
+    @staticmethod
+    async def _first_response(*tasks: asyncio.Future) -> tuple[httpx.Response, asyncio.Future]:
+        """The first successful response among tasks; the rest are cancelled."""
+        pending = set(tasks)
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result(), task
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _hedge_delay(self) -> float | None:
+        if not Config.HEDGE_ENABLED:
+            return None
+        quantile = self.latency.quantile(Config.HEDGE_QUANTILE)
+        if quantile is None:
+            return None
+        return max(Config.HEDGE_MIN_DELAY_SECONDS, quantile)
+
+    def _mark_stale(self, slugs):
+        now = time.monotonic()
+        for slug in slugs:
+            if slug in self._event_cache:  # never fetched: no last known prices to serve
+                self.stale.setdefault(slug, now)
+
+    def _mark_fresh(self, slugs):
+        for slug in slugs:
+            self.stale.pop(slug, None)
+
+    def forget_events(self, slugs) -> None:
+        """Drop cached responses and stale marks for events that are no longer polled."""
+        slugs = set(slugs)
+        for slug in slugs:
+            self._event_cache.pop(slug, None)
+            self.stale.pop(slug, None)
+        self._response_cache = {
+            key: entry for key, entry in self._response_cache.items() if slugs.isdisjoint(key)
+        }
+
+    def forget_markets(self, market_ids) -> None:
+        """Drop cached parses for markets that are no longer tracked."""
+        for market_id in market_ids:
+            self._parsed_markets.pop(market_id, None)
+
+    def parse_cache_bytes(self) -> int:
+        """Approximate memory held by the parsed-market cache."""
+        size = sys.getsizeof(self._parsed_markets)
+        if self._parsed_markets:
+            raw, market = next(iter(self._parsed_markets.values()))
+            entry = sys.getsizeof(raw) + sys.getsizeof(market) + sys.getsizeof(market.clob_token_ids)
+            size += len(self._parsed_markets) * entry
+        return size
+
+    def cache_stats(self) -> dict:
+        """Get change-detection counters."""
+        total = self.cache_hits + self.cache_misses
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "not_modified": self.not_modified,
+            "hit_rate": self.cache_hits / total if total else 0.0,
+        }
+
     def _parse_event(self, data: dict) -> Event:
         """Parse event data from API response."""
         markets = []
@@ -87,38 +550,88 @@ class PolymarketClient:
             liquidity=float(data.get("liquidity", 0) or 0),
             start_date=data.get("startDate"),
             end_date=data.get("endDate"),
+            active=data.get("active", True),
+            closed=data.get("closed", False),
         )
 
     def _parse_market(self, data: dict) -> Market | None:
-        """Parse market data from API response."""
-        outcome_prices = data.get("outcomePrices")
-        if isinstance(outcome_prices, str):
-            try:
-                outcome_prices = json.loads(outcome_prices)
-            except json.JSONDecodeError:
-                outcome_prices = [0, 0]
+        """Parse market data from API response.
 
-        if not outcome_prices or len(outcome_prices) < 2:
-            outcome_prices = [0, 0]
+        A market whose raw fields are identical to the previous poll reuses
+        the Market parsed then, so a steady market costs one tuple compare.
+        Ids and questions are interned so repeated polls share one copy.
+        """
+        get = data.get
+        raw = (
+            get("outcomePrices"),
+            get("volume"),
+            get("liquidity"),
+            get("question"),
+            get("active"),
+            get("closed"),
+            get("endDate"),
+            get("clobTokenIds"),
+        )
+        key = get("id", "")
+        cached = self._parsed_markets.get(key)
+        if cached is not None and cached[0] == raw:
+            return cached[1]
 
-        yes_price = float(outcome_prices[0]) if outcome_prices[0] else 0
-        no_price = float(outcome_prices[1]) if outcome_prices[1] else 0
+        outcome_prices, volume, liquidity, question, active, closed, end_date, clob_token_ids = raw
+        yes_price, no_price = _parse_outcome_prices(outcome_prices)
 
-        return Market(
-            id=str(data.get("id", "")),
-            question=data.get("question", ""),
+        clob_token_ids = clob_token_ids or []
+        if isinstance(clob_token_ids, str):
+            try:
+                clob_token_ids = _json_loads(clob_token_ids)
+            except ValueError:
+                clob_token_ids = []
+
+        market = Market(
+            id=sys.intern(str(key)),
+            question=sys.intern(question or ""),
             outcome_yes_price=yes_price,
             outcome_no_price=no_price,
-            volume=float(data.get("volume", 0) or 0),
-            liquidity=float(data.get("liquidity", 0) or 0),
-            end_date=data.get("endDate"),
-            active=data.get("active", False),
-            closed=data.get("closed", False),
+            volume=float(volume or 0),
+            liquidity=float(liquidity or 0),
+            end_date=end_date,
+            active=active or False,
+            closed=closed or False,
+            clob_token_ids=[str(t) for t in clob_token_ids],
         )
+        self._parsed_markets[key] = (raw, market)
+        return market
+
+    async def aclose(self):
+        """Close the HTTP client."""
+        await self.client.aclose()
+
+
+class PolymarketClient:
+    """Blocking wrapper around AsyncPolymarketClient for scripts."""
+
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._client = AsyncPolymarketClient()
+
+    def get_event_by_slug(self, slug: str) -> Event | None:
+        """Fetch an event by its URL slug."""
+        return self._loop.run_until_complete(self._client.get_event_by_slug(slug))
+
+    def get_markets_for_event(self, event_slug: str) -> list[Market]:
+        """Get all markets associated with an event slug."""
+        return self._loop.run_until_complete(self._client.get_markets_for_event(event_slug))
+
+    def _parse_event(self, data: dict) -> Event:
+        return self._client._parse_event(data)
+
+    def _parse_market(self, data: dict) -> Market | None:
+        return self._client._parse_market(data)
 
     def close(self):
         """Close the HTTP client."""
-        self.client.close()
+        self._loop.run_until_complete(self._client.aclose())
+        self._loop.close()
 
 
 def get_current_odds(event_slug: str | None = None) -> list[Market]:
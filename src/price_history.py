@@ -0,0 +1,111 @@
+import sys
+from array import array
+from collections import deque
+
+
+class PriceHistory:
+    """Fixed-capacity ring buffer of (timestamp, price) samples for one market.
+
+    Samples live in two flat double arrays that grow up to `capacity` and then
+    wrap, so memory per market is bounded at 16 bytes per sample. For each
+    detection window a pair of monotonic deques tracks the lowest and highest
+    price inside the window, which keeps extrema O(1) amortized per append.
+    The deques hold their own [price, superseded_at] entries rather than ring
+    positions, so a window longer than the ring still sees every extreme.
+
+    Prices are treated as a step function: a sample stays in effect until the
+    next one, so the price that was current when a window opened still counts
+    towards that window. Appending an unchanged price is therefore redundant
+    and callers may skip it.
+    """
+
+    __slots__ = ("capacity", "windows", "timestamps", "prices", "count", "_last", "_lows", "_highs")
+
+    def __init__(self, capacity: int, windows: tuple[float, ...]):
+        self.capacity = capacity
+        self.windows = windows
+        self.timestamps = array("d")
+        self.prices = array("d")
+        self.count = 0  # total samples ever appended; sequence number of the next one
+        self._last: list[float] | None = None  # [price, superseded_at] of the latest sample
+        self._lows = [deque() for _ in windows]
+        self._highs = [deque() for _ in windows]
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    @property
+    def last_price(self) -> float | None:
+        if not self.count:
+            return None
+        return self.prices[(self.count - 1) % self.capacity]
+
+    @property
+    def last_timestamp(self) -> float | None:
+        if not self.count:
+            return None
+        return self.timestamps[(self.count - 1) % self.capacity]
+
+    def append(self, timestamp: float, price: float) -> None:
+        """Add a sample and expire samples that fell out of each window."""
+        seq = self.count
+        if seq < self.capacity:
+            self.timestamps.append(timestamp)
+            self.prices.append(price)
+        else:
+            slot = seq % self.capacity
+            self.timestamps[slot] = timestamp
+            self.prices[slot] = price
+        self.count = seq + 1
+
+        # The previous sample stops being the current price now
+        if self._last is not None:
+            self._last[1] = timestamp
+        entry = self._last = [price, float("inf")]
+
+        for window, lows, highs in zip(self.windows, self._lows, self._highs):
+            while lows and lows[-1][0] >= price:
+                lows.pop()
+            lows.append(entry)
+            while highs and highs[-1][0] <= price:
+                highs.pop()
+            highs.append(entry)
+
+            # Drop samples superseded before the window opened
+            cutoff = timestamp - window
+            for extrema in (lows, highs):
+                while extrema[0][1] <= cutoff:
+                    extrema.popleft()
+
+    def extremes(self) -> list[tuple[float, float]]:
+        """Lowest and highest price inside each window, as of the last append."""
+        return [(lows[0][0], highs[0][0]) for lows, highs in zip(self._lows, self._highs)]
+
+    def reset_windows(self) -> None:
+        """Restart every window from the latest sample (used after an alert)."""
+        if self._last is None:
+            return
+        latest = self._last
+        for lows, highs in zip(self._lows, self._highs):
+            lows.clear()
+            lows.append(latest)
+            highs.clear()
+            highs.append(latest)
+
+    def samples(self) -> list[tuple[float, float]]:
+        """All retained (timestamp, price) samples, oldest first."""
+        start = self.count % self.capacity if self.count > self.capacity else 0
+        order = list(range(start, len(self.prices))) + list(range(start))
+        return [(self.timestamps[i], self.prices[i]) for i in order]
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by this history."""
+        size = sys.getsizeof(self) + sys.getsizeof(self.timestamps) + sys.getsizeof(self.prices)
+        entries = set()
+        for lows, highs in zip(self._lows, self._highs):
+            size += sys.getsizeof(lows) + sys.getsizeof(highs)
+            entries.update(map(id, lows))
+            entries.update(map(id, highs))
+        if self._last is not None:
+            size += len(entries) * sys.getsizeof(self._last)
+        return size
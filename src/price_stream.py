@@ -0,0 +1,217 @@
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, replace
+from typing import Awaitable, Callable, Dict
+
+from src.config import Config
+from src.polymarket_client import Market
+
+logger = logging.getLogger(__name__)
+
+# Polymarket shows the midpoint unless the spread is wider than this,
+# in which case it falls back to the last trade price.
+MAX_MIDPOINT_SPREAD = 0.10
+
+
+@dataclass
+class _TokenQuote:
+    best_bid: float | None = None
+    best_ask: float | None = None
+    last_trade: float | None = None
+
+    def price(self) -> float | None:
+        if self.best_bid is not None and self.best_ask is not None:
+            if self.best_ask - self.best_bid <= MAX_MIDPOINT_SPREAD or self.last_trade is None:
+                return (self.best_bid + self.best_ask) / 2
+        return self.last_trade
+
+
+class PriceStream:
+    """Push price feed from the Polymarket CLOB market websocket.
+
+    Markets registered with track() are subscribed by their YES token. Every
+    update that moves a YES price is turned into an updated Market and
+    handed to on_update, so the detector sees the same objects as REST polls.
+    """
+
+    def __init__(
+        self,
+        on_update: Callable[[list[Market]], Awaitable[None]],
+        url: str | None = None,
+    ):
+        self.url = url or Config.CLOB_WS_URL
+        self.on_update = on_update
+        self.markets: Dict[str, Market] = {}
+        self.token_to_market: Dict[str, str] = {}
+        self.quotes: Dict[str, _TokenQuote] = {}
+        self.connected = False
+        self.reconnects = 0
+        self._running = False
+        self._ws = None
+
+    def track(self, markets: list[Market]) -> None:
+        """Register markets for streaming; new tokens are subscribed on the fly."""
+        new_tokens = []
+        for market in markets:
+            if not market.clob_token_ids or market.closed:
+                continue
+            self.markets[market.id] = market
+            token = market.clob_token_ids[0]
+            if token not in self.token_to_market:
+                new_tokens.append(token)
+            self.token_to_market[token] = market.id
+
+        if new_tokens and self._ws is not None:
+            asyncio.ensure_future(self._send_subscribe(new_tokens, initial=False))
+
+    def untrack(self, market_ids) -> None:
+        """Stop streaming markets; their tokens are unsubscribed on the fly."""
+        dropped = []
+        for market_id in market_ids:
+            market = self.markets.pop(market_id, None)
+            if market is None:
+                continue
+            token = market.clob_token_ids[0]
+            if self.token_to_market.get(token) == market_id:
+                del self.token_to_market[token]
+                self.quotes.pop(token, None)
+                dropped.append(token)
+
+        if dropped and self._ws is not None:
+            asyncio.ensure_future(self._send_unsubscribe(dropped))
+
+    async def run(self):
+        """Connect and process updates, reconnecting with backoff until stopped."""
+        import websockets  # only needed once streaming starts
+
+        self._running = True
+        delay = Config.STREAM_RECONNECT_MIN_SECONDS
+        while self._running:
+            try:
+                async with websockets.connect(self.url, ping_interval=None) as ws:
+                    self._ws = ws
+                    self.connected = True
+                    delay = Config.STREAM_RECONNECT_MIN_SECONDS
+                    logger.info(f"Price stream connected ({len(self.token_to_market)} tokens)")
+                    await self._send_subscribe(list(self.token_to_market), initial=True)
+                    await self._consume(ws)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Price stream error: {e}")
+            finally:
+                self._ws = None
+                self.connected = False
+
+            if self._running:
+                self.reconnects += 1
+                logger.info(f"Price stream reconnecting in {delay:.0f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, Config.STREAM_RECONNECT_MAX_SECONDS)
+
+    def stop(self):
+        """Stop the stream after the current connection closes."""
+        self._running = False
+        if self._ws is not None:
+            asyncio.ensure_future(self._ws.close())
+
+    async def _send_subscribe(self, tokens: list[str], initial: bool):
+        if not tokens or self._ws is None:
+            return
+        if initial:
+            message = {"assets_ids": tokens, "type": "market"}
+        else:
+            message = {"assets_ids": tokens, "operation": "subscribe"}
+        await self._ws.send(json.dumps(message))
+
+    async def _send_unsubscribe(self, tokens: list[str]):
+        if self._ws is None:
+            return
+        await self._ws.send(json.dumps({"assets_ids": tokens, "operation": "unsubscribe"}))
+
+    async def _consume(self, ws):
+        keepalive = asyncio.create_task(self._keepalive(ws))
+        try:
+            async for raw in ws:
+                if raw == "PONG":
+                    continue
+                try:
+                    payload = json.loads(raw)
+                except json.JSONDecodeError:
+                    continue
+                updated = self._apply(payload)
+                if updated:
+                    await self.on_update(updated)
+        finally:
+            keepalive.cancel()
+
+    async def _keepalive(self, ws):
+        """The CLOB feed drops connections that do not send PING regularly."""
+        while True:
+            await asyncio.sleep(Config.STREAM_PING_SECONDS)
+            await ws.send("PING")
+
+    def _apply(self, payload) -> list[Market]:
+        """Apply one feed message and return markets whose YES price moved."""
+        messages = payload if isinstance(payload, list) else [payload]
+        touched = set()
+        for message in messages:
+            event_type = message.get("event_type")
+            if event_type == "book":
+                quote = self._quote(message.get("asset_id"))
+                if quote is None:
+                    continue
+                bids = [float(level["price"]) for level in message.get("bids", [])]
+                asks = [float(level["price"]) for level in message.get("asks", [])]
+                quote.best_bid = max(bids) if bids else None
+                quote.best_ask = min(asks) if asks else None
+                touched.add(message["asset_id"])
+            elif event_type == "price_change":
+                for change in message.get("price_changes", []):
+                    quote = self._quote(change.get("asset_id"))
+                    if quote is None:
+                        continue
+                    if change.get("best_bid") is not None:
+                        quote.best_bid = float(change["best_bid"])
+                    if change.get("best_ask") is not None:
+                        quote.best_ask = float(change["best_ask"])
+                    touched.add(change["asset_id"])
+            elif event_type in ("best_bid_ask", "tick_size_change"):
+                quote = self._quote(message.get("asset_id"))
+                if quote is None:
+                    continue
+                if message.get("best_bid") is not None:
+                    quote.best_bid = float(message["best_bid"])
+                if message.get("best_ask") is not None:
+                    quote.best_ask = float(message["best_ask"])
+                touched.add(message["asset_id"])
+            elif event_type == "last_trade_price":
+                quote = self._quote(message.get("asset_id"))
+                if quote is None:
+                    continue
+                quote.last_trade = float(message["price"])
+                touched.add(message["asset_id"])
+
+        updated = []
+        for token in touched:
+            price = self.quotes[token].price()
+            market = self.markets.get(self.token_to_market[token])
+            if price is None or market is None or price == market.outcome_yes_price:
+                continue
+            market = replace(
+                market,
+                outcome_yes_price=price,
+                outcome_no_price=round(1 - price, 6),
+            )
+            self.markets[market.id] = market
+            updated.append(market)
+        return updated
+
+    def _quote(self, token: str | None) -> _TokenQuote | None:
+        if token not in self.token_to_market:
+            return None
+        quote = self.quotes.get(token)
+        if quote is None:
+            quote = self.quotes[token] = _TokenQuote()
+        return quote
@@ -0,0 +1,40 @@
+import time
+
+
+class TokenBucket:
+    """Token bucket allowing `rate` events per second with bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self) -> float:
+        """Seconds until a token is available."""
+        self._refill()
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def available(self) -> float:
+        """Tokens that can be spent right now."""
+        self._refill()
+        return self.tokens
+
+    def deposit(self, count: float):
+        """Add tokens, up to capacity."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + count)
+
+    def take(self, count: float = 1):
+        self._refill()
+        self.tokens -= count
+
+    def pause(self, seconds: float):
+        """Empty the bucket so nothing is sent for `seconds` (e.g. after HTTP 429)."""
+        self._refill()
+        self.tokens = min(self.tokens, 1.0) - seconds * self.rate
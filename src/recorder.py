@@ -0,0 +1,249 @@
+import gzip
+import json
+import logging
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Iterator
+
+from src.config import Config
+from src.polymarket_client import _json_loads
+
+logger = logging.getLogger(__name__)
+
+INDEX_ENTRY = struct.Struct("<dq")  # receive timestamp (epoch seconds), byte offset in segment
+SEGMENT_SUFFIX = ".jsonl.gz"
+INDEX_SUFFIX = ".idx"
+
+
+def _segment_name(timestamp: float) -> str:
+    return "feed-" + datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y%m%dT%H%M%S")
+
+
+class FeedRecorder:
+    """Appends raw Gamma responses to rotating compressed segment files.
+
+    Each record is one JSON line {"ts", "slugs", "payload"} compressed as
+    its own gzip member, so a segment is an ordinary .jsonl.gz file and any
+    record can also be decompressed on its own. A sidecar .idx file holds
+    fixed-size (timestamp, offset) entries for seeking. Compression and
+    disk I/O run on a background thread; record() only enqueues, and drops
+    the payload if the writer has fallen too far behind.
+
+    As a DeltaEngine subscriber (record_changes) it instead writes compact
+    {"ts", "changes", "questions"} records: one [id, old_yes, new_yes,
+    old_no, new_no, volume_delta] row per changed market, with each
+    market's question given once per segment.
+    """
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        segment_seconds: int | None = None,
+        segment_bytes: int | None = None,
+    ):
+        self.directory = directory or Config.RECORDER_DIR
+        self.segment_seconds = segment_seconds or Config.RECORDER_SEGMENT_SECONDS
+        self.segment_bytes = segment_bytes or Config.RECORDER_SEGMENT_BYTES
+        os.makedirs(self.directory, exist_ok=True)
+
+        self.records = 0
+        self.dropped = 0
+        self.bytes_in = 0
+        self.bytes_written = 0
+        self.write_seconds = 0.0
+
+        self._queue: queue.Queue = queue.Queue(maxsize=Config.RECORDER_QUEUE_SIZE)
+        self._segment = None
+        self._index = None
+        self._segment_started = 0.0
+        self._described: set[str] = set()  # markets whose question is in this segment
+        self._thread = threading.Thread(target=self._run, name="feed-recorder", daemon=True)
+        self._thread.start()
+
+    def record(self, slugs: tuple[str, ...], body: bytes, received_at: float | None = None):
+        """Queue a raw response body for writing. Never blocks."""
+        try:
+            self._queue.put_nowait((received_at or time.time(), slugs, body))
+        except queue.Full:
+            self.dropped += 1
+
+    def record_changes(self, changes: list, now: datetime):
+        """Queue a batch of DeltaEngine changes for writing. Never blocks."""
+        rows = [
+            (
+                change.market_id,
+                change.market.question,
+                change.old_yes_price,
+                change.new_yes_price,
+                change.old_no_price,
+                change.new_no_price,
+                change.volume_delta,
+            )
+            for change in changes
+        ]
+        try:
+            self._queue.put_nowait((now.replace(tzinfo=timezone.utc).timestamp(), None, rows))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """Flush queued records and close the current segment."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def stats(self) -> dict:
+        """Disk usage and write overhead so far."""
+        return {
+            "records": self.records,
+            "dropped": self.dropped,
+            "bytes_in": self.bytes_in,
+            "bytes_written": self.bytes_written,
+            "compression_ratio": self.bytes_in / self.bytes_written if self.bytes_written else 0.0,
+            "write_seconds": self.write_seconds,
+            "disk_bytes": sum(
+                entry.stat().st_size for entry in os.scandir(self.directory) if entry.is_file()
+            ),
+        }
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            try:
+                self._write(*item)
+            except Exception as e:
+                logger.error(f"Failed to record feed payload: {e}")
+        self._close_segment()
+
+    def _write(self, received_at: float, slugs: tuple[str, ...] | None, data: bytes | list):
+        """Write one record: a raw response body, or change rows when slugs is None."""
+        start = time.perf_counter()
+        if (
+            self._segment is None
+            or received_at - self._segment_started >= self.segment_seconds
+            or self._segment.tell() >= self.segment_bytes
+        ):
+            self._open_segment(received_at)
+
+        if slugs is None:
+            line = self._changes_line(received_at, data)
+        else:
+            line = b'{"ts":%r,"slugs":%s,"payload":%s}\n' % (
+                received_at, json.dumps(list(slugs)).encode(), data
+            )
+        member = gzip.compress(line, compresslevel=Config.RECORDER_COMPRESS_LEVEL, mtime=0)
+        offset = self._segment.tell()
+        self._segment.write(member)
+        self._index.write(INDEX_ENTRY.pack(received_at, offset))
+        self._segment.flush()
+        self._index.flush()
+
+        self.records += 1
+        self.bytes_in += len(line)
+        self.bytes_written += len(member) + INDEX_ENTRY.size
+        self.write_seconds += time.perf_counter() - start
+
+    def _changes_line(self, received_at: float, rows: list) -> bytes:
+        questions = {}
+        for market_id, question, *_ in rows:
+            if market_id not in self._described:
+                self._described.add(market_id)
+                questions[market_id] = question
+        record = {
+            "ts": received_at,
+            "changes": [[market_id, *values] for market_id, _, *values in rows],
+            "questions": questions,
+        }
+        return json.dumps(record, separators=(",", ":")).encode() + b"\n"
+
+    def _open_segment(self, started: float):
+        self._close_segment()
+        base = os.path.join(self.directory, _segment_name(started))
+        self._segment = open(base + SEGMENT_SUFFIX, "ab")
+        self._index = open(base + INDEX_SUFFIX, "ab")
+        self._segment_started = started
+        self._described.clear()
+        logger.info(f"Recording feed to {base}{SEGMENT_SUFFIX}")
+
+    def _close_segment(self):
+        if self._segment is not None:
+            self._segment.close()
+            self._index.close()
+            self._segment = self._index = None
+
+
+class SegmentIndex:
+    """Memory-mapped view of a segment's (timestamp, offset) index."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self.count = size // INDEX_ENTRY.size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def entry(self, i: int) -> tuple[float, int]:
+        return INDEX_ENTRY.unpack_from(self._map, i * INDEX_ENTRY.size)
+
+    def bisect(self, timestamp: float) -> int:
+        """Position of the first record received at or after `timestamp`."""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.entry(mid)[0] < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+
+class FeedReader:
+    """Reads recorded payloads for a time range using the segment indexes."""
+
+    def __init__(self, directory: str | None = None):
+        self.directory = directory or Config.RECORDER_DIR
+
+    def segments(self) -> list[str]:
+        """Segment base paths, oldest first."""
+        names = sorted(
+            name[: -len(SEGMENT_SUFFIX)]
+            for name in os.listdir(self.directory)
+            if name.endswith(SEGMENT_SUFFIX)
+        )
+        return [os.path.join(self.directory, name) for name in names]
+
+    def read(self, start: float = 0.0, end: float = float("inf")) -> Iterator[dict]:
+        """Yield records received in [start, end], oldest first."""
+        for base in self.segments():
+            if not os.path.exists(base + INDEX_SUFFIX):
+                continue
+            index = SegmentIndex(base + INDEX_SUFFIX)
+            try:
+                if not len(index) or index.entry(len(index) - 1)[0] < start:
+                    continue
+                if index.entry(0)[0] > end:
+                    break
+                with open(base + SEGMENT_SUFFIX, "rb") as segment:
+                    for i in range(index.bisect(start), len(index)):
+                        timestamp, offset = index.entry(i)
+                        if timestamp > end:
+                            return
+                        next_offset = index.entry(i + 1)[1] if i + 1 < len(index) else None
+                        segment.seek(offset)
+                        member = segment.read(-1 if next_offset is None else next_offset - offset)
+                        yield _json_loads(gzip.decompress(member))
+            finally:
+                index.close()
@@ -0,0 +1,126 @@
+import logging
+import random
+import time
+from collections import deque
+
+from src.config import Config
+from src.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the circuit breaker is open."""
+
+
+class RetryBudget:
+    """Caps retries and hedges to a fraction of recent traffic.
+
+    Every first attempt deposits `ratio` of a token; every retry or hedge
+    spends a whole one. A small steady refill (`min_rate` per second) lets a
+    quiet client still retry occasionally. During an outage, when every
+    request fails, retries cannot multiply the load by more than 1 + ratio.
+    """
+
+    def __init__(self, ratio: float | None = None, min_rate: float | None = None):
+        self.ratio = Config.RETRY_BUDGET_RATIO if ratio is None else ratio
+        min_rate = Config.RETRY_BUDGET_MIN_RATE if min_rate is None else min_rate
+        self.bucket = TokenBucket(min_rate, max(1.0, min_rate * 10))
+        self.spent = 0
+        self.denied = 0
+
+    def deposit(self):
+        self.bucket.deposit(self.ratio)
+
+    def withdraw(self) -> bool:
+        """Spend a token on a retry or hedge. False if the budget is exhausted."""
+        if self.bucket.available() < 1:
+            self.denied += 1
+            return False
+        self.bucket.take()
+        self.spent += 1
+        return True
+
+
+class CircuitBreaker:
+    """Stops calling an endpoint after consecutive failures.
+
+    After `threshold` failures in a row the circuit opens and requests fail
+    fast for `reset_seconds`. Then a single probe is let through (half-open):
+    success closes the circuit, failure opens it again for another period.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, name: str, threshold: int | None = None, reset_seconds: float | None = None):
+        self.name = name
+        self.threshold = threshold or Config.CIRCUIT_FAILURE_THRESHOLD
+        self.reset_seconds = Config.CIRCUIT_RESET_SECONDS if reset_seconds is None else reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opens = 0
+        self._probing = False
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now."""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+            self.state = self.HALF_OPEN
+            logger.info(f"Circuit {self.name} half-open - sending a probe")
+        if self.state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.info(f"Circuit {self.name} closed - endpoint recovered")
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._probing = False
+        if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.threshold):
+            if self.state == self.CLOSED:
+                logger.warning(
+                    f"Circuit {self.name} open after {self.failures} failures - "
+                    f"pausing requests for {self.reset_seconds:g}s"
+                )
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self.opens += 1
+
+    def release(self):
+        """Give up a half-open probe that ended without a result (e.g. cancelled)."""
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.state != self.CLOSED
+
+
+class LatencyTracker:
+    """Recent request latencies, for choosing when to hedge."""
+
+    def __init__(self, size: int = 256):
+        self.samples: deque[float] = deque(maxlen=size)
+
+    def observe(self, seconds: float):
+        self.samples.append(seconds)
+
+    def quantile(self, q: float) -> float | None:
+        """The q-quantile of recent latencies, or None until there are enough samples."""
+        if len(self.samples) < Config.HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff before retry number `attempt` (1-based)."""
+    ceiling = min(Config.RETRY_MAX_BACKOFF_SECONDS, Config.RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+    return random.uniform(0, ceiling)
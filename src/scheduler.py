@@ -0,0 +1,156 @@
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict
+
+from src.config import Config
+from src.metrics import CYCLE_OVERRUNS
+from src.polymarket_client import Event
+from src.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _EventSchedule:
+    deadline: float
+    interval: float
+    activity: float = 0.0  # smoothed activity score, 0 = quiet
+    prices: Dict[str, float] | None = None
+    volume: float | None = None
+
+
+class PollScheduler:
+    """Decides when each event is polled next.
+
+    Every poll produces an activity score from the largest YES price move
+    (relative to the alert threshold), the relative change in event volume
+    and the number of alerts fired. The score is smoothed and mapped onto
+    [min_interval, max_interval]: quiet events drift towards the maximum,
+    busy ones towards the minimum, and an alert polls again at the minimum.
+    Deadlines advance from the previous deadline rather than from when the
+    work finished, so slow cycles do not accumulate drift. A token bucket
+    caps Gamma requests per minute across all events.
+    """
+
+    SMOOTHING = 0.5  # weight of the newest observation in the activity score
+
+    def __init__(
+        self,
+        slugs: list[str],
+        min_interval: float | None = None,
+        max_interval: float | None = None,
+        adaptive: bool | None = None,
+    ):
+        self.adaptive = Config.ADAPTIVE_POLLING if adaptive is None else adaptive
+        if self.adaptive:
+            self.min_interval = min_interval or Config.POLL_MIN_INTERVAL_SECONDS
+            self.max_interval = max_interval or Config.POLL_MAX_INTERVAL_SECONDS
+        else:
+            self.min_interval = self.max_interval = Config.POLL_INTERVAL_SECONDS
+        budget = Config.POLL_BUDGET_PER_MINUTE
+        self.budget = TokenBucket(budget / 60, budget)
+        self.floor = 0.0  # extra lower bound, e.g. while the price stream is live
+        now = time.monotonic()
+        self.events: Dict[str, _EventSchedule] = {
+            slug: _EventSchedule(deadline=now, interval=self.max_interval) for slug in slugs
+        }
+
+    def add(self, slug: str):
+        """Start polling an event, first poll due immediately."""
+        if slug not in self.events:
+            self.events[slug] = _EventSchedule(deadline=time.monotonic(), interval=self.max_interval)
+
+    def remove(self, slug: str):
+        """Stop polling an event."""
+        self.events.pop(slug, None)
+
+    def next_wakeup(self) -> float:
+        """Monotonic time at which the next event becomes due."""
+        if not self.events:
+            return time.monotonic() + self.max_interval
+        return min(schedule.deadline for schedule in self.events.values())
+
+    def due(self, now: float | None = None) -> list[str]:
+        """Slugs due for polling, most overdue first, within the request budget."""
+        now = time.monotonic() if now is None else now
+        due = sorted(
+            (slug for slug, schedule in self.events.items() if schedule.deadline <= now),
+            key=lambda slug: self.events[slug].deadline,
+        )
+        if not due:
+            return []
+
+        per_request = max(1, Config.SLUGS_PER_REQUEST)
+        allowed = int(self.budget.available()) * per_request
+        if allowed < len(due):
+            deferred = due[allowed:]
+            due = due[:allowed]
+            retry_at = now + max(self.budget.delay(), 1.0)
+            for slug in deferred:
+                self.events[slug].deadline = retry_at
+            logger.info(f"Request budget exhausted - deferred {len(deferred)} events")
+        if due:
+            self.budget.take(math.ceil(len(due) / per_request))
+        return due
+
+    def record(self, slug: str, event: Event | None, alerts: int, now: float | None = None):
+        """Update an event's schedule after it was polled.
+
+        `event` is None when the payload was unchanged since the last poll.
+        """
+        now = time.monotonic() if now is None else now
+        schedule = self.events.get(slug)
+        if schedule is None:
+            return
+
+        move = 0.0
+        volume_change = 0.0
+        if event is not None:
+            prices = {m.id: m.outcome_yes_price for m in event.markets}
+            if schedule.prices:
+                previous = schedule.prices
+                move = max(
+                    (abs(p - previous[mid]) for mid, p in prices.items() if mid in previous),
+                    default=0.0,
+                )
+            if schedule.volume:
+                volume_change = abs(event.volume - schedule.volume) / schedule.volume
+            schedule.prices, schedule.volume = prices, event.volume
+
+        score = (
+            move / Config.PRICE_CHANGE_THRESHOLD * Config.POLL_PRICE_SENSITIVITY
+            + volume_change * Config.POLL_VOLUME_SENSITIVITY
+        )
+        schedule.activity = self.SMOOTHING * score + (1 - self.SMOOTHING) * schedule.activity
+
+        if alerts:
+            interval = self.min_interval
+        else:
+            interval = self.max_interval / (1 + schedule.activity)
+        interval = max(self.floor, min(self.max_interval, max(self.min_interval, interval)))
+
+        # Advance from the missed deadline to avoid drift; if a whole interval
+        # was missed, restart from now instead of firing a burst of polls.
+        deadline = schedule.deadline + interval
+        if deadline <= now:
+            CYCLE_OVERRUNS.inc()
+            deadline = now + interval
+
+        if abs(interval - schedule.interval) > 0.1 * schedule.interval:
+            logger.info(
+                f"Poll interval for {slug}: {schedule.interval:.0f}s -> {interval:.0f}s "
+                f"(move {move:.1%}, volume {volume_change:+.1%}, alerts {alerts}, "
+                f"activity {schedule.activity:.2f})"
+            )
+        else:
+            logger.debug(f"Next poll for {slug} in {deadline - now:.1f}s")
+        schedule.interval = interval
+        schedule.deadline = deadline
+
+    def poll_all_now(self):
+        """Make every event due immediately (e.g. after the stream drops)."""
+        now = time.monotonic()
+        for schedule in self.events.values():
+            schedule.deadline = min(schedule.deadline, now)
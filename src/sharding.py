@@ -0,0 +1,340 @@
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import time
+from bisect import bisect
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection
+from typing import Callable
+
+from src.config import Config
+from src.detector import Alert
+from src.discovery import MarketDiscovery
+from src.dispatcher import AlertDispatcher
+from src.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Messages on the coordinator <-> worker pipe are (kind, payload) tuples.
+# Coordinator to worker: ("add", [slugs]), ("remove", [slugs]), ("stop", None)
+# Worker to coordinator: ("alerts", [Alert]), ("heartbeat", {stats})
+ShardTarget = Callable[[str, Connection], None]
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hash ring with virtual nodes.
+
+    Adding or removing a node only moves the keys that hash to its points,
+    so a worker crash reshuffles that worker's events and nothing else.
+    """
+
+    def __init__(self, nodes=(), vnodes: int | None = None):
+        self.vnodes = vnodes or Config.SHARD_VNODES
+        self.nodes: set[str] = set()
+        self._points: list[int] = []
+        self._owners: list[str] = []
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: str):
+        if node in self.nodes:
+            return
+        self.nodes.add(node)
+        points = list(zip(self._points, self._owners))
+        points.extend((_hash(f"{node}#{i}"), node) for i in range(self.vnodes))
+        self._set(points)
+
+    def remove(self, node: str):
+        if node not in self.nodes:
+            return
+        self.nodes.discard(node)
+        self._set([(point, owner) for point, owner in zip(self._points, self._owners) if owner != node])
+
+    def node_for(self, key: str) -> str | None:
+        if not self._points:
+            return None
+        i = bisect(self._points, _hash(key)) % len(self._points)
+        return self._owners[i]
+
+    def _set(self, points: list[tuple[int, str]]):
+        points.sort()
+        self._points = [point for point, _ in points]
+        self._owners = [owner for _, owner in points]
+
+
+@dataclass
+class _Shard:
+    name: str
+    process: multiprocessing.Process | None = None
+    conn: Connection | None = None
+    slugs: set[str] = field(default_factory=set)
+    last_heartbeat: float = 0.0
+    restart_at: float | None = None
+    stats: dict = field(default_factory=dict)
+
+    @property
+    def alive(self) -> bool:
+        return self.conn is not None
+
+
+class ShardCoordinator:
+    """Runs the poll -> parse -> detect pipeline in SHARD_WORKERS processes.
+
+    Event slugs are spread over the workers by consistent hashing. Workers
+    send their alerts back over a pipe; the coordinator drops repeats (same
+    Alert.dedup_key) within ALERT_COOLDOWN_SECONDS, since a market that moved
+    to another worker arrives there without its cooldown, and owns the alert
+    dispatcher. A worker that exits or misses heartbeats for
+    SHARD_HEARTBEAT_TIMEOUT_SECONDS is taken off the ring so its events move
+    to the survivors, and is restarted after SHARD_RESTART_SECONDS.
+    """
+
+    def __init__(
+        self,
+        target: ShardTarget,
+        slugs: list[str],
+        dispatcher: AlertDispatcher,
+        workers: int | None = None,
+        discovery: MarketDiscovery | None = None,
+    ):
+        self.target = target
+        self.dispatcher = dispatcher
+        self.discovery = discovery
+        self.slugs: dict[str, str | None] = dict.fromkeys(slugs)  # slug -> owning shard
+        self.ring = HashRing()
+        count = workers or Config.SHARD_WORKERS
+        self.shards = {name: _Shard(name) for name in (f"shard-{i}" for i in range(count))}
+        self.running = False
+        self._context = multiprocessing.get_context("spawn")
+        self._last_alert: dict[str, float] = {}  # dedup key -> monotonic time forwarded
+        self.alerts_received = 0
+        self.alerts_deduplicated = 0
+        self.events_moved = 0
+        self.restarts = 0
+        self.register_metrics()
+
+    def register_metrics(self):
+        REGISTRY.gauge(
+            "warometer_shard_workers_alive", "Shard worker processes currently on the ring",
+            lambda: sum(1 for shard in self.shards.values() if shard.alive),
+        )
+        REGISTRY.callback_counter(
+            "warometer_shard_restarts_total", "Shard workers restarted after exiting or going silent",
+            lambda: self.restarts,
+        )
+        REGISTRY.callback_counter(
+            "warometer_shard_events_moved_total", "Events reassigned between shard workers",
+            lambda: self.events_moved,
+        )
+        REGISTRY.callback_counter(
+            "warometer_shard_alerts_received_total", "Alerts received from shard workers",
+            lambda: self.alerts_received,
+        )
+        REGISTRY.callback_counter(
+            "warometer_shard_alerts_deduplicated_total", "Alerts dropped as repeats of one already sent",
+            lambda: self.alerts_deduplicated,
+        )
+        REGISTRY.gauge(
+            "warometer_markets_tracked", "Markets with price history across all shard workers",
+            lambda: sum(shard.stats.get("markets", 0) for shard in self.shards.values() if shard.alive),
+        )
+
+    def add(self, slug: str):
+        """Start monitoring an event on whichever shard it hashes to."""
+        if slug not in self.slugs:
+            self.slugs[slug] = None
+            self.rebalance()
+
+    def remove(self, slug: str):
+        """Stop monitoring an event."""
+        owner = self.slugs.pop(slug, None)
+        if owner:
+            shard = self.shards[owner]
+            shard.slugs.discard(slug)
+            self._send(shard, "remove", [slug])
+
+    def rebalance(self) -> int:
+        """Move every event to the shard the ring assigns it. Returns events moved."""
+        adds: dict[str, list[str]] = {}
+        removes: dict[str, list[str]] = {}
+        moved = 0
+        for slug, owner in self.slugs.items():
+            target = self.ring.node_for(slug)
+            if target == owner:
+                continue
+            if owner and self.shards[owner].alive:
+                removes.setdefault(owner, []).append(slug)
+                self.shards[owner].slugs.discard(slug)
+            if owner:
+                moved += 1
+            if target:
+                adds.setdefault(target, []).append(slug)
+                self.shards[target].slugs.add(slug)
+            self.slugs[slug] = target
+
+        for name, slugs in removes.items():
+            self._send(self.shards[name], "remove", slugs)
+        for name, slugs in adds.items():
+            self._send(self.shards[name], "add", slugs)
+        self.events_moved += moved
+        return moved
+
+    def handle_alerts(self, shard: _Shard, alerts: list[Alert]):
+        """Drop repeats and queue the rest for the alert sinks."""
+        now = time.monotonic()
+        messages = []
+        forwarded = []
+        repeats = 0
+        for alert in alerts:
+            key = alert.dedup_key
+            last = self._last_alert.get(key)
+            if last is not None and now - last < Config.ALERT_COOLDOWN_SECONDS:
+                repeats += 1
+                continue
+            self._last_alert[key] = now
+            message = alert.format_message()
+            logger.warning(f"Alert triggered ({shard.name}): {message}")
+            messages.append(message)
+            forwarded.append(alert)
+        self.alerts_received += len(alerts)
+        self.alerts_deduplicated += repeats
+        if repeats:
+            logger.info(f"Dropped {repeats} repeat alerts from {shard.name}")
+        if messages:
+            self.dispatcher.submit(messages, alerts=forwarded)
+
+    async def run(self):
+        """Start the workers and supervise them until stopped."""
+        self.running = True
+        for shard in self.shards.values():
+            self._spawn(shard)
+        self.rebalance()
+        logger.info(f"Started {len(self.shards)} shard workers for {len(self.slugs)} events")
+
+        discovery_task = asyncio.create_task(self.discovery_loop()) if self.discovery else None
+        try:
+            while self.running:
+                await asyncio.sleep(1)
+                self.supervise()
+        finally:
+            if discovery_task:
+                discovery_task.cancel()
+            await self.shutdown()
+
+    def supervise(self, now: float | None = None):
+        """Replace dead or silent workers and restart them when due."""
+        now = time.monotonic() if now is None else now
+        lost = False
+        for shard in self.shards.values():
+            if shard.alive:
+                if not shard.process.is_alive():
+                    self._lose(shard, f"exited with code {shard.process.exitcode}", now)
+                    lost = True
+                elif now - shard.last_heartbeat > Config.SHARD_HEARTBEAT_TIMEOUT_SECONDS:
+                    self._lose(shard, "stopped sending heartbeats", now)
+                    lost = True
+            elif shard.restart_at is not None and now >= shard.restart_at:
+                logger.info(f"Restarting {shard.name}")
+                self.restarts += 1
+                self._spawn(shard)
+                self.rebalance()
+        if lost:
+            moved = self.rebalance()
+            logger.warning(f"Moved {moved} events to the remaining {len(self.ring.nodes)} shard workers")
+
+        cutoff = now - Config.ALERT_COOLDOWN_SECONDS
+        self._last_alert = {key: t for key, t in self._last_alert.items() if t > cutoff}
+
+    async def discovery_loop(self):
+        """Refresh discovered events and spread them over the shards."""
+        while self.running:
+            try:
+                added, retired = await self.discovery.refresh()
+                for slug in added:
+                    logger.info(f"Discovered event: {slug} ({self.discovery.discovered[slug]})")
+                    self.add(slug)
+                for slug in retired:
+                    logger.info(f"Discovered event no longer listed: {slug}")
+                    self.remove(slug)
+            except Exception as e:
+                logger.error(f"Market discovery failed: {e}")
+            await asyncio.sleep(Config.DISCOVERY_INTERVAL_SECONDS)
+
+    async def shutdown(self, timeout: float = 10.0):
+        """Ask every worker to stop, then terminate any that do not."""
+        live = [shard for shard in self.shards.values() if shard.alive]
+        for shard in live:
+            self._send(shard, "stop", None)
+        deadline = time.monotonic() + timeout
+        for shard in live:
+            await asyncio.to_thread(shard.process.join, max(0.0, deadline - time.monotonic()))
+            if shard.process.is_alive():
+                logger.warning(f"{shard.name} did not stop in time - terminating")
+                shard.process.terminate()
+            self._detach(shard)
+
+    def stop(self):
+        self.running = False
+
+    def _spawn(self, shard: _Shard):
+        parent, child = self._context.Pipe()
+        process = self._context.Process(
+            target=self.target, args=(shard.name, child), name=f"war-o-meter-{shard.name}", daemon=True
+        )
+        process.start()
+        child.close()
+        shard.process = process
+        shard.conn = parent
+        shard.last_heartbeat = time.monotonic()  # grace period while the worker starts
+        shard.restart_at = None
+        asyncio.get_running_loop().add_reader(parent.fileno(), self._on_readable, shard)
+        self.ring.add(shard.name)
+
+    def _lose(self, shard: _Shard, reason: str, now: float):
+        logger.error(f"{shard.name} {reason} - rebalancing its {len(shard.slugs)} events")
+        if shard.process.is_alive():
+            shard.process.kill()
+        self._detach(shard)
+        self.ring.remove(shard.name)
+        shard.slugs.clear()
+        shard.restart_at = now + Config.SHARD_RESTART_SECONDS
+
+    def _detach(self, shard: _Shard):
+        if shard.conn is None:
+            return
+        self._detach_reader(shard)
+        shard.conn.close()
+        shard.conn = None
+        shard.stats = {}
+
+    def _on_readable(self, shard: _Shard):
+        try:
+            while shard.conn is not None and shard.conn.poll():
+                kind, payload = shard.conn.recv()
+                if kind == "alerts":
+                    self.handle_alerts(shard, payload)
+                elif kind == "heartbeat":
+                    shard.last_heartbeat = time.monotonic()
+                    shard.stats = payload
+        except (EOFError, OSError):
+            # The worker is gone; supervise() notices the exit and rebalances
+            self._detach_reader(shard)
+
+    def _detach_reader(self, shard: _Shard):
+        try:
+            asyncio.get_running_loop().remove_reader(shard.conn.fileno())
+        except (RuntimeError, OSError, ValueError):
+            pass
+
+    def _send(self, shard: _Shard, kind: str, payload):
+        if shard.conn is None:
+            return
+        try:
+            shard.conn.send((kind, payload))
+        except (BrokenPipeError, OSError) as e:
+            logger.error(f"Failed to reach {shard.name}: {e}")
@@ -0,0 +1,242 @@
+import asyncio
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from functools import cached_property
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+import httpx
+
+from src.config import Config
+from src.metrics import SINK_DELIVERY_SECONDS, TELEGRAM_FLOOD_WAITS, TELEGRAM_SEND_ERRORS, TELEGRAM_SEND_SECONDS
+from src.rate_limit import TokenBucket
+from src.resilience import backoff_delay
+from src.telegram_client import TelegramAlertClient
+
+if TYPE_CHECKING:
+    from src.detector import Alert
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class Outgoing:
+    """A rendered message, shared by every sink it is queued on."""
+
+    text: str
+    chat_id: str | None = None  # for a command reply: the chat that asked
+    alert: "Alert | None" = None  # the alert the text was formatted from
+    created: float = field(default_factory=time.monotonic)
+    timestamp: datetime = field(default_factory=datetime.utcnow)
+
+    @cached_property
+    def json(self) -> bytes:
+        """The JSON body for webhook and file sinks, encoded on first use.
+
+        For an alert, its fields (market_id, prices, change_percent,
+        window_seconds, ...) sit next to the text.
+        """
+        body = {"text": self.text, "timestamp": self.timestamp.isoformat()}
+        if self.alert is not None:
+            fields = asdict(self.alert)
+            del fields["timestamp"]
+            body.update(fields)
+        return json.dumps(body).encode()
+
+
+class AlertSink(ABC):
+    """One alert destination with its own queue, delivery task and retry state.
+
+    Subclasses implement send(). A message that fails is retried up to
+    DISPATCH_MAX_RETRIES times with jittered backoff (retry_delay() decides
+    how long, or to give up); meanwhile only this sink's queue waits. When
+    the queue is full the oldest message is dropped.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.queue: asyncio.Queue[Outgoing] = asyncio.Queue(maxsize=Config.DISPATCH_QUEUE_SIZE)
+        self.latency = SINK_DELIVERY_SECONDS.labels(name)
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._drain())
+
+    def put(self, outgoing: Outgoing):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.queue.task_done()
+            self.dropped += 1
+            logger.warning(f"Queue for {self.name} full - dropped oldest message")
+        self.queue.put_nowait(outgoing)
+
+    async def close(self, timeout: float):
+        """Give queued messages up to `timeout` seconds to go out, then stop."""
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(self.queue.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"{self.name} closing with {self.queue.qsize()} unsent messages")
+            self._task.cancel()
+            self._task = None
+        await self.aclose()
+
+    async def _drain(self):
+        while True:
+            outgoing = await self.queue.get()
+            try:
+                await self._deliver(outgoing)
+            finally:
+                self.queue.task_done()
+
+    async def _deliver(self, outgoing: Outgoing):
+        for attempt in range(1, Config.DISPATCH_MAX_RETRIES + 2):
+            await self.wait_turn()
+            try:
+                await self.send(outgoing)
+            except Exception as e:
+                delay = self.retry_delay(e, attempt) if attempt <= Config.DISPATCH_MAX_RETRIES else None
+                if delay is None:
+                    logger.error(f"Failed to deliver alert to {self.name}: {e}")
+                    break
+                logger.warning(f"Delivery to {self.name} failed ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+            self.sent += 1
+            self.latency.observe(time.monotonic() - outgoing.created)
+            return
+        self.failed += 1
+
+    async def wait_turn(self):
+        """Wait until this sink may send again (rate limits)."""
+
+    @abstractmethod
+    async def send(self, outgoing: Outgoing):
+        """Deliver one message; raise to have it retried or given up on."""
+
+    def retry_delay(self, error: Exception, attempt: int) -> float | None:
+        """Seconds to wait before retrying after `error`, or None to give up."""
+        return backoff_delay(attempt)
+
+    async def aclose(self):
+        """Release connections or files held by the sink."""
+
+
+class TelegramSink(AlertSink):
+    """A Telegram chat or channel, rate limited per chat and across all chats.
+
+    Without a chat_id it is the shared reply sink: each message goes to its
+    own Outgoing.chat_id and only the global limit applies, since command
+    replies are already limited per chat by the command bot.
+    """
+
+    def __init__(self, telegram: TelegramAlertClient, chat_id: str | None, global_bucket: TokenBucket):
+        super().__init__(f"telegram:{chat_id or 'replies'}")
+        self.telegram = telegram
+        self.chat_id = chat_id
+        self.global_bucket = global_bucket
+        self.buckets = [global_bucket]
+        if chat_id:
+            self.buckets.append(TokenBucket(Config.TELEGRAM_CHAT_RATE, Config.TELEGRAM_CHAT_BURST))
+
+    async def wait_turn(self):
+        delay = max(bucket.delay() for bucket in self.buckets)
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = max(bucket.delay() for bucket in self.buckets)
+        for bucket in self.buckets:
+            bucket.take()
+
+    async def send(self, outgoing: Outgoing):
+        chat_id = outgoing.chat_id or self.chat_id
+        with TELEGRAM_SEND_SECONDS.time():
+            await self.telegram.send_message(outgoing.text, chat_id=chat_id)
+        logger.info(f"Alert sent to chat {chat_id}")
+
+    def retry_delay(self, error: Exception, attempt: int) -> float | None:
+        from telegram.error import NetworkError, RetryAfter  # imported already, with the Bot
+
+        if isinstance(error, RetryAfter):
+            # python-telegram-bot raises RetryAfter when the Bot API answers 429;
+            # retry_after is the parameters.retry_after value from that reply
+            TELEGRAM_FLOOD_WAITS.inc()
+            retry_after = error.retry_after
+            if isinstance(retry_after, timedelta):
+                retry_after = retry_after.total_seconds()
+            # The flood limit is per bot, so every chat's sink holds off, not just this one
+            self.global_bucket.pause(float(retry_after))
+            return float(retry_after)
+        TELEGRAM_SEND_ERRORS.inc()
+        return super().retry_delay(error, attempt) if isinstance(error, NetworkError) else None
+
+
+class WebhookSink(AlertSink):
+    """POSTs each alert as JSON to a URL. Client errors (4xx) are not retried.
+
+    Named by its position in ALERT_WEBHOOK_URLS and its host, so webhooks on
+    one host get their own metrics without secrets in the path leaking into
+    metric labels.
+    """
+
+    def __init__(self, url: str, index: int = 1):
+        host = urlparse(url).netloc.rpartition("@")[2]
+        super().__init__(f"webhook:{index}:{host}")
+        self.url = url
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(Config.HTTP_READ_TIMEOUT, connect=Config.HTTP_CONNECT_TIMEOUT)
+        )
+
+    async def send(self, outgoing: Outgoing):
+        response = await self.client.post(
+            self.url, content=outgoing.json, headers={"Content-Type": "application/json"}
+        )
+        if response.status_code >= 400:
+            raise httpx.HTTPStatusError(
+                f"HTTP {response.status_code}", request=response.request, response=response
+            )
+
+    def retry_delay(self, error: Exception, attempt: int) -> float | None:
+        if isinstance(error, httpx.HTTPStatusError):
+            status = error.response.status_code
+            if status < 500 and status != 429:
+                return None
+        return super().retry_delay(error, attempt)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+class FileSink(AlertSink):
+    """Appends each alert as a JSON line to a local file."""
+
+    def __init__(self, path: str):
+        super().__init__(f"file:{path}")
+        self.path = path
+
+    async def send(self, outgoing: Outgoing):
+        await asyncio.to_thread(self._append, outgoing.json)
+
+    def _append(self, line: bytes):
+        with open(self.path, "ab") as f:
+            f.write(line + b"\n")
+
+
+def create_sinks(telegram: TelegramAlertClient, global_bucket: TokenBucket) -> list[AlertSink]:
+    """Create a sink for every configured destination."""
+    sinks: list[AlertSink] = []
+    if telegram.token:
+        for chat_id in dict.fromkeys([telegram.chat_id, *Config.TELEGRAM_EXTRA_CHAT_IDS]):
+            if chat_id:
+                sinks.append(TelegramSink(telegram, chat_id, global_bucket))
+    sinks.extend(WebhookSink(url, i) for i, url in enumerate(Config.ALERT_WEBHOOK_URLS, 1))
+    if Config.ALERT_FILE_PATH:
+        sinks.append(FileSink(Config.ALERT_FILE_PATH))
+    return sinks
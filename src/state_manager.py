@@ -0,0 +1,234 @@
+import asyncio
+import logging
+import mmap
+import shelve
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from src.config import Config
+from src.delta import DeltaEngine, MarketChange
+from src.detector import IrregularityDetector
+from src.polymarket_client import AsyncPolymarketClient, Market
+from src.price_stream import PriceStream
+from src.state_store import StateStore
+
+logger = logging.getLogger(__name__)
+
+
+def resident_bytes() -> int | None:
+    """Resident set size of this process, where the platform exposes it."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * mmap.PAGESIZE
+
+
+class StateManager:
+    """Keeps per-market state bounded in a long-running monitor.
+
+    Markets are ordered by when they were last seen in a poll. A sweep
+    evicts markets that have been closed for STATE_CLOSED_TTL_SECONDS, that
+    have not been seen for STATE_MARKET_TTL_SECONDS, and the least recently
+    seen beyond STATE_MAX_MARKETS. Eviction frees the market's detector
+    row, history and cooldown, its last-seen value in the delta stage, the
+    client's cached parse, its stream subscription and its row in the state
+    store. Markets restored from the store count as last seen when they were
+    last saved. With STATE_SPILL_PATH set, evicted detector state is written
+    to a shelve file and restored if the market shows up again: the delta
+    stage queues reappearing markets and revive_queued() reads them back in
+    a worker thread before detection runs, so a spill in progress never
+    stalls the event loop.
+    """
+
+    def __init__(
+        self,
+        detector: IrregularityDetector,
+        delta: DeltaEngine,
+        client: AsyncPolymarketClient,
+        stream: PriceStream | None = None,
+        spill_path: str | None = None,
+        store: StateStore | None = None,
+    ):
+        self.detector = detector
+        self.delta = delta
+        self.client = client
+        self.stream = stream
+        self.store = store
+        self.ttl = Config.STATE_MARKET_TTL_SECONDS
+        self.closed_ttl = Config.STATE_CLOSED_TTL_SECONDS
+        self.capacity = Config.STATE_MAX_MARKETS
+        self.spill_path = Config.STATE_SPILL_PATH if spill_path is None else spill_path
+        self._last_seen: OrderedDict[str, float] = OrderedDict()  # least recently seen first
+        self._closed_since: dict[str, float] = {}
+        self._last_sweep = time.monotonic()
+        self._shelf = None
+        self._lock = threading.Lock()  # spills and revivals run in worker threads
+        self._revive_queue: list[str] = []
+        self.evicted = 0
+        self.revived = 0
+
+    def touch(self, market_ids, now: float | None = None):
+        """Mark markets as seen, e.g. when their event was polled unchanged."""
+        now = time.monotonic() if now is None else now
+        last_seen = self._last_seen
+        for market_id in market_ids:
+            last_seen[market_id] = now
+            last_seen.move_to_end(market_id)
+
+    def observe(self, markets: list[Market], now: float | None = None):
+        """Mark polled markets as seen and note which have closed."""
+        now = time.monotonic() if now is None else now
+        tracked = self.detector.price_history
+        for market in markets:
+            if market.closed:
+                if market.id not in tracked:
+                    continue  # already evicted, or closed before it was ever tracked
+                self._closed_since.setdefault(market.id, now)
+            else:
+                self._closed_since.pop(market.id, None)
+            self._last_seen[market.id] = now
+            self._last_seen.move_to_end(market.id)
+
+    def retire(self, market_ids):
+        """Evict markets at the next sweep, e.g. when their event is dropped."""
+        for market_id in market_ids:
+            self._closed_since[market_id] = float("-inf")
+
+    def observe_changes(self, changes: list[MarketChange], now: datetime):
+        """Delta subscriber: queue markets that reappear for revive_queued()."""
+        self.touch(change.market_id for change in changes)
+        if not self.spill_path:
+            return
+        for change in changes:
+            if change.old_yes_price is None and change.market_id not in self.detector.price_history:
+                self._revive_queue.append(change.market_id)
+
+    def sweep_due(self, now: float | None = None) -> bool:
+        now = time.monotonic() if now is None else now
+        return now - self._last_sweep >= Config.STATE_SWEEP_SECONDS
+
+    def sweep(self, now: float | None = None) -> list[tuple[str, tuple]]:
+        """Evict closed, expired and excess markets.
+
+        Returns (market_id, state) for each evicted market that had detector
+        state, for spill().
+        """
+        now = time.monotonic() if now is None else now
+        self._last_sweep = now
+        # Markets restored from the state store were last seen when last saved;
+        # they are older than anything polled since, so they go to the front
+        wall_now = datetime.utcnow()
+        restored = [
+            (now - max(0.0, (wall_now - snapshot.timestamp).total_seconds()), market_id)
+            for market_id, snapshot in self.detector.price_history.items()
+            if market_id not in self._last_seen
+        ]
+        for seen, market_id in sorted(restored, reverse=True):
+            self._last_seen[market_id] = seen
+            self._last_seen.move_to_end(market_id, last=False)
+
+        victims: dict[str, str] = {}
+        for market_id, since in self._closed_since.items():
+            if now - since >= self.closed_ttl:
+                victims[market_id] = "closed"
+        for market_id, seen in self._last_seen.items():
+            if now - seen < self.ttl:
+                break
+            victims.setdefault(market_id, "unseen")
+        excess = len(self._last_seen) - len(victims) - self.capacity
+        if excess > 0:
+            for market_id in self._last_seen:
+                if excess <= 0:
+                    break
+                if market_id not in victims:
+                    victims[market_id] = "capacity"
+                    excess -= 1
+
+        evicted = []
+        for market_id in victims:
+            state = self._evict(market_id)
+            if state is not None:
+                evicted.append((market_id, state))
+        if victims:
+            self.evicted += len(victims)
+            reasons = {}
+            for reason in victims.values():
+                reasons[reason] = reasons.get(reason, 0) + 1
+            logger.info(
+                f"Evicted {len(victims)} markets ({', '.join(f'{n} {r}' for r, n in reasons.items())}); "
+                f"{len(self._last_seen)} tracked"
+            )
+        return evicted
+
+    def spill(self, evicted: list[tuple[str, tuple]]):
+        """Write evicted detector state to the spill file (blocking)."""
+        if not self.spill_path or not evicted:
+            return
+        with self._lock:
+            shelf = self._open_shelf()
+            for market_id, state in evicted:
+                shelf[market_id] = state
+            shelf.sync()
+
+    async def revive_queued(self) -> int:
+        """Restore queued markets that were spilled. Returns how many were found."""
+        if not self._revive_queue:
+            return 0
+        market_ids, self._revive_queue = self._revive_queue, []
+        spilled = await asyncio.to_thread(self._take_spilled, market_ids)
+        for market_id, (snapshot, samples, last_alert) in spilled.items():
+            self.detector.restore(
+                {market_id: snapshot},
+                {market_id: samples},
+                {market_id: last_alert} if last_alert else {},
+            )
+            logger.debug(f"Restored spilled state for market {market_id}")
+        self.revived += len(spilled)
+        return len(spilled)
+
+    def _take_spilled(self, market_ids: list[str]) -> dict[str, tuple]:
+        """Remove and return the spilled state of `market_ids` (blocking)."""
+        with self._lock:
+            shelf = self._open_shelf()
+            spilled = {market_id: shelf.pop(market_id, None) for market_id in market_ids}
+        return {market_id: state for market_id, state in spilled.items() if state is not None}
+
+    def memory_estimate(self) -> dict:
+        """Approximate bytes held per component, plus process RSS."""
+        estimate = {
+            "detector": self.detector.memory_bytes(),
+            "delta": self.delta.memory_bytes(),
+            "parse_cache": self.client.parse_cache_bytes(),
+        }
+        estimate["total"] = sum(estimate.values())
+        estimate["resident"] = resident_bytes()
+        return estimate
+
+    def close(self):
+        with self._lock:
+            if self._shelf is not None:
+                self._shelf.close()
+                self._shelf = None
+
+    def __len__(self) -> int:
+        return len(self._last_seen)
+
+    def _evict(self, market_id: str) -> tuple | None:
+        self._last_seen.pop(market_id, None)
+        self._closed_since.pop(market_id, None)
+        self.delta.forget([market_id])
+        self.client.forget_markets([market_id])
+        if self.stream:
+            self.stream.untrack([market_id])
+        if self.store:
+            self.store.forget([market_id])  # deleted with the next save
+        return self.detector.forget(market_id)
+
+    def _open_shelf(self):
+        if self._shelf is None:
+            self._shelf = shelve.open(self.spill_path)
+        return self._shelf
@@ -0,0 +1,203 @@
+import logging
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+
+from src.config import Config
+from src.detector import EPOCH, MICROSECOND, Alert, IrregularityDetector, PriceSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+def _to_us(when: datetime) -> int:
+    return (when - EPOCH) // MICROSECOND
+
+
+def _from_us(us: int) -> datetime:
+    return EPOCH + timedelta(microseconds=us)
+
+
+class StateStore(ABC):
+    """Persists detector state so a restart resumes where it left off."""
+
+    @abstractmethod
+    def load(self, detector: IrregularityDetector) -> None:
+        """Restore the detector from stored state."""
+
+    @abstractmethod
+    def save(self, snapshots: list[PriceSnapshot], alerts: list[Alert]) -> None:
+        """Append one cycle of snapshots and alerts."""
+
+    def forget(self, market_ids) -> None:
+        """Drop stored state for evicted markets so a restart does not bring them back."""
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteStateStore(StateStore):
+    """SQLite state store in WAL mode.
+
+    Each cycle is written in a single transaction: snapshots are appended,
+    the latest price per market is upserted and alerts are recorded. Loading
+    reads the latest row per market plus the samples still inside the
+    longest detection window, so startup cost does not depend on how much
+    history has accumulated. Markets evicted from memory are deleted with the
+    next write, and markets not updated for STATE_MARKET_TTL_SECONDS are
+    neither loaded nor kept.
+    """
+
+    PRUNE_EVERY = 100  # saves between retention sweeps
+
+    def __init__(self, path: str | None = None, retention_seconds: int | None = None):
+        self.path = path or Config.STATE_DB_PATH
+        self.retention = timedelta(seconds=retention_seconds or Config.STATE_RETENTION_SECONDS)
+        self.market_ttl = timedelta(seconds=Config.STATE_MARKET_TTL_SECONDS)
+        self._lock = threading.Lock()
+        self._forget_lock = threading.Lock()  # forget() runs on the event loop, save() in a thread
+        self._forgotten: set[str] = set()
+        self._saves = 0
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS markets (
+                market_id TEXT PRIMARY KEY,
+                question TEXT NOT NULL,
+                yes_price REAL NOT NULL,
+                no_price REAL NOT NULL,
+                updated_us INTEGER NOT NULL,
+                last_alert_us INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS snapshots (
+                market_id TEXT NOT NULL,
+                ts_us INTEGER NOT NULL,
+                yes_price REAL NOT NULL,
+                no_price REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS snapshots_ts ON snapshots (ts_us);
+            CREATE TABLE IF NOT EXISTS alerts (
+                market_id TEXT NOT NULL,
+                ts_us INTEGER NOT NULL,
+                alert_type TEXT NOT NULL,
+                old_price REAL NOT NULL,
+                new_price REAL NOT NULL,
+                change_percent REAL NOT NULL,
+                window_seconds REAL
+            );
+            """
+        )
+
+    def load(self, detector: IrregularityDetector) -> None:
+        """Restore the detector from stored state."""
+        with self._lock:
+            markets = self.conn.execute(
+                """
+                SELECT market_id, question, yes_price, no_price, updated_us, last_alert_us
+                FROM markets WHERE updated_us >= ?
+                """,
+                (_to_us(datetime.utcnow() - self.market_ttl),),
+            ).fetchall()
+            since_us = _to_us(datetime.utcnow()) - int(max(detector.windows, default=0) * 1e6)
+            samples = self.conn.execute(
+                "SELECT market_id, ts_us, yes_price FROM snapshots WHERE ts_us >= ? ORDER BY ts_us",
+                (since_us,),
+            ).fetchall()
+
+        snapshots = {}
+        last_alerts = {}
+        for market_id, question, yes_price, no_price, updated_us, last_alert_us in markets:
+            snapshots[market_id] = PriceSnapshot(
+                market_id=market_id,
+                question=question,
+                yes_price=yes_price,
+                no_price=no_price,
+                timestamp=_from_us(updated_us),
+            )
+            if last_alert_us is not None:
+                last_alerts[market_id] = _from_us(last_alert_us)
+
+        history: dict[str, list[tuple[float, float]]] = {}
+        for market_id, ts_us, yes_price in samples:
+            history.setdefault(market_id, []).append((ts_us / 1e6, yes_price))
+
+        detector.restore(snapshots, history, last_alerts)
+        logger.info(
+            f"Restored {len(snapshots)} markets, {len(samples)} samples "
+            f"and {len(last_alerts)} cooldowns from {self.path}"
+        )
+
+    def save(self, snapshots: list[PriceSnapshot], alerts: list[Alert]) -> None:
+        """Append one cycle of snapshots and alerts in a single transaction."""
+        with self._forget_lock:
+            forgotten, self._forgotten = self._forgotten, set()
+        if not snapshots and not alerts and not forgotten:
+            return
+
+        with self._lock, self.conn:
+            # Deletes go first: a market evicted and seen again since is re-inserted below
+            self.conn.executemany(
+                "DELETE FROM markets WHERE market_id = ?", [(market_id,) for market_id in forgotten]
+            )
+            self.conn.executemany(
+                "INSERT INTO snapshots (market_id, ts_us, yes_price, no_price) VALUES (?, ?, ?, ?)",
+                [(s.market_id, _to_us(s.timestamp), s.yes_price, s.no_price) for s in snapshots],
+            )
+            self.conn.executemany(
+                """
+                INSERT INTO markets (market_id, question, yes_price, no_price, updated_us)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (market_id) DO UPDATE SET
+                    question = excluded.question,
+                    yes_price = excluded.yes_price,
+                    no_price = excluded.no_price,
+                    updated_us = excluded.updated_us
+                """,
+                [
+                    (s.market_id, s.question, s.yes_price, s.no_price, _to_us(s.timestamp))
+                    for s in snapshots
+                ],
+            )
+            self.conn.executemany(
+                """
+                INSERT INTO alerts (market_id, ts_us, alert_type, old_price, new_price,
+                                    change_percent, window_seconds)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (a.market_id, _to_us(a.timestamp), a.alert_type, a.old_price, a.new_price,
+                     a.change_percent, a.window_seconds)
+                    for a in alerts
+                ],
+            )
+            self.conn.executemany(
+                "UPDATE markets SET last_alert_us = ? WHERE market_id = ?",
+                [(_to_us(a.timestamp), a.market_id) for a in alerts],
+            )
+
+            self._saves += 1
+            if self._saves % self.PRUNE_EVERY == 0:
+                cutoff = _to_us(datetime.utcnow() - self.retention)
+                self.conn.execute("DELETE FROM snapshots WHERE ts_us < ?", (cutoff,))
+                stale = _to_us(datetime.utcnow() - self.market_ttl)
+                self.conn.execute("DELETE FROM markets WHERE updated_us < ?", (stale,))
+
+    def forget(self, market_ids) -> None:
+        """Queue evicted markets for deletion with the next save()."""
+        with self._forget_lock:
+            self._forgotten.update(market_ids)
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+
+def create_state_store() -> StateStore | None:
+    """Create the configured state store, or None if persistence is disabled."""
+    if Config.STATE_BACKEND == "sqlite":
+        return SQLiteStateStore()
+    if Config.STATE_BACKEND not in ("", "none"):
+        raise ValueError(f"Unknown STATE_BACKEND: {Config.STATE_BACKEND}")
+    return None
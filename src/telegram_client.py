@@ -1,28 +1,44 @@
 import asyncio
 import logging
-
-from telegram import Bot
-from telegram.constants import ParseMode
+from typing import TYPE_CHECKING
 
 from src.config import Config
 
+if TYPE_CHECKING:
+    from telegram import Bot
+
 logger = logging.getLogger(__name__)
 
 
 class TelegramAlertClient:
+    """Sends messages through the Telegram Bot API.
+
+    python-telegram-bot is imported when the bot is first used, so runs
+    that never send anything don't pay for loading it.
+    """
+
     def __init__(self, token: str | None = None, chat_id: str | None = None):
         self.token = token or Config.TELEGRAM_BOT_TOKEN
         self.chat_id = chat_id or Config.TELEGRAM_CHAT_ID
-        self._bot: Bot | None = None
+        self._bot: "Bot | None" = None
 
     @property
-    def bot(self) -> Bot:
+    def bot(self) -> "Bot":
         if self._bot is None:
             if not self.token:
                 raise ValueError("TELEGRAM_BOT_TOKEN is not configured")
-            self._bot = Bot(token=self.token)
+            from telegram import Bot
+
+            self._bot = Bot(token=self.token, base_url=Config.TELEGRAM_API_BASE_URL)
         return self._bot
 
+    async def send_message(self, text: str, chat_id: str | None = None) -> None:
+        """Send a plain text message, raising on failure."""
+        chat_id = chat_id or self.chat_id
+        if not chat_id:
+            raise ValueError("TELEGRAM_CHAT_ID is not configured")
+        await self.bot.send_message(chat_id=chat_id, text=text)
+
     async def send_alert(self, message: str) -> bool:
         """Send an alert message to the configured Telegram chat."""
         if not self.chat_id:
@@ -33,7 +49,7 @@ class TelegramAlertClient:
             await self.bot.send_message(
                 chat_id=self.chat_id,
                 text=message,
-                parse_mode=ParseMode.MARKDOWN_V2,
+                parse_mode="MarkdownV2",
             )
             logger.info(f"Alert sent to chat {self.chat_id}")
             return True
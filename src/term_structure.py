@@ -0,0 +1,259 @@
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from src.config import Config
+from src.delta import MarketChange
+from src.detector import Alert
+from src.polymarket_client import Event, Market
+
+logger = logging.getLogger(__name__)
+
+DATE_SEPARATORS = (" by ", " before ")
+
+
+def _split_question(question: str) -> tuple[str, str] | None:
+    """Split 'US strikes Iran by March 31?' into ('US strikes Iran', 'by March 31')."""
+    text = question.rstrip(" ?")
+    lowered = text.lower()
+    for separator in DATE_SEPARATORS:
+        i = lowered.rfind(separator)
+        if i > 0:
+            return text[:i], text[i + 1:]
+    return None
+
+
+@dataclass
+class LadderAlert(Alert):
+    """One alert for a move across a date ladder, or a ladder out of order.
+
+    The Alert fields describe the rung that moved most (for a violation,
+    the earlier-dated rung), so code that handles plain alerts still works.
+    """
+
+    title: str = ""
+    ladder: str = ""  # "<event slug>:<question stem>"
+    kind: str = "move"  # "shift" (most rungs, one direction), "move" or "violation"
+    rungs: list[tuple[str, float | None, float]] = field(default_factory=list)  # (label, old, new)
+    # For a violation each rung is (label pair, earlier-dated price, later-dated price)
+    rungs_moved: int = 0
+
+    @property
+    def dedup_key(self) -> str:
+        # A move and a violation on the same ladder are different alerts, as are
+        # moves in opposite directions and violations between different dates
+        if self.kind == "violation":
+            pairs = ",".join(label for label, _, _ in self.rungs)
+            return f"ladder:{self.ladder}:violation:{pairs}"
+        return f"ladder:{self.ladder}:{self.kind}:{self.alert_type}"
+
+    def format_message(self) -> str:
+        """Format the alert as a human-readable message."""
+        lines = []
+        if self.kind == "violation":
+            header = "⚠️ ALERT: Date ladder out of order"
+            for label, earlier, later in self.rungs:
+                lines.append(f"  {label}: {earlier:.1%} > {later:.1%}")
+            summary = "An earlier date is priced above a later one"
+        else:
+            direction = "UP" if self.alert_type == "spike" else "DOWN"
+            emoji = "🚨" if abs(self.change_percent) > 0.10 else "⚠️"
+            header = f"{emoji} ALERT: Curve {direction}" + (" (whole curve)" if self.kind == "shift" else "")
+            for label, old, new in self.rungs:
+                if old is None:
+                    lines.append(f"  {label}: {new:.1%}")
+                else:
+                    lines.append(f"  {label}: {old:.1%} -> {new:.1%} ({new - old:+.1%})")
+            summary = f"{self.rungs_moved} of {len(self.rungs)} dates moved, largest {self.change_percent:+.1%}"
+        return (
+            f"{header}\n\n"
+            f"Event: {self.title}\n"
+            f"{summary}\n"
+            + "\n".join(lines) + "\n"
+            f"{self.book_line()}"
+            f"Time: {self.timestamp.strftime('%Y-%m-%d %H:%M:%S UTC')}"
+        )
+
+
+@dataclass
+class _Ladder:
+    key: str  # "<event slug>:<question stem>"
+    title: str
+    market_ids: list[str]  # ordered by end date
+    labels: list[str]
+    prices: list[float]
+    violations: set[int] = field(default_factory=set)  # i where prices[i] > prices[i + 1]
+    last_alert: datetime | None = None
+    last_direction: str | None = None
+
+
+class LadderTracker:
+    """Event-level pass over date-ladder markets ("... by March", "... by June").
+
+    Markets of one event whose questions differ only in the trailing date
+    form a ladder, ordered by end date, whose YES prices should never fall
+    as the date moves out. The curve is updated from the change stream.
+    Per-market alerts on a ladder's rungs in the same tick are folded into
+    one LadderAlert, and further rung alerts in the same direction within
+    ALERT_COOLDOWN_SECONDS are dropped. A rung priced more than
+    LADDER_VIOLATION_TOLERANCE above a later-dated rung raises a violation
+    alert once, when the inversion appears.
+    """
+
+    def __init__(self, tolerance: float | None = None, shift_fraction: float | None = None):
+        self.tolerance = Config.LADDER_VIOLATION_TOLERANCE if tolerance is None else tolerance
+        self.shift_fraction = Config.LADDER_SHIFT_FRACTION if shift_fraction is None else shift_fraction
+        self.cooldown = timedelta(seconds=Config.ALERT_COOLDOWN_SECONDS)
+        self.ladders: dict[tuple[str, str], _Ladder] = {}
+        self._where: dict[str, tuple[_Ladder, int]] = {}  # market id -> (ladder, rung)
+        self._shapes: dict[str, tuple] = {}  # event slug -> market ids and end dates last seen
+        self.alerts_folded = 0
+        self.violations_found = 0
+
+    def update_events(self, events):
+        """Rebuild the ladders of events whose set of markets changed."""
+        for event in events:
+            markets = [m for m in event.markets if not m.closed and m.end_date]
+            shape = tuple((m.id, m.end_date) for m in markets)
+            if self._shapes.get(event.slug) == shape:
+                continue
+            self._shapes[event.slug] = shape
+            self._build(event, markets)
+
+    def forget_event(self, slug: str):
+        self._shapes.pop(slug, None)
+        for key in [key for key in self.ladders if key[0] == slug]:
+            for market_id in self.ladders.pop(key).market_ids:
+                self._where.pop(market_id, None)
+
+    def process(self, changes: list[MarketChange], alerts: list[Alert], now: datetime) -> list[Alert]:
+        """Update the curves and replace rung alerts with one alert per ladder."""
+        touched = {}
+        for change in changes:
+            where = self._where.get(change.market_id)
+            if where:
+                ladder, i = where
+                ladder.prices[i] = change.new_yes_price
+                touched[id(ladder)] = ladder
+
+        result = []
+        rung_alerts: dict[int, list[Alert]] = {}
+        for alert in alerts:
+            where = self._where.get(alert.market_id)
+            if where is None:
+                result.append(alert)
+            else:
+                rung_alerts.setdefault(id(where[0]), []).append(alert)
+                touched[id(where[0])] = where[0]
+
+        for key, ladder in touched.items():
+            if key in rung_alerts:
+                alert = self._consolidate(ladder, rung_alerts[key], now)
+                if alert:
+                    result.append(alert)
+            alert = self._check_order(ladder, now)
+            if alert:
+                result.append(alert)
+        return result
+
+    def _build(self, event: Event, markets: list[Market]):
+        previous = {}
+        for key in [key for key in self.ladders if key[0] == event.slug]:
+            previous[key] = old = self.ladders.pop(key)
+            for market_id in old.market_ids:
+                self._where.pop(market_id, None)
+
+        groups: dict[str, tuple[str, list[tuple[str, Market]]]] = {}
+        for market in markets:
+            split = _split_question(market.question)
+            if split:
+                stem, label = split
+                groups.setdefault(stem.lower(), (stem, []))[1].append((label, market))
+
+        for key, (stem, rungs) in groups.items():
+            if len({market.end_date for _, market in rungs}) < 2:
+                continue
+            rungs.sort(key=lambda rung: rung[1].end_date)
+            ladder = _Ladder(
+                key=f"{event.slug}:{key}",
+                title=event.title if len(groups) == 1 else stem,
+                market_ids=[market.id for _, market in rungs],
+                labels=[label for label, _ in rungs],
+                prices=[market.outcome_yes_price for _, market in rungs],
+            )
+            ladder.violations = self._inversions(ladder)
+            old = previous.get((event.slug, key))
+            if old:
+                ladder.last_alert, ladder.last_direction = old.last_alert, old.last_direction
+            self.ladders[(event.slug, key)] = ladder
+            for i, market_id in enumerate(ladder.market_ids):
+                self._where[market_id] = (ladder, i)
+            logger.debug(f"Date ladder for {event.slug}: {', '.join(ladder.labels)}")
+
+    def _consolidate(self, ladder: _Ladder, alerts: list[Alert], now: datetime) -> LadderAlert | None:
+        ups = sum(1 for alert in alerts if alert.alert_type == "spike")
+        direction = "spike" if ups * 2 >= len(alerts) else "drop"
+        if (
+            ladder.last_alert
+            and now - ladder.last_alert < self.cooldown
+            and direction == ladder.last_direction
+        ):
+            self.alerts_folded += len(alerts)
+            return None
+
+        lead = max(alerts, key=lambda alert: abs(alert.change_percent))
+        moved = {alert.market_id: alert for alert in alerts}
+        same_way = sum(1 for alert in alerts if alert.alert_type == direction)
+        kind = "shift" if same_way >= self.shift_fraction * len(ladder.market_ids) else "move"
+        rungs = [
+            (label, moved[market_id].old_price if market_id in moved else None, price)
+            for market_id, label, price in zip(ladder.market_ids, ladder.labels, ladder.prices)
+        ]
+        self.alerts_folded += len(alerts) - 1
+        ladder.last_alert = now
+        ladder.last_direction = direction
+        return LadderAlert(
+            market_id=lead.market_id,
+            question=lead.question,
+            alert_type=direction,
+            old_price=lead.old_price,
+            new_price=lead.new_price,
+            change_percent=lead.change_percent,
+            timestamp=now,
+            window_seconds=lead.window_seconds,
+            title=ladder.title,
+            ladder=ladder.key,
+            kind=kind,
+            rungs=rungs,
+            rungs_moved=len(alerts),
+        )
+
+    def _check_order(self, ladder: _Ladder, now: datetime) -> LadderAlert | None:
+        current = self._inversions(ladder)
+        new = sorted(current - ladder.violations)
+        ladder.violations = current
+        if not new:
+            return None
+        self.violations_found += len(new)
+        first = new[0]
+        earlier, later = ladder.prices[first], ladder.prices[first + 1]
+        return LadderAlert(
+            market_id=ladder.market_ids[first],
+            question=ladder.labels[first],
+            alert_type="drop",
+            old_price=later,
+            new_price=earlier,
+            change_percent=earlier - later,
+            timestamp=now,
+            title=ladder.title,
+            ladder=ladder.key,
+            kind="violation",
+            rungs=[
+                (f"{ladder.labels[i]} vs {ladder.labels[i + 1]}", ladder.prices[i], ladder.prices[i + 1])
+                for i in new
+            ],
+        )
+
+    def _inversions(self, ladder: _Ladder) -> set[int]:
+        prices = ladder.prices
+        return {i for i in range(len(prices) - 1) if prices[i] > prices[i + 1] + self.tolerance}
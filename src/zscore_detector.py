@@ -0,0 +1,168 @@
+import math
+from datetime import datetime
+
+import numpy as np
+
+from src.config import Config
+from src.detector import EPOCH, MICROSECOND, Alert, IrregularityDetector, PriceSnapshot
+from src.polymarket_client import Market
+
+PRICE_EPSILON = 0.005  # keeps log-odds finite at 0% and 100%
+
+
+def log_odds(price: float) -> float:
+    price = min(max(price, PRICE_EPSILON), 1 - PRICE_EPSILON)
+    return math.log(price / (1 - price))
+
+
+class ZScoreDetector(IrregularityDetector):
+    """Fires on statistically unusual moves instead of a fixed threshold.
+
+    Each price change is turned into a log-odds return scaled to one minute
+    (divided by the square root of the minutes since the previous price),
+    so a 5-point move counts for more at 3% than at 50% and for more when
+    it happens quickly. The return is scored against an exponentially
+    weighted mean and variance of the market's earlier returns, and the
+    z-score is damped on thin markets by liquidity / (liquidity +
+    ZSCORE_LIQUIDITY_HALF). A market alerts when the damped |z| reaches
+    ZSCORE_THRESHOLD after ZSCORE_WARMUP returns, the move is at least
+    ZSCORE_MIN_MOVE and the market is out of cooldown.
+
+    State is four numbers per market in the detector's columnar arrays, so
+    each update is O(1) in time and memory, with no history to rescan.
+    """
+
+    def __init__(
+        self,
+        z_threshold: float | None = None,
+        cooldown_seconds: int | None = None,
+        halflife: float | None = None,
+    ):
+        super().__init__(cooldown_seconds=cooldown_seconds, windows=[])
+        self.z_threshold = Config.ZSCORE_THRESHOLD if z_threshold is None else z_threshold
+        halflife = halflife or Config.ZSCORE_HALFLIFE
+        self.alpha = 1 - 0.5 ** (1 / halflife)  # weight of the newest return
+        self.warmup = Config.ZSCORE_WARMUP
+        self.min_move = Config.ZSCORE_MIN_MOVE
+        self.min_stdev = Config.ZSCORE_MIN_STDEV
+        self.liquidity_half = Config.ZSCORE_LIQUIDITY_HALF
+        self._mean = np.zeros(0)
+        self._var = np.zeros(0)
+        self._count = np.zeros(0, dtype=np.int64)
+        self._updated_us = np.zeros(0, dtype=np.int64)
+
+    def check_market(self, market: Market, now: datetime | None = None) -> Alert | None:
+        """Score a market's price change. Returns an Alert if it is unusual."""
+        now = now or datetime.utcnow()
+        row = self._row(market.id)
+        previous = self.price_history.get(market.id)
+        price = market.outcome_yes_price
+        if previous is not None and previous.yes_price == price:
+            return None
+
+        snapshot = PriceSnapshot(
+            market_id=market.id,
+            question=market.question,
+            yes_price=price,
+            no_price=market.outcome_no_price,
+            timestamp=now,
+        )
+        self.price_history[market.id] = snapshot
+        if self.pending_snapshots is not None:
+            self.pending_snapshots.append(snapshot)
+        self._prices[row] = price
+        now_us = (now - EPOCH) // MICROSECOND
+        last_us = int(self._updated_us[row])
+        self._updated_us[row] = now_us
+        if previous is None:
+            return None
+
+        minutes = max(now_us - last_us, 1_000_000) / 60_000_000
+        ret = (log_odds(price) - log_odds(previous.yes_price)) / math.sqrt(minutes)
+        mean, var, count = float(self._mean[row]), float(self._var[row]), int(self._count[row])
+        stdev = max(math.sqrt(var), self.min_stdev)
+        z = (ret - mean) / stdev * market.liquidity / (market.liquidity + self.liquidity_half)
+
+        # Update the running statistics after scoring, so a move is judged
+        # against what came before it
+        delta = ret - mean
+        self._mean[row] = mean + self.alpha * delta
+        self._var[row] = (1 - self.alpha) * (var + self.alpha * delta * delta)
+        self._count[row] = count + 1
+
+        change = price - previous.yes_price
+        if count < self.warmup or abs(z) < self.z_threshold or abs(change) < self.min_move:
+            return None
+        if now_us - self._last_alert_us[row] < self._cooldown_us:
+            self.alerts_suppressed += 1
+            return None
+
+        return self._alert(market, previous.yes_price, change, z, now)
+
+    def check_markets(self, markets: list[Market], now: datetime | None = None) -> list[Alert]:
+        """Check multiple markets and return all alerts."""
+        now = now or datetime.utcnow()
+        alerts = []
+        for market in markets:
+            alert = self.check_market(market, now)
+            if alert:
+                alerts.append(alert)
+        return alerts
+
+    def check_changes(self, markets: list[Market], now: datetime | None = None) -> list[Alert]:
+        """Check markets whose price changed; an unchanged price never alerts here."""
+        return self.check_markets(markets, now)
+
+    def forget(self, market_id: str):
+        row = self._rows.get(market_id)
+        if row is not None:
+            self._mean[row] = self._var[row] = 0.0
+            self._count[row] = self._updated_us[row] = 0
+        return super().forget(market_id)
+
+    def restore(self, snapshots, samples, last_alerts) -> None:
+        """Load persisted snapshots and cooldowns; statistics warm up again."""
+        for market_id, snapshot in snapshots.items():
+            self.price_history[market_id] = snapshot
+            row = self._row(market_id)
+            self._prices[row] = snapshot.yes_price
+            self._updated_us[row] = (snapshot.timestamp - EPOCH) // MICROSECOND
+        for market_id, when in last_alerts.items():
+            self.set_last_alert(market_id, when)
+
+    def memory_bytes(self) -> int:
+        stats = self._mean.nbytes + self._var.nbytes + self._count.nbytes + self._updated_us.nbytes
+        return super().memory_bytes() + stats
+
+    def _alert(self, market: Market, old_price: float, price_change: float, z: float, now: datetime) -> Alert:
+        """Build an alert and start the market's cooldown."""
+        alert = Alert(
+            market_id=market.id,
+            question=market.question,
+            alert_type="spike" if price_change > 0 else "drop",
+            old_price=old_price,
+            new_price=market.outcome_yes_price,
+            change_percent=price_change,
+            timestamp=now,
+            zscore=z,
+        )
+        self.set_last_alert(market.id, now)
+        self.alerts_fired += 1
+        if self.pending_alerts is not None:
+            self.pending_alerts.append(alert)
+        return alert
+
+    def _row(self, market_id: str) -> int:
+        row = super()._row(market_id)
+        grow = self._prices.size - self._mean.size
+        if grow > 0:
+            self._mean = np.append(self._mean, np.zeros(grow))
+            self._var = np.append(self._var, np.zeros(grow))
+            self._count = np.append(self._count, np.zeros(grow, dtype=np.int64))
+            self._updated_us = np.append(self._updated_us, np.zeros(grow, dtype=np.int64))
+        return row
+
+    def get_status(self) -> dict:
+        status = super().get_status()
+        status.update(strategy="zscore", z_threshold=self.z_threshold)
+        return status
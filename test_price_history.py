@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Test that window extrema cover the whole window, even past the ring's capacity."""
+
+import random
+import sys
+
+from src.price_history import PriceHistory
+
+WINDOWS = (60.0, 300.0, 3600.0)
+
+
+def expected_extremes(samples: list[tuple[float, float]], now: float) -> list[tuple[float, float]]:
+    """Brute force: every price in effect at some point inside each window."""
+    result = []
+    for window in WINDOWS:
+        cutoff = now - window
+        prices = [
+            price for i, (timestamp, price) in enumerate(samples)
+            if i == len(samples) - 1 or samples[i + 1][0] > cutoff
+        ]
+        result.append((min(prices), max(prices)))
+    return result
+
+
+def run_test() -> bool:
+    rng = random.Random(7)
+    history = PriceHistory(1024, WINDOWS)
+    samples = []
+    price = 0.4
+    for second in range(3600):
+        price = 0.10 if second == 200 else min(0.9, max(0.3, price + rng.uniform(-0.01, 0.01)))
+        samples.append((float(second), price))
+        history.append(float(second), price)
+        if second % 97 == 0 and history.extremes() != expected_extremes(samples, second):
+            print(f"ERROR: extrema wrong at t={second}s: {history.extremes()}")
+            return False
+
+    low, _ = history.extremes()[-1]
+    print(f"1h low after 3600 one-second samples (ring of {history.capacity}): {low:.3f}")
+    if low != 0.10:
+        print("ERROR: the 1h window lost the early low once the ring wrapped")
+        return False
+    if history.extremes() != expected_extremes(samples, 3599.0):
+        print(f"ERROR: final extrema wrong: {history.extremes()}")
+        return False
+    if len(history) != history.capacity:
+        print(f"ERROR: ring holds {len(history)} samples, expected {history.capacity}")
+        return False
+
+    # After an alert every window restarts from the latest price
+    history.reset_windows()
+    if history.extremes() != [(price, price)] * len(WINDOWS):
+        print(f"ERROR: reset_windows left {history.extremes()}")
+        return False
+
+    print("Price history: OK")
+    return True
+
+
+def test_price_history():
+    """Run the full-window test."""
+    print("=" * 50)
+    print("Testing price history windows...")
+    print("-" * 50)
+    assert run_test(), "price history windows test failed - see the output above"
+
+
+if __name__ == "__main__":
+    try:
+        test_price_history()
+    except AssertionError:
+        sys.exit(1)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Test Gamma retries, hedging and the circuit breaker against a local fault-injecting server."""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from src.config import Config
+from src.polymarket_client import AsyncPolymarketClient
+
+SLUGS = ["us-strikes-iran-by", "israel-strikes-iran-by"]
+
+
+class FaultServer:
+    """Serves /events, failing or stalling requests according to `mode`.
+
+    healthy: answer at once; slow-tail: every 5th request stalls;
+    flaky: every other request gets a 503; down: every request gets a 500.
+    """
+
+    def __init__(self):
+        self.mode = "healthy"
+        self.requests = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                    count = server.requests
+                if server.mode == "down" or (server.mode == "flaky" and count % 2):
+                    self.send_response(503 if server.mode == "flaky" else 500)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if server.mode == "slow-tail" and count % 5 == 0:
+                    time.sleep(1.0)
+                slugs = parse_qs(urlparse(self.path).query).get("slug", [])
+                body = json.dumps([_event(slug) for slug in slugs]).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # the client hedged and dropped this connection
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+
+
+def _event(slug: str) -> dict:
+    return {
+        "id": slug,
+        "slug": slug,
+        "title": slug,
+        "markets": [{
+            "id": f"{slug}-1",
+            "question": f"{slug}?",
+            "outcomePrices": '["0.2", "0.8"]',
+            "volume": "1000",
+            "liquidity": "100",
+            "active": True,
+            "closed": False,
+        }],
+    }
+
+
+async def run_test() -> bool:
+    Config.RETRY_BASE_SECONDS = 0.01
+    Config.RETRY_MAX_BACKOFF_SECONDS = 0.05
+    Config.HEDGE_MIN_SAMPLES = 10
+    Config.CIRCUIT_FAILURE_THRESHOLD = 3
+    Config.CIRCUIT_RESET_SECONDS = 0.5
+    Config.SLUGS_PER_REQUEST = 1
+    server = FaultServer()
+    Config.GAMMA_API_URL = server.url
+    client = AsyncPolymarketClient()
+
+    try:
+        # Hedging: with a stalled request in every five, no poll should wait for it
+        for _ in range(10):
+            await client.get_event_by_slug(SLUGS[0])
+        server.mode = "slow-tail"
+        slowest = 0.0
+        for _ in range(20):
+            started = time.perf_counter()
+            await client.get_event_by_slug(SLUGS[0])
+            slowest = max(slowest, time.perf_counter() - started)
+        hedges = client.retry_budget.spent
+        print(f"Slow tail: slowest request {slowest * 1000:.0f} ms with {hedges} hedges")
+        if hedges == 0 or slowest > 0.5:
+            print("ERROR: hedged requests did not cut the tail")
+            return False
+
+        # Retries: every other response is a 503
+        server.mode = "flaky"
+        spent = client.retry_budget.spent
+        for _ in range(5):
+            event = await client.get_event_by_slug(SLUGS[0])
+            if event is None:
+                print("ERROR: no event returned")
+                return False
+        print(f"Flaky server: 5 requests succeeded with {client.retry_budget.spent - spent} retries")
+
+        server.mode = "healthy"
+        events = await client.get_events_by_slugs(SLUGS)
+        if set(events) != set(SLUGS) or any(event.stale for event in events.values()):
+            print("ERROR: fresh events marked stale")
+            return False
+
+        # Outage: the breaker opens and the last good data is served, marked stale
+        server.mode = "down"
+        before = server.requests
+        for _ in range(10):
+            events = await client.get_events_by_slugs(SLUGS)
+        sent = server.requests - before
+        print(f"Outage: {sent} requests reached the server for 20 polls, circuit {client.breaker.state}")
+        if client.breaker.state != "open" or sent > 10:
+            print("ERROR: circuit breaker did not stop the requests")
+            return False
+        if set(events) != set(SLUGS) or not all(event.stale for event in events.values()):
+            print("ERROR: stale events not served during the outage")
+            return False
+
+        # Recovery: after the reset period a probe closes the circuit again
+        server.mode = "healthy"
+        await asyncio.sleep(Config.CIRCUIT_RESET_SECONDS)
+        for _ in range(2):
+            events = await client.get_events_by_slugs(SLUGS)
+        print(f"Recovered: circuit {client.breaker.state}, {len(client.stale)} stale events")
+        if client.breaker.state != "closed" or client.stale or any(e.stale for e in events.values()):
+            print("ERROR: client did not recover")
+            return False
+
+        print("Gamma resilience: OK")
+        return True
+    finally:
+        await client.aclose()
+        server.close()
+
+
+def test_resilience():
+    """Run the fault-injecting server test."""
+    print("=" * 50)
+    print("Testing Gamma resilience...")
+    print("-" * 50)
+    assert asyncio.run(run_test()), "Gamma resilience test failed - see the output above"
+
+
+if __name__ == "__main__":
+    try:
+        test_resilience()
+    except AssertionError:
+        sys.exit(1)
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""Test sharded mode against a local stand-in Gamma server: two workers, one killed."""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from src.config import Config
+from src.detector import Alert
+from src.dispatcher import AlertDispatcher
+from src.sharding import ShardCoordinator
+from src.telegram_client import TelegramAlertClient
+
+SLUGS = [f"test-event-{i}" for i in range(8)]
+
+# Read by the spawned workers' Config when they import it
+WORKER_ENV = {
+    "POLL_INTERVAL_SECONDS": "1",
+    "ADAPTIVE_POLLING": "false",
+    "SLUGS_PER_REQUEST": "4",
+    "SHARD_WORKERS": "2",
+    "SHARD_HEARTBEAT_SECONDS": "0.2",
+    "ALERT_COOLDOWN_SECONDS": "1",
+    "DETECTOR_STRATEGY": "threshold",
+    "STREAM_ENABLED": "false",
+    "STATE_BACKEND": "none",
+    "RECORDER_ENABLED": "false",
+    "LADDER_DETECTION": "false",
+    "BOOK_ENRICHMENT": "false",
+    "HEDGE_ENABLED": "false",
+}
+
+
+class GammaServer:
+    """Serves /events with one market per slug at a settable YES price."""
+
+    def __init__(self, price: float):
+        self.price = price
+        self.requests: dict[str, int] = {slug: 0 for slug in SLUGS}
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                slugs = parse_qs(urlparse(self.path).query).get("slug", [])
+                with server._lock:
+                    for slug in slugs:
+                        server.requests[slug] = server.requests.get(slug, 0) + 1
+                body = json.dumps([_event(slug, server.price) for slug in slugs]).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+
+
+def _event(slug: str, price: float) -> dict:
+    return {
+        "id": slug,
+        "slug": slug,
+        "title": slug,
+        "endDate": "2030-01-01T00:00:00Z",
+        "markets": [{
+            "id": f"{slug}-1",
+            "question": f"{slug}?",
+            "outcomePrices": json.dumps([str(price), str(round(1 - price, 4))]),
+            "volume": "1000",
+            "liquidity": "100",
+            "active": True,
+            "closed": False,
+        }],
+    }
+
+
+class RecordingCoordinator(ShardCoordinator):
+    """Keeps every alert a worker sends, before repeats are dropped."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.received: list[tuple[str, str]] = []  # (shard, market id)
+
+    def handle_alerts(self, shard, alerts: list[Alert]):
+        self.received.extend((shard.name, alert.market_id) for alert in alerts)
+        super().handle_alerts(shard, alerts)
+
+
+async def wait_for(condition, timeout: float = 15.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        await asyncio.sleep(0.05)
+    return condition()
+
+
+def check_alerts(received: list[tuple[str, str]], phase: str) -> bool:
+    markets = [market_id for _, market_id in received]
+    repeated = {market_id for market_id in markets if markets.count(market_id) > 1}
+    if sorted(set(markets)) != sorted(f"{slug}-1" for slug in SLUGS) or repeated:
+        print(f"ERROR: {phase}: expected one alert per market, got {len(markets)} ({len(repeated)} repeated)")
+        return False
+    return True
+
+
+async def run_test() -> bool:
+    server = GammaServer(price=0.2)
+    os.environ.update(WORKER_ENV, GAMMA_API_URL=server.url)
+    Config.ALERT_COOLDOWN_SECONDS = 1
+    Config.SHARD_HEARTBEAT_TIMEOUT_SECONDS = 5
+    Config.SHARD_RESTART_SECONDS = 60  # keep the killed worker down for the test
+    Config.TELEGRAM_BOT_TOKEN = ""
+    Config.ALERT_WEBHOOK_URLS = []
+    Config.ALERT_FILE_PATH = os.path.join(tempfile.mkdtemp(), "alerts.jsonl")
+
+    import monitor  # the workers' entry point, monitor.run_shard
+
+    dispatcher = AlertDispatcher(TelegramAlertClient())
+    dispatcher.start()
+    coordinator = RecordingCoordinator(monitor.run_shard, SLUGS, dispatcher, workers=2)
+    task = asyncio.create_task(coordinator.run())
+    shards = coordinator.shards.values()
+    try:
+        # Both workers poll their share of the events
+        if not await wait_for(lambda: sum(s.stats.get("markets", 0) for s in shards) == len(SLUGS)):
+            print(f"ERROR: workers did not pick up the events: {[s.stats for s in shards]}")
+            return False
+        split = {s.name: len(s.slugs) for s in shards}
+        print(f"Events per worker: {split}")
+        if 0 in split.values():
+            print("ERROR: one worker got no events")
+            return False
+
+        # Every market alerts exactly once, from whichever worker owns it
+        server.price = 0.4
+        if not await wait_for(lambda: len(coordinator.received) >= len(SLUGS)):
+            print(f"ERROR: only {len(coordinator.received)} alerts reached the coordinator")
+            return False
+        await asyncio.sleep(2.5)  # two more polls: a market on both workers would alert twice
+        if not check_alerts(coordinator.received, "both workers"):
+            return False
+        print(f"Both workers: {len(coordinator.received)} alerts from {sorted({s for s, _ in coordinator.received})}")
+
+        # Kill a worker: its events move to the survivor
+        victim, survivor = coordinator.shards["shard-0"], coordinator.shards["shard-1"]
+        moved = set(victim.slugs)
+        victim.process.kill()
+        if not await wait_for(
+            lambda: not victim.alive and survivor.slugs == set(SLUGS)
+            and survivor.stats.get("markets") == len(SLUGS)
+        ):
+            print(f"ERROR: events not rebalanced: {len(survivor.slugs)} on {survivor.name}, {survivor.stats}")
+            return False
+        print(f"Killed {victim.name}: {len(moved)} events moved to {survivor.name} ({coordinator.events_moved} moves)")
+
+        coordinator.received.clear()
+        server.price = 0.7
+        if not await wait_for(lambda: len(coordinator.received) >= len(SLUGS)):
+            print(f"ERROR: only {len(coordinator.received)} alerts reached the coordinator after the kill")
+            return False
+        await asyncio.sleep(2.5)
+        if not check_alerts(coordinator.received, "after the kill"):
+            return False
+        if {shard for shard, _ in coordinator.received} != {survivor.name}:
+            print("ERROR: alerts after the kill came from a worker other than the survivor")
+            return False
+        print(f"After the kill: {len(coordinator.received)} alerts, {coordinator.alerts_deduplicated} dropped as repeats")
+        if coordinator.alerts_deduplicated:
+            print("ERROR: workers sent repeat alerts")
+            return False
+
+        coordinator.stop()
+        await task
+        await dispatcher.close(timeout=5)
+        with open(Config.ALERT_FILE_PATH) as f:
+            delivered = sum(1 for _ in f)
+        if delivered != 2 * len(SLUGS):
+            print(f"ERROR: {delivered} alerts delivered, expected {2 * len(SLUGS)}")
+            return False
+
+        print("Sharded mode: OK")
+        return True
+    finally:
+        coordinator.stop()
+        if not task.done():
+            await task
+        await dispatcher.close(timeout=0)
+        server.close()
+
+
+def test_sharding():
+    """Run the two-worker test."""
+    print("=" * 50)
+    print("Testing sharded mode...")
+    print("-" * 50)
+    assert asyncio.run(run_test()), "sharded mode test failed - see the output above"
+
+
+if __name__ == "__main__":
+    try:
+        test_sharding()
+    except AssertionError:
+        sys.exit(1)
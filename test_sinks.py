@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Test alert fan-out to several sinks against local stand-in HTTP servers."""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.fake_telegram import FakeTelegram
+from src.config import Config
+from src.detector import Alert
+from src.dispatcher import AlertDispatcher
+from src.metrics import SINK_DELIVERY_SECONDS
+from src.telegram_client import TelegramAlertClient
+
+MESSAGES = [f"🚨 ALERT: Price UP\n\nMarket: test market {i}?" for i in range(5)]
+
+
+class WebhookServer:
+    """Records POSTed JSON bodies, after `delay` seconds, failing the first `failures`."""
+
+    def __init__(self, delay: float = 0.0, failures: int = 0, status: int = 500):
+        self.delay = delay
+        self.failures = failures
+        self.status = status
+        self.bodies: list[dict] = []
+        self.requests = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                with server._lock:
+                    server.requests += 1
+                    failing = server.requests <= server.failures
+                time.sleep(server.delay)
+                if failing:
+                    self.send_response(server.status)
+                else:
+                    server.bodies.append(json.loads(body))
+                    self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/alerts"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+
+
+async def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        await asyncio.sleep(0.01)
+    return condition()
+
+
+async def run_test() -> bool:
+    telegram = FakeTelegram().start()
+    slow = WebhookServer(delay=0.5)
+    flaky = WebhookServer(failures=2, status=503)
+    rejecting = WebhookServer(failures=10**6, status=400)
+    path = os.path.join(tempfile.mkdtemp(), "alerts.jsonl")
+
+    Config.TELEGRAM_API_BASE_URL = telegram.base_url
+    Config.TELEGRAM_BOT_TOKEN = "123:test"
+    Config.TELEGRAM_CHAT_ID = "1"
+    Config.TELEGRAM_EXTRA_CHAT_IDS = ["2", "@channel"]
+    Config.TELEGRAM_CHAT_BURST = 10
+    Config.ALERT_WEBHOOK_URLS = [slow.url, flaky.url, rejecting.url]
+    Config.ALERT_FILE_PATH = path
+    Config.RETRY_BASE_SECONDS = 0.01
+    Config.RETRY_MAX_BACKOFF_SECONDS = 0.05
+
+    dispatcher = AlertDispatcher(TelegramAlertClient())
+    try:
+        print(f"Sinks: {', '.join(sink.name for sink in dispatcher.sinks)}")
+        if len(dispatcher.sinks) != 7:
+            print("ERROR: expected 3 Telegram, 3 webhook and 1 file sink")
+            return False
+        if len({sink.latency for sink in dispatcher.sinks}) != 7:
+            print("ERROR: sinks share a latency histogram")
+            return False
+        dispatcher.start()
+        started = time.perf_counter()
+        dispatcher.submit(MESSAGES)
+
+        # The fast sinks finish while the slow webhook is still on its first messages
+        if not await wait_for(lambda: len(telegram.messages) == 15 and flaky.bodies and len(flaky.bodies) == 5):
+            print(f"ERROR: fast sinks delivered {len(telegram.messages)} Telegram, {len(flaky.bodies)} webhook")
+            return False
+        fast = time.perf_counter() - started
+        print(f"Telegram and flaky webhook done in {fast * 1000:.0f} ms; slow webhook has {len(slow.bodies)}/5")
+        if len(slow.bodies) >= 5:
+            print("ERROR: the slow webhook was not slower than the others")
+            return False
+
+        await dispatcher.close(timeout=10)
+        print(f"Slow webhook done in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+        texts = [m["text"] for m in telegram.messages if m["chat_id"] == "@channel"]
+        with open(path) as f:
+            lines = [json.loads(line)["text"] for line in f]
+        if texts != MESSAGES or lines != MESSAGES or [b["text"] for b in slow.bodies] != MESSAGES:
+            print("ERROR: a sink received different or reordered messages")
+            return False
+
+        by_name = {sink.name: sink for sink in dispatcher.sinks}
+        by_url = {getattr(sink, "url", None): sink for sink in dispatcher.sinks}
+        flaky_sink = by_url[flaky.url]
+        rejecting_sink = by_url[rejecting.url]
+        print(
+            f"Flaky webhook: {flaky.requests} requests for {flaky_sink.sent} alerts; "
+            f"rejecting webhook: {rejecting.requests} requests, {rejecting_sink.failed} failed"
+        )
+        if flaky_sink.sent != 5 or rejecting.requests != 5 or rejecting_sink.failed != 5:
+            print("ERROR: retries not applied per sink")
+            return False
+
+        for name, histogram in SINK_DELIVERY_SECONDS.children.items():
+            if histogram.count:
+                print(f"  {name}: {histogram.count} delivered, mean {histogram.sum / histogram.count * 1000:.0f} ms")
+        if SINK_DELIVERY_SECONDS.children[by_name["telegram:1"].name].count != 5:
+            print("ERROR: delivery latency not recorded per sink")
+            return False
+
+        print("Alert fan-out: OK")
+        return True
+    finally:
+        await dispatcher.close(timeout=0)
+        telegram.stop()
+        for server in (slow, flaky, rejecting):
+            server.close()
+
+
+async def run_coalesce_test() -> bool:
+    """With DISPATCH_COALESCE, Telegram gets one combined text and the file one record per alert."""
+    telegram = FakeTelegram().start()
+    path = os.path.join(tempfile.mkdtemp(), "alerts.jsonl")
+    Config.TELEGRAM_API_BASE_URL = telegram.base_url
+    Config.TELEGRAM_EXTRA_CHAT_IDS = []
+    Config.ALERT_WEBHOOK_URLS = []
+    Config.ALERT_FILE_PATH = path
+
+    alerts = [
+        Alert(f"m{i}", f"test market {i}?", "spike", 0.2, 0.3, 0.1, datetime(2026, 1, 1), window_seconds=300)
+        for i in range(5)
+    ]
+    dispatcher = AlertDispatcher(TelegramAlertClient(), coalesce=True)
+    try:
+        dispatcher.start()
+        dispatcher.submit([alert.format_message() for alert in alerts], alerts=alerts)
+        await dispatcher.close(timeout=5)
+        with open(path) as f:
+            records = [json.loads(line) for line in f]
+        print(f"Coalesced: {len(telegram.messages)} Telegram message(s), {len(records)} file records")
+        if len(telegram.messages) != 1 or [r["market_id"] for r in records] != [a.market_id for a in alerts]:
+            print("ERROR: coalescing reached the file sink, or merged the Telegram messages wrongly")
+            return False
+        if records[0]["new_price"] != 0.3 or records[0]["window_seconds"] != 300:
+            print(f"ERROR: alert fields missing from the JSON record: {records[0]}")
+            return False
+        return True
+    finally:
+        await dispatcher.close(timeout=0)
+        telegram.stop()
+
+
+def test_sinks():
+    """Run the fan-out and coalescing tests."""
+    print("=" * 50)
+    print("Testing alert sinks...")
+    print("-" * 50)
+    assert asyncio.run(run_test()), "alert sinks test failed - see the output above"
+    assert asyncio.run(run_coalesce_test()), "coalescing test failed - see the output above"
+
+
+if __name__ == "__main__":
+    try:
+        test_sinks()
+    except AssertionError:
+        sys.exit(1)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Test the streaming price feed against a local stand-in websocket server."""
+
+import asyncio
+import json
+import sys
+import time
+
+import websockets
+
+from src.config import Config
+from src.detector import IrregularityDetector
+from src.polymarket_client import Market
+from src.price_stream import PriceStream
+
+YES_TOKEN = "yes-token-1"
+
+
+def make_market(price: float) -> Market:
+    return Market(
+        id="m1",
+        question="Will the US strike Iran by March?",
+        outcome_yes_price=price,
+        outcome_no_price=1 - price,
+        volume=1000.0,
+        liquidity=100.0,
+        end_date=None,
+        active=True,
+        closed=False,
+        clob_token_ids=[YES_TOKEN, "no-token-1"],
+    )
+
+
+def price_change(bid: float, ask: float) -> str:
+    return json.dumps({
+        "event_type": "price_change",
+        "market": "0xcondition",
+        "price_changes": [
+            {"asset_id": YES_TOKEN, "price": str(bid), "size": "10", "side": "BUY",
+             "best_bid": str(bid), "best_ask": str(ask)},
+        ],
+        "timestamp": str(int(time.time() * 1000)),
+    })
+
+
+async def run_test() -> bool:
+    Config.STREAM_RECONNECT_MIN_SECONDS = 0.05
+    subscriptions = []
+    connections = []
+
+    async def handler(ws):
+        connections.append(ws)
+        subscriptions.append(json.loads(await ws.recv()))
+        async for message in ws:
+            if message == "PING":
+                await ws.send("PONG")
+
+    server = await websockets.serve(handler, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    detector = IrregularityDetector(threshold=0.05, cooldown_seconds=300)
+    detector.check_markets([make_market(0.20)])
+    alerts = asyncio.Queue()
+
+    async def on_update(markets):
+        for alert in detector.check_markets(markets):
+            await alerts.put((time.perf_counter(), alert))
+
+    stream = PriceStream(on_update, url=f"ws://127.0.0.1:{port}")
+    stream.track([make_market(0.20)])
+    task = asyncio.create_task(stream.run())
+
+    try:
+        while len(subscriptions) < 1:
+            await asyncio.sleep(0.01)
+        print(f"Subscribed: {subscriptions[0]}")
+
+        # Small move: no alert expected
+        await connections[-1].send(price_change(0.21, 0.23))
+        # Spike: 20% -> 30%
+        sent = time.perf_counter()
+        await connections[-1].send(price_change(0.29, 0.31))
+        received, alert = await asyncio.wait_for(alerts.get(), timeout=5)
+        print(f"Alert latency: {(received - sent) * 1000:.2f} ms")
+        print(alert.format_message())
+        if alert.old_price > 0.25 or alert.new_price < 0.29:
+            print("ERROR: unexpected alert prices")
+            return False
+
+        # Drop the connection and check that the stream resubscribes
+        await connections[-1].close()
+        await asyncio.wait_for(_wait_for(lambda: len(subscriptions) >= 2), timeout=5)
+        print(f"Resubscribed after reconnect: {subscriptions[1]}")
+        if YES_TOKEN not in subscriptions[1].get("assets_ids", []):
+            print("ERROR: token missing from resubscription")
+            return False
+
+        print("Price stream: OK")
+        return True
+    except asyncio.TimeoutError:
+        print("ERROR: timed out waiting for the stream")
+        return False
+    finally:
+        stream.stop()
+        task.cancel()
+        server.close()
+
+
+async def _wait_for(condition):
+    while not condition():
+        await asyncio.sleep(0.01)
+
+
+def test_stream():
+    """Run the stand-in server test."""
+    print("=" * 50)
+    print("Testing price stream...")
+    print("-" * 50)
+    assert asyncio.run(run_test()), "price stream test failed - see the output above"
+
+
+if __name__ == "__main__":
+    try:
+        test_stream()
+    except AssertionError:
+        sys.exit(1)